@@ -1,11 +1,10 @@
 """Integration for Rademacher Bridge."""
 import asyncio
-from datetime import timedelta
+from collections import Counter
 import logging
 
 from homepilot.api import AuthError, HomePilotApi
 from homepilot.hub import HomePilotHub
-from homepilot.manager import HomePilotManager
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -18,25 +17,53 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
-from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.device_registry import (
-    DeviceEntry,
-    DeviceRegistry,
-    format_mac,
-)
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity_registry import async_migrate_entries
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.event import async_track_time_interval
 
 from .const import (
-    DOMAIN,
     CONF_ENABLE_CYCLIC_SCENE_POLLING,
+    CONF_CREATE_SCENE_ACTIVATION_ENTITIES,
     CONF_INCLUDE_NON_EXECUTABLE_SCENES,
     CONF_CREATE_INVERTED_COVER_POSITION,
     CONF_UPDATE_INTERVAL,
     DEFAULT_UPDATE_INTERVAL,
+    CONF_MAX_UPDATE_INTERVAL,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    CONF_SENSOR_UPDATE_INTERVAL,
+    DEFAULT_SENSOR_UPDATE_INTERVAL,
+    CONF_HUB_UPDATE_INTERVAL,
+    DEFAULT_HUB_UPDATE_INTERVAL,
     CONF_SCENE_UPDATE_INTERVAL,
     DEFAULT_SCENE_UPDATE_INTERVAL,
+    TIER_DEVICES,
+    TIER_HUB,
+    TIER_SENSORS,
+    SIGNAL_ADD_DEVICES,
+)
+from .coordinator import (
+    BridgeCircuitBreaker,
+    HomePilotDataUpdateCoordinator,
+    HomePilotSceneCoordinator,
+    async_update_device_states,
+    get_device_tier,
+)
+from .data import HomePilotConfigEntry, HomePilotRuntimeData
+from .descriptions import DeviceCapabilityIndex
+from .discovery import (
+    REDISCOVERY_INTERVAL,
+    async_cleanup_registry,
+    async_discover,
+    async_load_cached_manager,
+    async_refresh_discovery,
+    async_remove_devices,
+    async_save_discovery,
+    get_catalog_store,
+    get_discovery_store,
 )
+from .services import async_setup_services
+from .telemetry import HomePilotTelemetry
 
 # List of platforms to support. There should be a matching .py file for each,
 # eg <cover.py> and <sensor.py>
@@ -102,29 +129,35 @@ async def async_migrate_entry(hass, config_entry: ConfigEntry):
 
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the Rademacher component."""
-    # Ensure our name space for storing objects is a known type. A dict is
-    # common/preferred as it allows a separate instance of your class for each
-    # instance that has been created in the UI.
-    hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
 
     return True
 
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+async def async_setup_entry(hass: HomeAssistant, entry: HomePilotConfigEntry) -> bool:
     """Set up Rademacher from a config entry."""
     # Store an instance of the "connecting" class that does the work of speaking
     # with your actual devices.
+    telemetry = HomePilotTelemetry()
     api = HomePilotApi(
         entry.data[CONF_HOST],
         entry.data.get(CONF_PASSWORD, ""),
         entry.data.get(CONF_API_VERSION, 1),
+        session=telemetry.create_session(),
     )
 
+    # Check if include non executable scenes is enabled
+    include_non_manual = entry.options.get(CONF_INCLUDE_NON_EXECUTABLE_SCENES, False)
+    # Build entities from the cached catalog when possible, and discover in the background
+    manager = await async_load_cached_manager(hass, entry, api, include_non_manual)
+    from_cache = manager is not None
     try:
-        # Check if include non executable scenes is enabled
-        include_non_manual = entry.options.get(CONF_INCLUDE_NON_EXECUTABLE_SCENES, False)
-        manager = await HomePilotManager.async_build_manager(api, include_non_manual_executable=include_non_manual)
+        if manager is None:
+            manager, responses = await async_discover(api, include_non_manual)
+            await async_save_discovery(hass, entry, responses, include_non_manual)
+        else:
+            _LOGGER.info("%s - Using cached device and scene catalog", entry.title)
     except AuthError as err:
         # Raising ConfigEntryAuthFailed will cancel future updates
         # and start a config flow with SOURCE_REAUTH (async_step_reauth)
@@ -138,59 +171,101 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.debug("Device IDs: %s", list(manager.devices))
     _LOGGER.debug("Scene IDs: %s", list(manager.scenes))
 
-    update_interval = entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
-    update_timeout = min(update_interval - 2, 10)
-
-    async def async_update_data():
-        """Fetch data from API endpoint.
-
-        This is the place to pre-process the data to lookup tables
-        so entities can quickly look up their data.
-        """
-        try:
-            # Note: asyncio.TimeoutError and aiohttp.ClientError are already
-            # handled by the data update coordinator.
-            async with asyncio.timeout(update_timeout):
-                _LOGGER.info("%s - Updating states for %s devices with %s-second timeout every %s-second interval", entry.title, len(manager.devices), update_timeout, update_interval)
-                return await manager.update_states()
-        except AuthError as err:
-            # Raising ConfigEntryAuthFailed will cancel future updates
-            # and start a config flow with SOURCE_REAUTH (async_step_reauth)
-            raise ConfigEntryAuthFailed from err
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name="rademacher",
-        update_method=async_update_data,
-        update_interval=timedelta(seconds=update_interval),
-    )
+    tier_intervals = get_tier_intervals(entry.options)
+    tier_devices: dict[str, list[str]] = {tier: [] for tier in tier_intervals}
+    for did, device in manager.devices.items():
+        tier_devices[get_device_tier(device)].append(did)
+
+    def build_update_method(tier: str, coordinator_name: str):
+        missed_polls: Counter[str] = Counter()
+        # Laggards of the last poll, updated first by the next one
+        laggard_order: list[str] = []
+
+        async def async_update_data():
+            """Fetch data from API endpoint.
+
+            This is the place to pre-process the data to lookup tables
+            so entities can quickly look up their data.
+            """
+            # Devices are added and removed by the discovery through the coordinator
+            devices = coordinators[tier].devices
+            state_cache = coordinators[tier].state_cache
+            # Follows the floor interval, which can change with the options
+            update_timeout = min(coordinators[tier].min_update_interval - 2, 10)
+            # Requests are only counted through the session of the telemetry
+            await telemetry.async_ensure_session(manager.api)
+            try:
+                # Note: asyncio.TimeoutError and aiohttp.ClientError are already
+                # handled by the data update coordinator.
+                with breaker.guard(), telemetry.measure_poll(coordinator_name, devices) as laggards:
+                    _LOGGER.info("%s - Updating states for %s devices (%s) with %s-second timeout every %s-second interval", entry.title, len(devices), coordinator_name, update_timeout, coordinators[tier].update_interval.total_seconds())
+                    # Devices which did not answer in time keep their state, the others are updated
+                    laggards.update(
+                        await async_update_device_states(
+                            manager.api, devices, update_timeout, missed_polls, state_cache, laggard_order
+                        )
+                    )
+                    telemetry.parse_skips[coordinator_name] += state_cache.skipped
+                if laggards:
+                    _LOGGER.info("%s - Devices %s (%s) did not answer in time", entry.title, sorted(laggards), coordinator_name)
+                return dict(devices)
+            except AuthError as err:
+                # Raising ConfigEntryAuthFailed will cancel future updates
+                # and start a config flow with SOURCE_REAUTH (async_step_reauth)
+                raise ConfigEntryAuthFailed from err
+
+        return async_update_data
+
+    # Shared by all polls and commands, as they all go to the same bridge
+    breaker = BridgeCircuitBreaker(hass, entry.title, lambda: manager.api.async_get_nodename())
+    entry.async_on_unload(breaker.async_stop)
+
+    coordinators: dict[str, HomePilotDataUpdateCoordinator] = {}
+    for tier, (coordinator_name, min_interval, max_interval) in tier_intervals.items():
+        coordinators[tier] = HomePilotDataUpdateCoordinator(
+            hass,
+            _LOGGER,
+            name=coordinator_name,
+            update_method=build_update_method(tier, coordinator_name),
+            devices={did: manager.devices[did] for did in tier_devices[tier]},
+            min_update_interval=min_interval,
+            max_update_interval=max_interval,
+            breaker=breaker,
+            telemetry=telemetry,
+        )
+        _LOGGER.info("%s - Polling %s devices (%s) between %s and %s seconds", entry.title, len(tier_devices[tier]), coordinator_name, coordinators[tier].min_update_interval, coordinators[tier].max_update_interval)
 
     scene_update_interval = entry.options.get(CONF_SCENE_UPDATE_INTERVAL, DEFAULT_SCENE_UPDATE_INTERVAL)
-    scene_update_timeout = min(scene_update_interval - 2, 10)
     async def async_update_scene_data():
         """Fetch data from API endpoint.
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
+        scene_update_interval = entry.options.get(CONF_SCENE_UPDATE_INTERVAL, DEFAULT_SCENE_UPDATE_INTERVAL)
+        scene_update_timeout = min(scene_update_interval - 2, 10)
         try:
             # Note: asyncio.TimeoutError and aiohttp.ClientError are already
             # handled by the data update coordinator.
-            async with asyncio.timeout(scene_update_timeout):
-                _LOGGER.info("%s - Updating states for %s scenes with %s-second timeout every %s-second interval", entry.title, len(manager.scenes), scene_update_timeout, scene_update_interval)
-                return await manager.async_update_scenes()
+            with breaker.guard(), telemetry.measure("rademacher_scene"):
+                async with asyncio.timeout(scene_update_timeout):
+                    _LOGGER.info("%s - Updating states for %s scenes with %s-second timeout every %s-second interval", entry.title, len(manager.scenes), scene_update_timeout, scene_update_interval)
+                    # Parsed by the coordinator, only when it changed since the last poll
+                    return await manager.api.async_get_scenes()
         except AuthError as err:
             # Raising ConfigEntryAuthFailed will cancel future updates
             # and start a config flow with SOURCE_REAUTH (async_step_reauth)
             raise ConfigEntryAuthFailed from err
 
     enable_cyclic_scene_polling = entry.options.get(CONF_ENABLE_CYCLIC_SCENE_POLLING, False)    
-    scene_coordinator = DataUpdateCoordinator(
+    scene_coordinator = HomePilotSceneCoordinator(
         hass,
         _LOGGER,
         name="rademacher_scene",
         update_method=async_update_scene_data,
-        update_interval=timedelta(seconds=scene_update_interval) if enable_cyclic_scene_polling else None,
+        manager=manager,
+        update_interval=scene_update_interval if enable_cyclic_scene_polling else None,
+        breaker=breaker,
+        telemetry=telemetry,
     )
 
     if enable_cyclic_scene_polling:
@@ -212,75 +287,130 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if CONF_CREATE_INVERTED_COVER_POSITION not in entry.options:
         entry_options[CONF_CREATE_INVERTED_COVER_POSITION] = False
 
-    hass.data[DOMAIN][entry.entry_id] = (
-        manager,
-        coordinator,
-        entry.data,
-        entry_options,
-        scene_coordinator,
+    entry.runtime_data = HomePilotRuntimeData(
+        manager=manager,
+        coordinators=coordinators,
+        scene_coordinator=scene_coordinator,
+        device_index=DeviceCapabilityIndex(manager.devices),
+        options=entry_options,
+        telemetry=telemetry,
+        breaker=breaker,
     )
 
-    await coordinator.async_config_entry_first_refresh()
-    await scene_coordinator.async_config_entry_first_refresh()
+    await asyncio.gather(
+        *(
+            tier_coordinator.async_config_entry_first_refresh()
+            for tier_coordinator in [*coordinators.values(), scene_coordinator]
+        )
+    )
 
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
-    # Deleting excluded devices
-    device_registry: DeviceRegistry = dr.async_get(hass)
-    for did in entry.options[CONF_EXCLUDE]:
-        device_entry: DeviceEntry | None = device_registry.async_get_device({(DOMAIN, did)})
-        if device_entry is not None:
-            _LOGGER.info("Deleting device %s", did)
-            device_registry.async_remove_device(device_entry.id)
-
-    # Remove stale devices not present in the API
-    api_device_ids = set(manager.devices)
-    _LOGGER.debug("Devices in API: %s", api_device_ids)
-
-    registered_devices = dr.async_entries_for_config_entry(device_registry, entry.entry_id)
-    for device_entry in registered_devices:
-        device_did = None
-        for domain, identifier in device_entry.identifiers:
-            if domain == DOMAIN:
-                if identifier == f"{entry.unique_id}_bridge" or identifier.endswith("_bridge"):
-                    # Keep the hub/bridge device
-                    device_did = None
-                    break
-
-                if "_" in identifier:
-                    parts = identifier.split("_")
-                    if parts[-1] == "bridge":
-                        device_did = None
-                        break
-                    device_did = parts[-1]
-                else:
-                    device_did = identifier
-
-        if device_did is not None and device_did not in api_device_ids:
-            _LOGGER.info("Removing stale device %s (ID: %s) from device registry as it is no longer present in the API", device_entry.name, device_did)
-            device_registry.async_remove_device(device_entry.id)
+    # Deleting excluded devices and the ones no longer present in the API
+    await async_cleanup_registry(hass, entry, manager.devices, entry_options[CONF_EXCLUDE])
 
     _LOGGER.info("Starting entry setup for each platform")
     # This creates each HA object for each platform your device requires.
     # It's done by calling the `async_setup_entry` function in each platform module.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    @callback
+    def async_rediscover(_now=None) -> None:
+        entry.async_create_background_task(
+            hass, async_refresh_discovery(hass, entry), name=f"rademacher discovery {entry.title}"
+        )
+
+    # Pick up devices and scenes added or removed on the bridge, right away when
+    # the entities were created from the discovery cache
+    if from_cache:
+        async_rediscover()
+    entry.async_on_unload(async_track_time_interval(hass, async_rediscover, REDISCOVERY_INTERVAL))
     return True
 
 
-async def update_listener(hass: HomeAssistant, entry: ConfigEntry):
-    """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+def get_tier_intervals(options) -> dict[str, tuple[str, float, float]]:
+    """Return the polling intervals of each tier for the given options.
+
+    Each tier polls its own subset of devices at its own interval:
+    (coordinator name, floor interval, ceiling interval)
+    """
+    update_interval = options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+    max_update_interval = options.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL)
+    sensor_update_interval = options.get(CONF_SENSOR_UPDATE_INTERVAL, DEFAULT_SENSOR_UPDATE_INTERVAL)
+    hub_update_interval = options.get(CONF_HUB_UPDATE_INTERVAL, DEFAULT_HUB_UPDATE_INTERVAL)
+    return {
+        TIER_DEVICES: ("rademacher", update_interval, max_update_interval),
+        TIER_SENSORS: ("rademacher_sensors", sensor_update_interval, max(sensor_update_interval, max_update_interval)),
+        TIER_HUB: ("rademacher_hub", hub_update_interval, hub_update_interval),
+    }
 
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
+# Options changing which entities exist in a way that needs a reload
+RELOAD_OPTIONS = (
+    CONF_CREATE_SCENE_ACTIVATION_ENTITIES,
+    CONF_INCLUDE_NON_EXECUTABLE_SCENES,
+    CONF_CREATE_INVERTED_COVER_POSITION,
+)
+
+
+async def update_listener(hass: HomeAssistant, entry: HomePilotConfigEntry):
+    """Handle options update.
+
+    Polling intervals and excluded devices are applied to the running entry,
+    other changes reload it.
+    """
+    runtime_data = entry.runtime_data
+    manager = runtime_data.manager
+    entry_options = runtime_data.options
+    scene_coordinator = runtime_data.scene_coordinator
+    coordinators = runtime_data.coordinators
+    if any(
+        entry.options.get(key, False) != entry_options.get(key, False)
+        for key in RELOAD_OPTIONS
+    ) or set(entry.options.get(CONF_SENSOR_TYPE, [])) != set(entry_options[CONF_SENSOR_TYPE]):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    for tier, (coordinator_name, min_interval, max_interval) in get_tier_intervals(entry.options).items():
+        coordinator: HomePilotDataUpdateCoordinator = coordinators[tier]
+        if (min_interval, max_interval) != (coordinator.min_update_interval, coordinator.max_update_interval):
+            _LOGGER.info("%s - Polling devices (%s) between %s and %s seconds", entry.title, coordinator_name, min_interval, max_interval)
+            coordinator.async_set_interval_bounds(min_interval, max_interval)
+
+    if entry.options.get(CONF_ENABLE_CYCLIC_SCENE_POLLING, False):
+        scene_update_interval = entry.options.get(CONF_SCENE_UPDATE_INTERVAL, DEFAULT_SCENE_UPDATE_INTERVAL)
+        if scene_coordinator.base_update_interval != scene_update_interval:
+            _LOGGER.info("%s - Cyclic scene polling enabled with %s-second interval", entry.title, scene_update_interval)
+            scene_coordinator.async_set_base_interval(scene_update_interval)
+            await scene_coordinator.async_request_refresh()
+    elif scene_coordinator.base_update_interval is not None:
+        _LOGGER.info("%s - Cyclic scene polling disabled, scenes will be static", entry.title)
+        scene_coordinator.async_set_base_interval(None)
+
+    previous_excluded = set(entry_options[CONF_EXCLUDE])
+    excluded = set(entry.options.get(CONF_EXCLUDE, []))
+    entry_options.update(entry.options)
+    entry_options[CONF_EXCLUDE] = list(excluded)
+    async_remove_devices(hass, entry, excluded - previous_excluded)
+    if included := (previous_excluded - excluded) & set(manager.devices):
+        _LOGGER.info("%s - Adding entities of devices %s", entry.title, sorted(included))
+        async_dispatcher_send(hass, SIGNAL_ADD_DEVICES.format(entry.entry_id), included)
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: HomePilotConfigEntry):
     """Unload a config entry."""
     # This is called when an entry/configured device is to be removed. The class
     # needs to unload itself, and remove callbacks. See the classes for further
     # details
     unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unloaded:
-        manager, _, _, _, _ = hass.data[DOMAIN].pop(entry.entry_id)
         # Close the API session
-        await manager.api.async_close()
+        await entry.runtime_data.manager.api.async_close()
 
     return unloaded
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the discovery cache and catalog hash of a deleted config entry."""
+    await get_discovery_store(hass, entry).async_remove()
+    await get_catalog_store(hass, entry).async_remove()
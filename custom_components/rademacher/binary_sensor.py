@@ -1,270 +1,240 @@
 """Platform for Rademacher Bridge."""
-from datetime import timedelta
 import logging
 
-from homepilot.cover import HomePilotCover
-from homepilot.device import HomePilotDevice, HomePilotAutoConfigDevice
-from homepilot.manager import HomePilotManager
-from homepilot.sensor import HomePilotSensor
+from homepilot.device import HomePilotDevice
 from homepilot.wallcontroller import HomePilotWallController
-from homepilot.thermostat import HomePilotThermostat
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_EXCLUDE, CONF_SENSOR_TYPE
+from homeassistant.const import CONF_SENSOR_TYPE
 from homeassistant.helpers.entity import EntityCategory
-from homeassistant.helpers.event import async_track_time_interval
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN
+from .coordinator import WallControllerChannelPoller
+from .descriptions import HomePilotEntityDescription, async_setup_device_entities
 from .entity import HomePilotEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def async_setup_entry(hass, config_entry: ConfigEntry, async_add_entities):
-    """Setup of entities for binary_sensor platform."""
-    entry = hass.data[DOMAIN][config_entry.entry_id]
-    manager: HomePilotManager = entry[0]
-    coordinator: DataUpdateCoordinator = entry[1]
-    exclude_devices: list[str] = entry[3][CONF_EXCLUDE]
-    ternary_contact_sensors: list[str] = entry[3][CONF_SENSOR_TYPE]
+ENTITY_DESCRIPTIONS = (
+    HomePilotEntityDescription(
+        capability="rain_detection",
+        name="Rain Detection Sensor",
+        create_fn=lambda coordinator, device: HomePilotBinarySensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="rain_detect",
+            name_suffix="Rain Detection",
+            value_attr="rain_detection_value",
+            device_class=BinarySensorDeviceClass.MOISTURE,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="sun_detection",
+        name="Sun Detection Sensor",
+        create_fn=lambda coordinator, device: HomePilotBinarySensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="sun_detect",
+            name_suffix="Sun Detection",
+            value_attr="sun_detection_value",
+            device_class=BinarySensorDeviceClass.LIGHT,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="wind_detection",
+        name="Wind Detection Sensor",
+        create_fn=lambda coordinator, device: HomePilotBinarySensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="wind_detect",
+            name_suffix="Wind Detection",
+            value_attr="wind_detection_value",
+            device_class=None,
+            icon_off="mdi:weather-windy",
+            icon_on="mdi:weather-windy",
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="contact_state",
+        name="Contact Sensor",
+        # Binary contact sensors, the ternary ones are sensors
+        options_fn=lambda device, options: device.did not in options[CONF_SENSOR_TYPE],
+        create_fn=lambda coordinator, device: HomePilotBinarySensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="contact_state",
+            name_suffix="Contact State",
+            value_attr="contact_state_value",
+            device_class=BinarySensorDeviceClass.OPENING,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="motion_detection",
+        name="Motion Sensor",
+        create_fn=lambda coordinator, device: HomePilotBinarySensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="motion_sensor",
+            name_suffix="Motion Sensor",
+            value_attr="motion_detection_value",
+            device_class=BinarySensorDeviceClass.MOTION,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="smoke_detection",
+        name="Smoke Sensor",
+        create_fn=lambda coordinator, device: HomePilotBinarySensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="smoke_detect",
+            name_suffix="Smoke Detection",
+            value_attr="smoke_detection_value",
+            device_class=BinarySensorDeviceClass.SMOKE,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="blocking_detection",
+        name="Blocking Detection Sensor",
+        create_fn=lambda coordinator, device: HomePilotBinarySensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="blocking_detection",
+            name_suffix="Blocking Detection",
+            value_attr="blocking_detection_status",
+            device_class=BinarySensorDeviceClass.PROBLEM,
+            icon_off="mdi:window-shutter",
+            icon_on="mdi:window-shutter-alert",
+            entity_category=EntityCategory.DIAGNOSTIC,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="obstacle_detection",
+        name="Obstacle Detection Sensor",
+        create_fn=lambda coordinator, device: HomePilotBinarySensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="obstacle_detection",
+            name_suffix="Obstacle Detection",
+            value_attr="obstacle_detection_status",
+            device_class=BinarySensorDeviceClass.PROBLEM,
+            icon_off="mdi:window-shutter",
+            icon_on="mdi:window-shutter-alert",
+            entity_category=EntityCategory.DIAGNOSTIC,
+        ),
+    ),
+    # Weather program "active" sensors are provided by any auto config
+    # device that advertises the corresponding *_PROG_ACTIVE_EVT event.
+    HomePilotEntityDescription(
+        capability="rain_prog_active",
+        name="Rain Program Active Sensor",
+        create_fn=lambda coordinator, device: HomePilotBinarySensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="rain_program_active",
+            name_suffix="Rain Program Active",
+            value_attr="_rain_prog_active_value",
+            device_class=BinarySensorDeviceClass.RUNNING,
+            icon_off="mdi:weather-cloudy",
+            icon_on="mdi:weather-pouring",
+            entity_category=EntityCategory.DIAGNOSTIC,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="wind_prog_active",
+        name="Wind Program Active Sensor",
+        create_fn=lambda coordinator, device: HomePilotBinarySensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="wind_program_active",
+            name_suffix="Wind Program Active",
+            value_attr="_wind_prog_active_value",
+            device_class=BinarySensorDeviceClass.RUNNING,
+            icon_off="mdi:fan-off",
+            icon_on="mdi:weather-windy",
+            entity_category=EntityCategory.DIAGNOSTIC,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="sun_prog_active",
+        name="Sun Program Active Sensor",
+        create_fn=lambda coordinator, device: HomePilotBinarySensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="sun_program_active",
+            name_suffix="Sun Program Active",
+            value_attr="_sun_prog_active_value",
+            device_class=BinarySensorDeviceClass.RUNNING,
+            icon_on="mdi:weather-sunny",
+            icon_off="mdi:weather-sunny-off",
+            entity_category=EntityCategory.DIAGNOSTIC,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="open_window_detect",
+        name="Internal / External Open Window Detection Sensor",
+        create_fn=lambda coordinator, device: HomePilotBinaryInternalExternalSensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="open_window_detect",
+            name_suffix="Open Window Detection",
+            value_attr="open_window_detect_value",
+            device_class=BinarySensorDeviceClass.WINDOW,
+            icon_off="mdi:window-closed",
+            icon_on="mdi:window-open",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="channels",
+        name="Wall Controller",
+        create_fn=lambda coordinator, device: create_channel_entities(coordinator, device),
+    ),
+    HomePilotEntityDescription(
+        capability="battery_low",
+        name="Battery Low Event",
+        create_fn=lambda coordinator, device: HomePilotBinarySensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="battery_low",
+            name_suffix="Battery Low",
+            value_attr="battery_low_value",
+            device_class=BinarySensorDeviceClass.BATTERY,
+            entity_category=EntityCategory.DIAGNOSTIC,
+        ),
+    ),
+)
+
+
+def create_channel_entities(coordinator, device: HomePilotWallController) -> list[BinarySensorEntity]:
+    """Create the button entities of a wall controller."""
+    _LOGGER.info("Found Wall Controller with %s Button(s) for Device ID: %s", str(len(device.channels)), device.did)
+    # One poller per controller, shared by all its channels
+    channel_poller = WallControllerChannelPoller(coordinator.hass, device, coordinator.breaker)
     new_entities = []
+    for channel in device.channels:
+        _LOGGER.info("Adding Wall Controller Button: %s", channel)
+        new_entities.append(
+            HomePilotBinarySensorEntity(
+                coordinator=coordinator,
+                device=device,
+                id_suffix=channel,
+                name_suffix=channel,
+                value_attr=f"channel_{channel}",
+                device_class=BinarySensorDeviceClass.RUNNING,
+                channel_poller=channel_poller,
+            )
+        )
+    return new_entities
 
-    for did in manager.devices:
-        if did not in exclude_devices:
-            device: HomePilotDevice = manager.devices[did]
-            if isinstance(device, HomePilotSensor):
-                if device.has_rain_detection:
-                    _LOGGER.info(
-                        "Found Rain Detection Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotBinarySensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="rain_detect",
-                            name_suffix="Rain Detection",
-                            value_attr="rain_detection_value",
-                            device_class=BinarySensorDeviceClass.MOISTURE,
-                        )
-                    )
-                if device.has_sun_detection:
-                    _LOGGER.info(
-                        "Found Sun Detection Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotBinarySensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="sun_detect",
-                            name_suffix="Sun Detection",
-                            value_attr="sun_detection_value",
-                            device_class=BinarySensorDeviceClass.LIGHT,
-                        )
-                    )
-                if device.has_wind_detection:
-                    _LOGGER.info(
-                        "Found Wind Detection Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotBinarySensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="wind_detect",
-                            name_suffix="Wind Detection",
-                            value_attr="wind_detection_value",
-                            device_class=None,
-                            icon_off="mdi:weather-windy",
-                            icon_on="mdi:weather-windy",
-                        )
-                    )
-                if device.has_contact_state and device.did not in ternary_contact_sensors:
-                    _LOGGER.info("Found Contact Sensor for Device ID: %s", device.did)
-                    new_entities.append(
-                        HomePilotBinarySensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="contact_state",
-                            name_suffix="Contact State",
-                            value_attr="contact_state_value",
-                            device_class=BinarySensorDeviceClass.OPENING,
-                        )
-                    )
-                if device.has_motion_detection:
-                    _LOGGER.info("Found Motion Sensor for Device ID: %s", device.did)
-                    new_entities.append(
-                        HomePilotBinarySensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="motion_sensor",
-                            name_suffix="Motion Sensor",
-                            value_attr="motion_detection_value",
-                            device_class=BinarySensorDeviceClass.MOTION,
-                        )
-                    )
-                if device.has_smoke_detection:
-                    _LOGGER.info("Found Smoke Sensor for Device ID: %s", device.did)
-                    new_entities.append(
-                        HomePilotBinarySensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="smoke_detect",
-                            name_suffix="Smoke Detection",
-                            value_attr="smoke_detection_value",
-                            device_class=BinarySensorDeviceClass.SMOKE,
-                        )
-                    )
-            if isinstance(device, HomePilotCover):
-                if device.has_blocking_detection:
-                    _LOGGER.info(
-                        "Found Blocking Detection Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotBinarySensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="blocking_detection",
-                            name_suffix="Blocking Detection",
-                            value_attr="blocking_detection_status",
-                            device_class=BinarySensorDeviceClass.PROBLEM,
-                            icon_off="mdi:window-shutter",
-                            icon_on="mdi:window-shutter-alert",
-                            entity_category=EntityCategory.DIAGNOSTIC,
-                        )
-                    )
-                if device.has_obstacle_detection:
-                    _LOGGER.info(
-                        "Found Obstacle Detection Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotBinarySensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="obstacle_detection",
-                            name_suffix="Obstacle Detection",
-                            value_attr="obstacle_detection_status",
-                            device_class=BinarySensorDeviceClass.PROBLEM,
-                            icon_off="mdi:window-shutter",
-                            icon_on="mdi:window-shutter-alert",
-                            entity_category=EntityCategory.DIAGNOSTIC,
-                        )
-                    )
-            # Weather program "active" sensors are provided by any auto config
-            # device that advertises the corresponding *_PROG_ACTIVE_EVT event.
-            if isinstance(device, HomePilotAutoConfigDevice):
-                if device.has_rain_prog_active:
-                    _LOGGER.info(
-                        "Found Rain Program Active Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotBinarySensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="rain_program_active",
-                            name_suffix="Rain Program Active",
-                            value_attr="_rain_prog_active_value",
-                            device_class=BinarySensorDeviceClass.RUNNING,
-                            icon_off="mdi:weather-cloudy",
-                            icon_on="mdi:weather-pouring",
-                            entity_category=EntityCategory.DIAGNOSTIC,
-                        )
-                    )
-                if device.has_wind_prog_active:
-                    _LOGGER.info(
-                        "Found Wind Program Active Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotBinarySensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="wind_program_active",
-                            name_suffix="Wind Program Active",
-                            value_attr="_wind_prog_active_value",
-                            device_class=BinarySensorDeviceClass.RUNNING,
-                            icon_off="mdi:fan-off",
-                            icon_on="mdi:weather-windy",
-                            entity_category=EntityCategory.DIAGNOSTIC,
-                        )
-                    )
-                if device.has_sun_prog_active:
-                    _LOGGER.info(
-                        "Found Sun Program Active Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotBinarySensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="sun_program_active",
-                            name_suffix="Sun Program Active",
-                            value_attr="_sun_prog_active_value",
-                            device_class=BinarySensorDeviceClass.RUNNING,
-                            icon_on="mdi:weather-sunny",
-                            icon_off="mdi:weather-sunny-off",
-                            entity_category=EntityCategory.DIAGNOSTIC,
-                        )
-                    )
-            if isinstance(device, HomePilotThermostat):
-                if device.has_ext_open_window_detect or device.has_int_open_window_detect:
-                    _LOGGER.info(
-                        "Found Internal / External Open Window Detection Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotBinaryInternalExternalSensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="open_window_detect",
-                            name_suffix="Open Window Detection",
-                            value_attr="open_window_detect_value",
-                            device_class=BinarySensorDeviceClass.WINDOW,
-                            icon_off="mdi:window-closed",
-                            icon_on="mdi:window-open",
-                            entity_category=EntityCategory.DIAGNOSTIC,
-                            entity_registry_enabled_default=False
-                        )
-                    )
 
-            if isinstance(device, HomePilotWallController):
-                channels = device.channels
-                if channels is not None:
-                    _LOGGER.info("Found Wall Controller with %s Button(s) for Device ID: %s", str(len(channels)), device.did)
-                    for channel in channels:
-                        _LOGGER.info("Adding Wall Controller Button: %s", channel)
-                        new_entities.append(
-                            HomePilotBinarySensorEntity(
-                                coordinator=coordinator,
-                                device=device,
-                                id_suffix=channel,
-                                name_suffix=channel,
-                                value_attr=f"channel_{channel}",
-                                device_class=BinarySensorDeviceClass.RUNNING,
-                                has_channels=True,
-                                should_poll=channel == 1 #Only the first Channel needs to poll data of device
-                            )
-                        )
-                else:
-                    _LOGGER.info("No Wall Controller Channels for Device ID: %s", device.did)
-                if device.has_battery_low:
-                    _LOGGER.info(
-                        "Found Battery Low Event for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotBinarySensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="battery_low",
-                            name_suffix="Battery Low",
-                            value_attr="battery_low_value",
-                            device_class=BinarySensorDeviceClass.BATTERY,
-                            entity_category=EntityCategory.DIAGNOSTIC,
-                        )
-                    )
-    # If we have any new devices, add them
-    if new_entities:
-        async_add_entities(new_entities)
+async def async_setup_entry(hass, config_entry: ConfigEntry, async_add_entities):
+    """Setup of entities for binary_sensor platform."""
+    async_setup_device_entities(hass, config_entry, async_add_entities, ENTITY_DESCRIPTIONS)
 
 
 class HomePilotBinarySensorEntity(HomePilotEntity, BinarySensorEntity):
@@ -281,8 +251,7 @@ class HomePilotBinarySensorEntity(HomePilotEntity, BinarySensorEntity):
         entity_category=None,
         icon_on=None,
         icon_off=None,
-        has_channels=False,
-        should_poll=True,
+        channel_poller: WallControllerChannelPoller | None = None,
         entity_registry_enabled_default=True,
     ):
         super().__init__(
@@ -297,34 +266,16 @@ class HomePilotBinarySensorEntity(HomePilotEntity, BinarySensorEntity):
         self._value_attr = value_attr
         self._icon_on = icon_on
         self._icon_off = icon_off
-        self._has_channels = has_channels
-        self._should_poll = should_poll
+        self._channel_poller = channel_poller
 
     async def async_added_to_hass(self) -> None:
-        """Set up a timer for updating."""
-        if self._has_channels:
+        """Subscribe to the channel poller of wall controllers."""
+        await super().async_added_to_hass()
+        if self._channel_poller is not None:
             self.async_on_remove(
-                async_track_time_interval(
-                    self.hass, self._data_refresh, timedelta(seconds=2)
-                )
+                self._channel_poller.async_add_listener(self.async_write_ha_state)
             )
 
-    async def _data_poll(self):
-        _LOGGER.debug("### Pull data for Device ID: %s, %s, entity_id: %s", self.did, self._value_attr, self.entity_id)
-        if isinstance(self.coordinator.data[self.did], HomePilotWallController):
-            device: HomePilotWallController = self.coordinator.data[self.did]
-            await device.update_channels()
-            await self.coordinator.async_request_refresh()
-
-    async def _data_refresh(self, event_time):
-        if self._should_poll:
-            await self._data_poll()
-        self.async_write_ha_state()
-
-    @property
-    def should_poll(self):
-        return self._should_poll
-
     @property
     def value_attr(self):
         """This property stores which attribute contains the is_on value on
@@ -334,7 +285,7 @@ class HomePilotBinarySensorEntity(HomePilotEntity, BinarySensorEntity):
 
     @property
     def is_on(self):
-        value = getattr(self.coordinator.data[self.did], self.value_attr)
+        value = getattr(self.device, self.value_attr)
         return value if isinstance(value, bool) else value.value
 
     @property
@@ -382,8 +333,8 @@ class HomePilotBinaryInternalExternalSensorEntity(HomePilotEntity, BinarySensorE
 
     @property
     def is_on(self):
-        value_int = getattr(self.coordinator.data[self.did], self.value_attr_int)
-        value_ext = getattr(self.coordinator.data[self.did], self.value_attr_ext)
+        value_int = getattr(self.device, self.value_attr_int)
+        value_ext = getattr(self.device, self.value_attr_ext)
         if not isinstance(value_int, bool) or not isinstance(value_ext, bool):
             return value_int + value_ext
         return value_int or value_ext
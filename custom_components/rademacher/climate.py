@@ -1,43 +1,32 @@
 """Platform for Rademacher Bridge."""
 import logging
 
-from homepilot.device import HomePilotDevice
-from homepilot.manager import HomePilotManager
 from homepilot.thermostat import HomePilotThermostat
 
 from homeassistant.components.climate import ClimateEntity
 from homeassistant.components.climate.const import ClimateEntityFeature, HVACMode, HVACAction, PRESET_NONE, PRESET_BOOST
-from homeassistant.const import CONF_EXCLUDE, UnitOfTemperature
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.const import UnitOfTemperature
 
-from .const import DOMAIN
+from .descriptions import HomePilotEntityDescription, async_setup_device_entities
 from .entity import HomePilotEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
+ENTITY_DESCRIPTIONS = (
+    HomePilotEntityDescription(
+        capability="thermostat",
+        name="Thermostat",
+        create_fn=lambda coordinator, device: HomePilotClimateEntity(
+            coordinator, device, UnitOfTemperature.CELSIUS
+        ),
+    ),
+)
+
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Setup of entities for sensor platform."""
-    entry = hass.data[DOMAIN][config_entry.entry_id]
-    manager: HomePilotManager = entry[0]
-    coordinator: DataUpdateCoordinator = entry[1]
-    exclude_devices: list[str] = entry[3][CONF_EXCLUDE]
-    new_entities = []
-    for did in manager.devices:
-        if did not in exclude_devices:
-            device: HomePilotDevice = manager.devices[did]
-            if isinstance(device, HomePilotThermostat):
-                _LOGGER.info("Found Thermostat for Device ID: %s", device.did)
-                new_entities.append(
-                    HomePilotClimateEntity(
-                        coordinator,
-                        device,
-                        UnitOfTemperature.CELSIUS,
-                    )
-                )
-    # If we have any new devices, add them
-    if new_entities:
-        async_add_entities(new_entities)
+    async_setup_device_entities(hass, config_entry, async_add_entities, ENTITY_DESCRIPTIONS)
 
 
 class HomePilotClimateEntity(HomePilotEntity, ClimateEntity):
@@ -69,7 +58,7 @@ class HomePilotClimateEntity(HomePilotEntity, ClimateEntity):
         self._attr_preset_modes = [PRESET_NONE, PRESET_BOOST] if device.has_boost_active else None
 
     async def async_set_hvac_mode(self, hvac_mode: str) -> None:
-        device: HomePilotThermostat = self.coordinator.data[self.did]
+        device: HomePilotThermostat = self.device
         if device.has_auto_mode:
             await self.async_execute_and_poll(
                 lambda d: d.async_set_auto_mode(hvac_mode == HVACMode.AUTO),
@@ -77,29 +66,30 @@ class HomePilotClimateEntity(HomePilotEntity, ClimateEntity):
             )
 
     async def async_set_temperature(self, **kwargs) -> None:
-        device: HomePilotThermostat = self.coordinator.data[self.did]
+        device: HomePilotThermostat = self.device
         if device.can_set_target_temperature:
             temperature = kwargs["temperature"]
             await self.async_execute_and_poll(
                 lambda d: d.async_set_target_temperature(temperature),
                 lambda: self.target_temperature == temperature,
+                kind="target_temperature",
             )
 
     @property
     def current_temperature(self) -> float|None:
-        device: HomePilotThermostat = self.coordinator.data[self.did]
+        device: HomePilotThermostat = self.device
         return device.temperature_value if device.has_temperature else None
 
     @property
     def target_temperature(self) -> float|None:
-        device: HomePilotThermostat = self.coordinator.data[self.did]
+        device: HomePilotThermostat = self.device
         return (
             device.target_temperature_value if device.has_target_temperature else None
         )
 
     @property
     def hvac_mode(self) -> HVACMode|None:
-        device: HomePilotThermostat = self.coordinator.data[self.did]
+        device: HomePilotThermostat = self.device
         return (
             HVACMode.AUTO
             if device.has_auto_mode and device.auto_mode_value
@@ -108,7 +98,7 @@ class HomePilotClimateEntity(HomePilotEntity, ClimateEntity):
 
     @property
     def hvac_action(self) -> HVACAction|None:
-        device: HomePilotThermostat = self.coordinator.data[self.did]
+        device: HomePilotThermostat = self.device
         if not device.has_relais_status:
             return None
         if device.relais_status and self.current_temperature is not None and self.target_temperature is not None:
@@ -121,13 +111,13 @@ class HomePilotClimateEntity(HomePilotEntity, ClimateEntity):
 
     @property
     def preset_mode(self) -> str | None:
-        device: HomePilotThermostat = self.coordinator.data[self.did]
+        device: HomePilotThermostat = self.device
         if not device.has_boost_active:
             return None
         return PRESET_BOOST if device.boost_active_value else PRESET_NONE
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
-        device: HomePilotThermostat = self.coordinator.data[self.did]
+        device: HomePilotThermostat = self.device
         if not device.has_boost_active:
             return
         await self.async_execute_and_poll(
@@ -137,7 +127,7 @@ class HomePilotClimateEntity(HomePilotEntity, ClimateEntity):
 
     @property
     def supported_features(self) -> ClimateEntityFeature:
-        device: HomePilotThermostat = self.coordinator.data[self.did]
+        device: HomePilotThermostat = self.device
         feature = ClimateEntityFeature.TARGET_TEMPERATURE if device.can_set_target_temperature else 0
         feature |= ClimateEntityFeature.PRESET_MODE if device.has_boost_active else 0
         return ClimateEntityFeature(feature)
@@ -9,7 +9,7 @@ import voluptuous as vol
 
 from homeassistant import config_entries, data_entry_flow, exceptions
 from homeassistant.components.dhcp import HOSTNAME, IP_ADDRESS, MAC_ADDRESS
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import (
     CONF_API_VERSION,
     CONF_DEVICES,
@@ -29,15 +29,23 @@ from homeassistant.helpers.selector import (
 
 from .const import (
     DOMAIN,
+    CONF_RESCAN_DEVICES,
     CONF_ENABLE_CYCLIC_SCENE_POLLING,
     CONF_CREATE_SCENE_ACTIVATION_ENTITIES,
     CONF_INCLUDE_NON_EXECUTABLE_SCENES,
     CONF_UPDATE_INTERVAL,
     DEFAULT_UPDATE_INTERVAL,
+    CONF_MAX_UPDATE_INTERVAL,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    CONF_SENSOR_UPDATE_INTERVAL,
+    DEFAULT_SENSOR_UPDATE_INTERVAL,
+    CONF_HUB_UPDATE_INTERVAL,
+    DEFAULT_HUB_UPDATE_INTERVAL,
     CONF_SCENE_UPDATE_INTERVAL,
     DEFAULT_SCENE_UPDATE_INTERVAL,
     CONF_CREATE_INVERTED_COVER_POSITION,
 )
+from .discovery import async_discover, async_refresh_discovery, async_save_discovery
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -77,6 +85,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_CREATE_SCENE_ACTIVATION_ENTITIES: user_input.get(CONF_CREATE_SCENE_ACTIVATION_ENTITIES, False),
                     CONF_INCLUDE_NON_EXECUTABLE_SCENES: user_input.get(CONF_INCLUDE_NON_EXECUTABLE_SCENES, False),
                     CONF_UPDATE_INTERVAL: int(user_input.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)),
+                    CONF_MAX_UPDATE_INTERVAL: int(user_input.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL)),
+                    CONF_SENSOR_UPDATE_INTERVAL: int(user_input.get(CONF_SENSOR_UPDATE_INTERVAL, DEFAULT_SENSOR_UPDATE_INTERVAL)),
+                    CONF_HUB_UPDATE_INTERVAL: int(user_input.get(CONF_HUB_UPDATE_INTERVAL, DEFAULT_HUB_UPDATE_INTERVAL)),
                     CONF_SCENE_UPDATE_INTERVAL: int(user_input.get(CONF_SCENE_UPDATE_INTERVAL, DEFAULT_SCENE_UPDATE_INTERVAL)),
                     CONF_CREATE_INVERTED_COVER_POSITION: user_input.get(CONF_CREATE_INVERTED_COVER_POSITION, False),
                 }
@@ -370,6 +381,15 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL): NumberSelector(
                     NumberSelectorConfig(min=5, max=120, step=1, unit_of_measurement="s", mode=NumberSelectorMode.SLIDER)
                 ),
+                vol.Optional(CONF_MAX_UPDATE_INTERVAL, default=DEFAULT_MAX_UPDATE_INTERVAL): NumberSelector(
+                    NumberSelectorConfig(min=5, max=600, step=5, unit_of_measurement="s", mode=NumberSelectorMode.SLIDER)
+                ),
+                vol.Optional(CONF_SENSOR_UPDATE_INTERVAL, default=DEFAULT_SENSOR_UPDATE_INTERVAL): NumberSelector(
+                    NumberSelectorConfig(min=10, max=600, step=5, unit_of_measurement="s", mode=NumberSelectorMode.SLIDER)
+                ),
+                vol.Optional(CONF_HUB_UPDATE_INTERVAL, default=DEFAULT_HUB_UPDATE_INTERVAL): NumberSelector(
+                    NumberSelectorConfig(min=60, max=86400, step=60, unit_of_measurement="s", mode=NumberSelectorMode.BOX)
+                ),
                 vol.Optional(CONF_SCENE_UPDATE_INTERVAL, default=DEFAULT_SCENE_UPDATE_INTERVAL): NumberSelector(
                     NumberSelectorConfig(min=10, max=120, step=1, unit_of_measurement="s", mode=NumberSelectorMode.SLIDER)
                 ),
@@ -384,12 +404,19 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
-    host: str
-    password: str
+    _devices: dict
 
     async def async_step_init(self, user_input=None):
         """Manage the options."""
-        if user_input is not None:
+        errors = {}
+        if user_input is not None and user_input.get(CONF_RESCAN_DEVICES):
+            # Show the form again with the freshly discovered devices
+            try:
+                self._devices = await self._async_discover_devices()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Rescan of devices failed (IP %s)", self.config_entry.data[CONF_HOST])
+                errors["base"] = "cannot_connect"
+        elif user_input is not None:
             data = {
                 CONF_EXCLUDE: user_input[CONF_EXCLUDE],
                 CONF_SENSOR_TYPE: user_input.get(CONF_SENSOR_TYPE, []),
@@ -397,79 +424,112 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 CONF_CREATE_SCENE_ACTIVATION_ENTITIES: user_input.get(CONF_CREATE_SCENE_ACTIVATION_ENTITIES, False),
                 CONF_INCLUDE_NON_EXECUTABLE_SCENES: user_input.get(CONF_INCLUDE_NON_EXECUTABLE_SCENES, False),
                 CONF_UPDATE_INTERVAL: int(user_input.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)),
+                CONF_MAX_UPDATE_INTERVAL: int(user_input.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL)),
+                CONF_SENSOR_UPDATE_INTERVAL: int(user_input.get(CONF_SENSOR_UPDATE_INTERVAL, DEFAULT_SENSOR_UPDATE_INTERVAL)),
+                CONF_HUB_UPDATE_INTERVAL: int(user_input.get(CONF_HUB_UPDATE_INTERVAL, DEFAULT_HUB_UPDATE_INTERVAL)),
                 CONF_SCENE_UPDATE_INTERVAL: int(user_input.get(CONF_SCENE_UPDATE_INTERVAL, DEFAULT_SCENE_UPDATE_INTERVAL)),
                 CONF_CREATE_INVERTED_COVER_POSITION: user_input.get(CONF_CREATE_INVERTED_COVER_POSITION, False),
             }
-            return self.async_create_entry(title=f"{self.hostname} ({self.mac_address})", data=data)
-        self.host = self.config_entry.data[CONF_HOST]
-        self.password = self.config_entry.data.get(CONF_PASSWORD, "")
-        self.api_version = self.config_entry.data.get(CONF_API_VERSION, 1)
-        api = HomePilotApi(
-            self.host, self.password, self.api_version
-        )  # password can be empty if not defined ("")
-        try:
-            # Check if include non executable scenes is enabled
-            include_non_manual = self.config_entry.options.get(CONF_INCLUDE_NON_EXECUTABLE_SCENES, False)
-            manager = await HomePilotManager.async_build_manager(api, include_non_manual_executable=include_non_manual)
-            self.mac_address = format_mac(await manager.get_hub_macaddress())
-            self.hostname = await manager.get_nodename()
-            if not manager.devices:
-                return self.async_abort(reason="no_devices_found")
+            return self.async_create_entry(title=self.config_entry.title, data=data)
+        elif self.config_entry.state is ConfigEntryState.LOADED:
+            # Reuse the devices of the running integration, no bridge traffic
+            manager: HomePilotManager = self.config_entry.runtime_data.manager
+            self._devices = manager.devices
+        else:
+            self._devices = await self._async_discover_devices()
+        if not self._devices:
+            return self.async_abort(reason="no_devices_found")
+
+        # Keep the values entered before a rescan
+        options = {**self.config_entry.options, **(user_input or {})}
+        if CONF_EXCLUDE in options:
+            previous_excluded_devices = options[CONF_EXCLUDE]
+        elif CONF_DEVICES in options:
+            previous_excluded_devices = [
+                did
+                for did in self._devices
+                if did not in options[CONF_DEVICES]
+            ]
+        else:
+            previous_excluded_devices = []
+        if CONF_SENSOR_TYPE in options:
+            previous_ternary_contact_sensors = options[
+                CONF_SENSOR_TYPE
+            ]
+        else:
+            previous_ternary_contact_sensors = []
+
+        previous_include_non_executable_scenes = options.get(
+            CONF_INCLUDE_NON_EXECUTABLE_SCENES, False
+        )
+        previous_enable_scene_polling = options.get(
+            CONF_ENABLE_CYCLIC_SCENE_POLLING, False
+        )
+        previous_create_scene_activation_entities = options.get(
+            CONF_CREATE_SCENE_ACTIVATION_ENTITIES, False
+        )
+        previous_update_interval = options.get(
+            CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
+        )
+        previous_max_update_interval = options.get(
+            CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+        )
+        previous_sensor_update_interval = options.get(
+            CONF_SENSOR_UPDATE_INTERVAL, DEFAULT_SENSOR_UPDATE_INTERVAL
+        )
+        previous_hub_update_interval = options.get(
+            CONF_HUB_UPDATE_INTERVAL, DEFAULT_HUB_UPDATE_INTERVAL
+        )
+        previous_scene_update_interval = options.get(
+            CONF_SCENE_UPDATE_INTERVAL, DEFAULT_SCENE_UPDATE_INTERVAL
+        )
+        previous_create_inverted_cover_position = options.get(
+            CONF_CREATE_INVERTED_COVER_POSITION, False
+        )
 
-            if CONF_EXCLUDE in self.config_entry.options:
-                previous_excluded_devices = self.config_entry.options[CONF_EXCLUDE]
-            elif CONF_DEVICES in self.config_entry.options:
-                previous_excluded_devices = [
-                    did
-                    for did in manager.devices
-                    if did not in self.config_entry.options[CONF_DEVICES]
-                ]
-            else:
-                previous_excluded_devices = []
-            if CONF_SENSOR_TYPE in self.config_entry.options:
-                previous_ternary_contact_sensors = self.config_entry.options[
-                    CONF_SENSOR_TYPE
-                ]
-            else:
-                previous_ternary_contact_sensors = []
-
-            previous_include_non_executable_scenes = self.config_entry.options.get(
-                CONF_INCLUDE_NON_EXECUTABLE_SCENES, False
-            )
-            previous_enable_scene_polling = self.config_entry.options.get(
-                CONF_ENABLE_CYCLIC_SCENE_POLLING, False
-            )
-            previous_create_scene_activation_entities = self.config_entry.options.get(
-                CONF_CREATE_SCENE_ACTIVATION_ENTITIES, False
-            )
-            previous_update_interval = self.config_entry.options.get(
-                CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
-            )
-            previous_scene_update_interval = self.config_entry.options.get(
-                CONF_SCENE_UPDATE_INTERVAL, DEFAULT_SCENE_UPDATE_INTERVAL
-            )
-            previous_create_inverted_cover_position = self.config_entry.options.get(
-                CONF_CREATE_INVERTED_COVER_POSITION, False
-            )
+        data_schema_config = self.build_data_schema(
+            self._devices, previous_excluded_devices, previous_ternary_contact_sensors,
+            previous_enable_scene_polling, previous_create_scene_activation_entities,
+            previous_include_non_executable_scenes, previous_update_interval,
+            previous_scene_update_interval,
+            previous_create_inverted_cover_position,
+            previous_max_update_interval,
+            previous_sensor_update_interval,
+            previous_hub_update_interval
+        )
 
-            data_schema_config = self.build_data_schema(
-                manager.devices, previous_excluded_devices, previous_ternary_contact_sensors,
-                previous_enable_scene_polling, previous_create_scene_activation_entities,
-                previous_include_non_executable_scenes, previous_update_interval,
-                previous_scene_update_interval,
-                previous_create_inverted_cover_position
-            )
+        return self.async_show_form(step_id="init", data_schema=data_schema_config, errors=errors)
 
-            return self.async_show_form(step_id="init", data_schema=data_schema_config)
+    async def _async_discover_devices(self):
+        """Run a full discovery against the bridge and refresh the discovery cache.
+
+        A loaded entry also gets the new and removed devices applied right away.
+        """
+        if self.config_entry.state is ConfigEntryState.LOADED:
+            await async_refresh_discovery(self.hass, self.config_entry)
+            return self.config_entry.runtime_data.manager.devices
+        include_non_manual = self.config_entry.options.get(CONF_INCLUDE_NON_EXECUTABLE_SCENES, False)
+        api = HomePilotApi(
+            self.config_entry.data[CONF_HOST],
+            self.config_entry.data.get(CONF_PASSWORD, ""),
+            self.config_entry.data.get(CONF_API_VERSION, 1),
+        )  # password can be empty if not defined ("")
+        try:
+            manager, responses = await async_discover(api, include_non_manual)
         finally:
             await api.async_close()
+        await async_save_discovery(self.hass, self.config_entry, responses, include_non_manual)
+        return manager.devices
 
     def build_data_schema(
         self, devices, previous_excluded_devices, previous_ternary_contact_sensors,
         previous_enable_scene_polling, previous_create_scene_activation_entities,
         previous_include_non_executable_scenes, previous_update_interval=DEFAULT_UPDATE_INTERVAL,
         previous_scene_update_interval=DEFAULT_SCENE_UPDATE_INTERVAL,
-        previous_create_inverted_cover_position=False
+        previous_create_inverted_cover_position=False,
+        previous_max_update_interval=DEFAULT_MAX_UPDATE_INTERVAL,
+        previous_sensor_update_interval=DEFAULT_SENSOR_UPDATE_INTERVAL,
+        previous_hub_update_interval=DEFAULT_HUB_UPDATE_INTERVAL
     ):
         devices_to_exclude = {
             did: f"{devices[did].name} (id: {devices[did].did})" for did in devices
@@ -521,6 +581,21 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 ): NumberSelector(
                     NumberSelectorConfig(min=5, max=120, step=1, unit_of_measurement="s", mode=NumberSelectorMode.SLIDER)
                 ),
+                vol.Optional(
+                    CONF_MAX_UPDATE_INTERVAL, default=previous_max_update_interval
+                ): NumberSelector(
+                    NumberSelectorConfig(min=5, max=600, step=5, unit_of_measurement="s", mode=NumberSelectorMode.SLIDER)
+                ),
+                vol.Optional(
+                    CONF_SENSOR_UPDATE_INTERVAL, default=previous_sensor_update_interval
+                ): NumberSelector(
+                    NumberSelectorConfig(min=10, max=600, step=5, unit_of_measurement="s", mode=NumberSelectorMode.SLIDER)
+                ),
+                vol.Optional(
+                    CONF_HUB_UPDATE_INTERVAL, default=previous_hub_update_interval
+                ): NumberSelector(
+                    NumberSelectorConfig(min=60, max=86400, step=60, unit_of_measurement="s", mode=NumberSelectorMode.BOX)
+                ),
                 vol.Optional(
                     CONF_SCENE_UPDATE_INTERVAL, default=previous_scene_update_interval
                 ): NumberSelector(
@@ -533,6 +608,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Optional(
                     CONF_CREATE_INVERTED_COVER_POSITION, default=previous_create_inverted_cover_position
                 ): bool,
+                vol.Optional(CONF_RESCAN_DEVICES, default=False): bool,
             }
         )
         return schema
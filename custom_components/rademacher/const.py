@@ -8,7 +8,28 @@ CONF_CREATE_SCENE_ACTIVATION_ENTITIES = "create_scene_activation_entities"
 CONF_INCLUDE_NON_EXECUTABLE_SCENES = "include_non_executable_scenes"
 CONF_UPDATE_INTERVAL = "update_interval"
 CONF_SCENE_UPDATE_INTERVAL = "scene_update_interval"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
+CONF_SENSOR_UPDATE_INTERVAL = "sensor_update_interval"
+CONF_HUB_UPDATE_INTERVAL = "hub_update_interval"
 CONF_CREATE_INVERTED_COVER_POSITION = "create_inverted_cover_position"
+# Options flow action, not stored in the options
+CONF_RESCAN_DEVICES = "rescan_devices"
+
+# Service field, not in homeassistant.const of the supported versions
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
 
 DEFAULT_UPDATE_INTERVAL = 10  # seconds
 DEFAULT_SCENE_UPDATE_INTERVAL = 15  # seconds
+DEFAULT_MAX_UPDATE_INTERVAL = 60  # seconds
+DEFAULT_SENSOR_UPDATE_INTERVAL = 60  # seconds
+DEFAULT_HUB_UPDATE_INTERVAL = 3600  # seconds
+
+# Dispatcher signals adding the entities of devices or scenes to a loaded entry,
+# formatted with the config entry id
+SIGNAL_ADD_DEVICES = "rademacher_add_devices_{}"
+SIGNAL_ADD_SCENES = "rademacher_add_scenes_{}"
+
+# Polling tiers, each one backed by its own coordinator
+TIER_DEVICES = "devices"
+TIER_SENSORS = "sensors"
+TIER_HUB = "hub"
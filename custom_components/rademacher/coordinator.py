@@ -0,0 +1,930 @@
+"""Data update coordinators for Rademacher Bridge."""
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+from typing import Any
+
+import aiohttp
+from homepilot.api import HomePilotApi
+from homepilot.device import HomePilotDevice
+from homepilot.hub import HomePilotHub
+from homepilot.manager import HomePilotManager
+from homepilot.scenes import HomePilotScene
+from homepilot.sensor import HomePilotSensor
+from homepilot.wallcontroller import HomePilotWallController
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import TIER_DEVICES, TIER_HUB, TIER_SENSORS
+from .telemetry import HomePilotTelemetry
+
+_LOGGER = logging.getLogger(__name__)
+
+# Factor applied to the polling interval after each poll returning unchanged data
+BACKOFF_FACTOR = 1.5
+
+# The polling interval is kept at least this multiple of the measured cycle
+# duration, so that a slow bridge gets idle time between polls, and weight of
+# the latest cycle in the smoothed cycle duration
+CYCLE_DURATION_FACTOR = 3
+CYCLE_DURATION_SMOOTHING = 0.3
+
+# Post-command reconciliation: time window in which commanded devices are
+# collected, cadence and timeout of the shared verification polls (seconds)
+RECONCILE_WINDOW = 0.25
+RECONCILE_INTERVAL = 1.0
+RECONCILE_TIMEOUT = 10
+
+# Timeout for sending a single command to the bridge (seconds)
+COMMAND_TIMEOUT = 5
+
+# Polling interval of the push button channels of wall controllers
+CHANNEL_POLL_INTERVAL = timedelta(seconds=2)
+
+# Partial polls: timeout and concurrency of the per-device state updates, and
+# number of polls in a row a device may miss before it is marked unavailable
+DEVICE_UPDATE_TIMEOUT = 5
+DEVICE_UPDATE_CONCURRENCY = 4
+STALE_POLLS_UNAVAILABLE = 3
+
+# A device whose raw state is unchanged skips parsing, but is still parsed
+# after this many skipped polls in a row: some values, e.g. the automation
+# settings of actuators, are fetched by the parsing with a request of its own
+PARSE_SKIP_LIMIT = 5
+
+# Circuit breaker: consecutive failed requests opening it, first and maximum
+# delay between the health probes while open, and timeout of a probe (seconds)
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_MIN_BACKOFF = 10
+BREAKER_MAX_BACKOFF = 300
+BREAKER_PROBE_TIMEOUT = 5
+
+# Scene polls returning an unchanged scene list stretch the scene polling
+# interval by BACKOFF_FACTOR, up to this multiple of the configured interval
+SCENE_MAX_BACKOFF_FACTOR = 8
+
+
+def state_fingerprint(obj: Any) -> int:
+    """Return a cheap fingerprint of the parsed state of a device or scene."""
+    return hash(
+        tuple((key, repr(value)) for key, value in vars(obj).items() if key != "_api")
+    )
+
+
+def payload_fingerprint(payload: Any) -> int:
+    """Return a cheap fingerprint of a raw JSON response of the bridge."""
+    return hash(repr(payload))
+
+
+def get_device_tier(device: HomePilotDevice) -> str:
+    """Return the polling tier a device belongs to.
+
+    Actuators, thermostats and event driven sensors (contact, motion, smoke) are
+    polled on the fast tier. Weather sensors and wall controllers, whose polled
+    state is mostly measurements and battery status, are polled on the slower
+    sensor tier, and the hub firmware/LED fields on the very slow hub tier.
+    """
+    if isinstance(device, HomePilotHub):
+        return TIER_HUB
+    if isinstance(device, HomePilotWallController):
+        return TIER_SENSORS
+    if isinstance(device, HomePilotSensor) and not (
+        device.has_contact_state
+        or device.has_motion_detection
+        or device.has_smoke_detection
+    ):
+        return TIER_SENSORS
+    return TIER_DEVICES
+
+
+async def async_get_device_state(device: HomePilotDevice) -> dict[str, Any]:
+    """Fetch the raw state of a single device, including the hub."""
+    api = device.api
+    if isinstance(device, HomePilotHub):
+        return {
+            "status": await api.async_get_fw_status(),
+            "version": await api.async_get_fw_version(),
+            "led": await api.async_get_led_status(),
+        }
+    return await api.async_get_device_state(device.did)
+
+
+class RawStateCache:
+    """Fingerprints of the raw state each device of a polling tier was parsed from.
+
+    skipped holds the number of devices whose parsing was skipped by the last
+    poll, as their raw state sub-document was unchanged. Owned by the
+    coordinator of the tier, every poll or reconciliation parsing its devices
+    goes through it, so that no fingerprint outlives the state it stands for.
+    """
+
+    def __init__(self) -> None:
+        self._fingerprints: dict[str, tuple[int, int]] = {}
+        self.skipped = 0
+
+    def is_unchanged(self, did: str, device: HomePilotDevice, state: dict[str, Any]) -> bool:
+        """Return whether the device can skip parsing the given raw state."""
+        fingerprint = payload_fingerprint(state)
+        previous, skips = self._fingerprints.get(did, (None, 0))
+        # Unavailable devices were marked so by the poll, not by their state
+        if fingerprint == previous and device.available and skips < PARSE_SKIP_LIMIT:
+            self._fingerprints[did] = (fingerprint, skips + 1)
+            return True
+        return False
+
+    def parsed(self, did: str, state: dict[str, Any]) -> None:
+        """Store the fingerprint of the raw state the device was parsed from."""
+        self._fingerprints[did] = (payload_fingerprint(state), 0)
+
+    def discard(self, dids: Iterable[str]) -> None:
+        """Forget the fingerprints of the given devices."""
+        for did in dids:
+            self._fingerprints.pop(did, None)
+
+
+async def async_update_device_states(
+    api: HomePilotApi,
+    devices: dict[str, HomePilotDevice],
+    timeout: float | None = None,
+    missed_polls: Counter[str] | None = None,
+    state_cache: RawStateCache | None = None,
+    laggard_order: list[str] | None = None,
+    force: bool = False,
+) -> set[str]:
+    """Poll and parse the state of the given devices, returns the ids of the laggards.
+
+    Same as HomePilotManager.update_states, restricted to a subset of devices
+    and only querying the hub state when the hub is part of the subset.
+
+    The bulk state fetch has to finish within timeout, otherwise the poll
+    fails. Devices whose parsing needs a request of its own are then updated
+    concurrently, each within DEVICE_UPDATE_TIMEOUT and the rest of timeout.
+    When laggard_order is given, the laggards of the previous poll are updated
+    first, longest waiting first, and the list is replaced with the laggards
+    of this poll, so that the same devices do not run out of time poll after
+    poll. Laggards keep their previous state and, when missed_polls is
+    given, are marked unavailable after STALE_POLLS_UNAVAILABLE polls missed
+    in a row. Devices whose turn only came after the deadline were not polled,
+    so this does not count as a miss.
+    When state_cache is given, devices whose raw state is unchanged since they
+    were last parsed keep their parsed state, unless force is set: values
+    fetched by the parsing with a request of its own may have changed anyway.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    # Devices can be added to the dict while polling, iterate over a snapshot
+    snapshot = list(devices.items())
+    try:
+        async with asyncio.timeout_at(deadline):
+            states = {}
+            if any(not isinstance(device, HomePilotHub) for _, device in snapshot):
+                states = await api.async_get_devices_state()
+            for did, device in snapshot:
+                if isinstance(device, HomePilotHub):
+                    states[did] = await async_get_device_state(device)
+    except Exception:
+        for _, device in snapshot:
+            device.available = False
+        raise
+
+    semaphore = asyncio.Semaphore(DEVICE_UPDATE_CONCURRENCY)
+
+    async def async_update_device(did: str, device: HomePilotDevice) -> bool | None:
+        async with semaphore:
+            device_timeout = DEVICE_UPDATE_TIMEOUT
+            if deadline is not None:
+                # Past the deadline, devices parsed without a request are still updated
+                device_timeout = max(min(device_timeout, deadline - loop.time()), 0)
+            try:
+                async with asyncio.timeout(device_timeout):
+                    await device.update_state(states[did], api)
+            except (TimeoutError, aiohttp.ClientError) as err:
+                if not device_timeout:
+                    _LOGGER.debug("Device %s was not polled before the deadline", did)
+                    return None
+                _LOGGER.debug("Device %s did not answer in time: %r", did, err)
+                return False
+        if state_cache is not None:
+            state_cache.parsed(did, states[did])
+        return True
+
+    polled = []
+    skipped = []
+    for did, device in snapshot:
+        if did not in states:
+            device.available = False
+        elif state_cache is not None and not force and state_cache.is_unchanged(did, device, states[did]):
+            skipped.append((did, device))
+        else:
+            polled.append((did, device))
+    if laggard_order is not None:
+        rank = {did: index for index, did in enumerate(laggard_order)}
+        polled.sort(key=lambda item: rank.get(item[0], len(rank)))
+    results = await asyncio.gather(*(async_update_device(did, device) for did, device in polled))
+    polled += skipped
+    results += [True] * len(skipped)
+
+    laggards = set()
+    for (did, device), updated in zip(polled, results):
+        if updated:
+            if missed_polls is not None:
+                missed_polls.pop(did, None)
+            continue
+        laggards.add(did)
+        if missed_polls is not None and updated is not None:
+            missed_polls[did] += 1
+            if missed_polls[did] >= STALE_POLLS_UNAVAILABLE:
+                device.available = False
+    if laggard_order is not None:
+        laggard_order[:] = [did for did, _ in polled if did in laggards]
+    # Set after the last await, so that the caller reads the count of its own call
+    if state_cache is not None:
+        state_cache.skipped = len(skipped)
+    return laggards
+
+
+class BridgeUnavailableError(UpdateFailed):
+    """Raised instead of calling the bridge while its circuit breaker is open."""
+
+
+class BridgeCircuitBreaker:
+    """Stops calling a bridge which stopped answering, until it recovers.
+
+    Opens after consecutive failed polls or commands. While open, calls guarded
+    by guard fail fast and the bridge is probed with a single cheap request,
+    at exponentially growing intervals. The breaker closes on the first
+    successful probe. Listeners are notified whenever it opens or closes.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, name: str, probe_fn: Callable[[], Awaitable[Any]]
+    ) -> None:
+        self.hass = hass
+        self.name = name
+        self._probe_fn = probe_fn
+        self.failures = 0
+        self.backoff = BREAKER_MIN_BACKOFF
+        self.opened = 0
+        self._probe_task: asyncio.Task | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @property
+    def is_open(self) -> bool:
+        return self._probe_task is not None
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Fail fast while open, otherwise count the outcome of the bridge call."""
+        if self.is_open:
+            raise BridgeUnavailableError(f"{self.name} is unreachable, retrying in up to {self.backoff} seconds")
+        try:
+            yield
+        except (TimeoutError, aiohttp.ClientError):
+            self._async_record_failure()
+            raise
+        self.failures = 0
+
+    @callback
+    def _async_record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= BREAKER_FAILURE_THRESHOLD and not self.is_open:
+            _LOGGER.warning("%s - Unreachable after %s failed requests, pausing polling", self.name, self.failures)
+            self.opened += 1
+            self.backoff = BREAKER_MIN_BACKOFF
+            self._probe_task = self.hass.async_create_background_task(
+                self._async_probe_loop(), name=f"{self.name} health probe"
+            )
+            self._async_notify()
+
+    async def _async_probe_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.backoff)
+            try:
+                async with asyncio.timeout(BREAKER_PROBE_TIMEOUT):
+                    await self._probe_fn()
+            except Exception as err:  # pylint: disable=broad-except
+                self.backoff = min(self.backoff * 2, BREAKER_MAX_BACKOFF)
+                _LOGGER.debug("%s - Still unreachable (%s), next probe in %s seconds", self.name, err, self.backoff)
+                continue
+            break
+        _LOGGER.warning("%s - Reachable again, resuming polling", self.name)
+        self._probe_task = None
+        self.failures = 0
+        self._async_notify()
+
+    @callback
+    def _async_notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for the breaker opening or closing, returns a function removing the listener."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_stop(self) -> None:
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "open": self.is_open,
+            "failures": self.failures,
+            "backoff": self.backoff,
+            "opened": self.opened,
+        }
+
+
+@dataclass
+class _QueuedCommand:
+    """A command waiting for its turn to be sent to a device."""
+
+    command_fn: Callable[[], Awaitable[None]]
+    future: asyncio.Future
+
+
+@dataclass
+class _PendingCheck:
+    """A device waiting for its state to be confirmed after a command."""
+
+    did: str
+    check_fn: Callable[[], bool]
+    not_before: float
+    deadline: float
+    future: asyncio.Future
+
+
+class HomePilotDataUpdateCoordinator(DataUpdateCoordinator):
+    """Coordinator which adapts its polling interval to the bridge activity.
+
+    Polling starts at the floor interval and is stretched step by step up to the
+    ceiling interval while consecutive polls return unchanged data. Any detected
+    change, or any command sent to a device, brings it back to the floor.
+
+    Listeners registered with a device id as context are only notified when the
+    fingerprint of that device changed, so unchanged entities skip their state
+    write. Listeners without a context are always notified.
+
+    After a command, entities wait for their new state through async_reconcile.
+    Devices commanded within a short window are verified together with one bulk
+    state fetch per round, and published with a single combined update.
+
+    Commands are sent through async_queue_command, one at a time per device.
+    A queued command is dropped when a newer command of the same kind arrives
+    for the same device before it was sent, so only the latest value of a
+    slider drag reaches the radio and gets verified.
+
+    While the circuit breaker of the bridge is open, polls and commands fail
+    fast and the polling interval is parked at the maximum probe backoff. The
+    coordinator refreshes right away once the breaker closes.
+
+    A cycle never starts while another one is in flight: a refresh requested
+    meanwhile shares the result of the running cycle and is counted as
+    skipped. The interval is stretched when cycles take long, see
+    CYCLE_DURATION_FACTOR.
+    """
+
+    def __init__(
+        self,
+        hass,
+        logger: logging.Logger,
+        *,
+        name: str,
+        update_method,
+        devices: dict[str, HomePilotDevice],
+        min_update_interval: float,
+        max_update_interval: float,
+        breaker: BridgeCircuitBreaker,
+        telemetry: HomePilotTelemetry | None = None,
+    ) -> None:
+        super().__init__(
+            hass,
+            logger,
+            name=name,
+            update_method=update_method,
+            update_interval=timedelta(seconds=min_update_interval),
+        )
+        # Polled by the update method, changed through async_add_devices and
+        # async_remove_devices
+        self.devices = devices
+        self._min_update_interval = min_update_interval
+        self._max_update_interval = max(max_update_interval, min_update_interval)
+        self._fingerprints: dict[str, int] = {}
+        # Raw state fingerprints of the polled devices, see RawStateCache
+        self.state_cache = RawStateCache()
+        self._changed_ids: set[str] | None = None
+        self._pending_checks: list[_PendingCheck] = []
+        self._reconcile_task: asyncio.Task | None = None
+        self._command_queues: dict[str, dict[Hashable, _QueuedCommand]] = {}
+        self._command_workers: dict[str, asyncio.Task] = {}
+        self._cycle: asyncio.Future | None = None
+        self._fast_poll_interval: float | None = None
+        self.cycle_duration: float | None = None
+        # Shared by the coordinators of an entry
+        self.breaker = breaker
+        self.telemetry = telemetry or HomePilotTelemetry()
+        breaker.async_add_listener(self._async_breaker_changed)
+
+    @property
+    def min_update_interval(self) -> float:
+        return self._min_update_interval
+
+    @property
+    def max_update_interval(self) -> float:
+        return self._max_update_interval
+
+    async def _async_update_data(self):
+        if (cycle := self._cycle) is not None:
+            self.telemetry.skipped_cycles[self.name] += 1
+            _LOGGER.debug("%s - Cycle in flight, skipping this one", self.name)
+            data = await asyncio.shield(cycle)
+            if data is None:
+                raise UpdateFailed(f"{self.name} cycle in flight failed")
+            # The listeners of the changed devices were notified by that cycle
+            self._changed_ids = set() if self.last_update_success else None
+            return data
+
+        self._cycle = cycle = self.hass.loop.create_future()
+        start = self.hass.loop.time()
+        data = None
+        try:
+            data = await super()._async_update_data()
+        finally:
+            self._cycle = None
+            cycle.set_result(data)
+            self._async_track_cycle_duration(self.hass.loop.time() - start)
+        changed = self._async_track_changes(data)
+        # After a failed cycle every entity must refresh its availability
+        self._changed_ids = changed if self.last_update_success else None
+        if changed:
+            self._async_set_interval(self._min_update_interval)
+        else:
+            self._async_set_interval(
+                min(
+                    self.update_interval.total_seconds() * BACKOFF_FACTOR,
+                    self._max_update_interval,
+                )
+            )
+        return data
+
+    @callback
+    def _async_track_cycle_duration(self, duration: float) -> None:
+        if self.cycle_duration is None:
+            self.cycle_duration = duration
+        else:
+            self.cycle_duration += CYCLE_DURATION_SMOOTHING * (duration - self.cycle_duration)
+
+    @callback
+    def _async_breaker_changed(self) -> None:
+        if self.breaker.is_open:
+            # Polls fail fast meanwhile, the breaker probes the bridge instead
+            self._async_set_interval(BREAKER_MAX_BACKOFF)
+            return
+        self._async_set_interval(self._min_update_interval)
+        if self._listeners:
+            self.config_entry.async_create_background_task(
+                self.hass, self.async_request_refresh(), name=f"{self.name} recovered"
+            )
+
+    @callback
+    def _async_track_changes(self, data: dict[str, Any]) -> set[str]:
+        """Update the stored fingerprints and return the ids that changed."""
+        fingerprints = {key: state_fingerprint(obj) for key, obj in data.items()}
+        changed = {
+            key
+            for key, fingerprint in fingerprints.items()
+            if self._fingerprints.get(key) != fingerprint
+        }
+        self._fingerprints = fingerprints
+        return changed
+
+    @callback
+    def async_set_updated_data(self, data) -> None:
+        changed = self._async_track_changes(data)
+        self._changed_ids = changed if self.last_update_success else None
+        super().async_set_updated_data(data)
+
+    @callback
+    def async_set_updated_devices(self, dids: Iterable[str]) -> None:
+        """Notify the listeners of devices polled outside of the refresh cycle.
+
+        Unlike async_set_updated_data this leaves the refresh schedule and the
+        listeners of other devices untouched.
+        """
+        changed = set()
+        for did in dids:
+            # Skips the devices removed while they were polled
+            if did not in self.data:
+                continue
+            fingerprint = state_fingerprint(self.data[did])
+            if self._fingerprints.get(did) != fingerprint:
+                self._fingerprints[did] = fingerprint
+                changed.add(did)
+        if not changed:
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context in changed:
+                update_callback()
+
+    @callback
+    def async_add_devices(self, devices: Mapping[str, HomePilotDevice]) -> None:
+        """Poll the given devices too, from the next refresh on."""
+        self.devices.update(devices)
+
+    @callback
+    def async_remove_devices(self, dids: Iterable[str]) -> None:
+        """Stop polling the given devices and drop them from the data right away.
+
+        Their pending state checks fail, their entities are removed by the caller.
+        """
+        removed = set(dids) & set(self.devices)
+        if not removed:
+            return
+        for did in removed:
+            del self.devices[did]
+            self._fingerprints.pop(did, None)
+        self.state_cache.discard(removed)
+        if self.data is not None:
+            self.data = {did: device for did, device in self.data.items() if did not in removed}
+        for check in [check for check in self._pending_checks if check.did in removed]:
+            self._pending_checks.remove(check)
+            if not check.future.done():
+                check.future.set_result(False)
+
+    async def async_queue_command(
+        self,
+        did: str,
+        command_fn: Callable[[], Awaitable[None]],
+        kind: Hashable | None = None,
+    ) -> bool:
+        """Send a command after the commands already queued for the device.
+
+        Returns False if the command was superseded by a newer command of the
+        same kind before it was sent. Commands without a kind are never
+        superseded. Raises TimeoutError if the bridge did not answer in time,
+        and BridgeUnavailableError right away while the breaker is open.
+        """
+        if self.breaker.is_open:
+            raise BridgeUnavailableError(f"{self.breaker.name} is unreachable")
+        if kind is None:
+            kind = object()
+        queue = self._command_queues.setdefault(did, {})
+        if (superseded := queue.pop(kind, None)) is not None:
+            superseded.future.set_result(False)
+        command = _QueuedCommand(command_fn, self.hass.loop.create_future())
+        queue[kind] = command
+        if did not in self._command_workers:
+            self._command_workers[did] = self.hass.async_create_background_task(
+                self._async_command_worker(did), name=f"{self.name} commands {did}"
+            )
+        return await command.future
+
+    async def _async_command_worker(self, did: str) -> None:
+        queue = self._command_queues[did]
+        try:
+            while queue:
+                kind = next(iter(queue))
+                command = queue.pop(kind)
+                if command.future.done():
+                    continue
+                try:
+                    with self.breaker.guard():
+                        async with asyncio.timeout(COMMAND_TIMEOUT):
+                            await command.command_fn()
+                except Exception as err:  # pylint: disable=broad-except
+                    if not command.future.done():
+                        command.future.set_exception(err)
+                else:
+                    if not command.future.done():
+                        command.future.set_result(True)
+        finally:
+            del self._command_workers[did]
+            for command in queue.values():
+                if not command.future.done():
+                    command.future.cancel()
+            queue.clear()
+
+    async def async_reconcile(
+        self,
+        did: str,
+        check_fn: Callable[[], bool],
+        pre_poll_delay: float = 0,
+        timeout: float = RECONCILE_TIMEOUT,
+    ) -> bool:
+        """Wait until check_fn passes, polling together with other commanded devices.
+
+        Returns False if the check still fails once the timeout has elapsed,
+        or right away while the breaker is open.
+        """
+        if self.breaker.is_open:
+            return False
+        now = self.hass.loop.time()
+        check = _PendingCheck(
+            did=did,
+            check_fn=check_fn,
+            not_before=now + pre_poll_delay,
+            deadline=now + pre_poll_delay + timeout,
+            future=self.hass.loop.create_future(),
+        )
+        self._pending_checks.append(check)
+        if self._reconcile_task is None:
+            self._reconcile_task = self.hass.async_create_background_task(
+                self._async_reconcile_loop(), name=f"{self.name} reconcile"
+            )
+        return await check.future
+
+    async def _async_reconcile_loop(self) -> None:
+        try:
+            await asyncio.sleep(RECONCILE_WINDOW)
+            while True:
+                # Checks whose waiting entity went away are dropped
+                self._pending_checks = [
+                    check for check in self._pending_checks if not check.future.done()
+                ]
+                if not self._pending_checks or self.breaker.is_open:
+                    break
+                now = self.hass.loop.time()
+                due = [check for check in self._pending_checks if check.not_before <= now]
+                if not due:
+                    await asyncio.sleep(
+                        min(check.not_before for check in self._pending_checks) - now
+                    )
+                    continue
+                dids = {check.did for check in due}
+                if self._cycle is not None:
+                    # The cycle in flight fetches the state of these devices too
+                    await asyncio.shield(self._cycle)
+                else:
+                    try:
+                        with self.breaker.guard(), self.telemetry.measure(f"{self.name}_reconcile"):
+                            await async_update_device_states(
+                                self.data[next(iter(dids))].api,
+                                {did: self.data[did] for did in dids},
+                                RECONCILE_TIMEOUT,
+                                state_cache=self.state_cache,
+                                # Commands may only change values outside the bulk state
+                                force=True,
+                            )
+                    except TimeoutError:
+                        _LOGGER.warning("Timeout refreshing state for devices %s", sorted(dids))
+                    except Exception as err:  # pylint: disable=broad-except
+                        _LOGGER.warning("Error refreshing state for devices %s: %s", sorted(dids), err)
+                    self.async_set_updated_devices(dids)
+                now = self.hass.loop.time()
+                for check in due:
+                    if check.future.done():
+                        continue
+                    if check.check_fn():
+                        check.future.set_result(True)
+                    elif now >= check.deadline:
+                        check.future.set_result(False)
+                await asyncio.sleep(RECONCILE_INTERVAL)
+        finally:
+            self._reconcile_task = None
+            for check in self._pending_checks:
+                if not check.future.done():
+                    check.future.set_result(False)
+            self._pending_checks = []
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners of devices whose state changed."""
+        changed, self._changed_ids = self._changed_ids, None
+        if changed is None:
+            super().async_update_listeners()
+            return
+        _LOGGER.debug("%s - %s of %s devices changed", self.name, len(changed), len(self._fingerprints))
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed:
+                update_callback()
+
+    @callback
+    def _async_set_interval(self, seconds: float) -> None:
+        if self._fast_poll_interval is not None and not self.breaker.is_open:
+            seconds = min(seconds, self._fast_poll_interval)
+        if self.cycle_duration is not None:
+            # Slow cycles stretch the interval, including the floor
+            seconds = max(seconds, round(self.cycle_duration * CYCLE_DURATION_FACTOR, 1))
+        if seconds != self.update_interval.total_seconds():
+            _LOGGER.debug("%s - Polling interval set to %.1f seconds", self.name, seconds)
+            self.update_interval = timedelta(seconds=seconds)
+
+    @callback
+    def async_set_interval_bounds(self, min_update_interval: float, max_update_interval: float) -> None:
+        """Change the floor and ceiling intervals and restart from the floor."""
+        self._min_update_interval = min_update_interval
+        self._max_update_interval = max(max_update_interval, min_update_interval)
+        if self.breaker.is_open:
+            return
+        self._async_set_interval(min_update_interval)
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def async_set_fast_polling(self, interval: float | None) -> None:
+        """Poll at least every interval seconds, e.g. while a firmware install runs.
+
+        None goes back to the floor interval.
+        """
+        if interval == self._fast_poll_interval:
+            return
+        self._fast_poll_interval = interval
+        self._async_set_interval(self._min_update_interval)
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def async_tighten_interval(self) -> None:
+        """Go back to the floor interval, e.g. after a command was sent."""
+        if self.breaker.is_open:
+            return
+        if self.update_interval.total_seconds() > self._min_update_interval:
+            self._async_set_interval(self._min_update_interval)
+            if self._listeners:
+                self._schedule_refresh()
+
+
+class HomePilotSceneCoordinator(DataUpdateCoordinator):
+    """Coordinator of the scenes, which skips unchanged scene lists.
+
+    The update method returns the raw scene list of the bridge. When its
+    fingerprint matches the one of the previous poll, the list is not parsed,
+    the listeners are not notified and the polling interval is stretched step
+    by step up to SCENE_MAX_BACKOFF_FACTOR times the configured interval. A
+    changed list is parsed into the scenes of the manager and brings the
+    interval back to the configured one.
+    """
+
+    def __init__(
+        self,
+        hass,
+        logger: logging.Logger,
+        *,
+        name: str,
+        update_method,
+        manager: HomePilotManager,
+        update_interval: float | None,
+        breaker: BridgeCircuitBreaker,
+        telemetry: HomePilotTelemetry | None = None,
+    ) -> None:
+        super().__init__(
+            hass,
+            logger,
+            name=name,
+            update_method=update_method,
+            update_interval=timedelta(seconds=update_interval) if update_interval is not None else None,
+        )
+        self._manager = manager
+        self._base_update_interval = update_interval
+        self._fingerprint: int | None = None
+        self._unchanged = False
+        # Shared with the device coordinators, guards the scene commands too
+        self.breaker = breaker
+        self.telemetry = telemetry or HomePilotTelemetry()
+
+    @property
+    def base_update_interval(self) -> float | None:
+        """Configured polling interval, None when cyclic scene polling is disabled."""
+        return self._base_update_interval
+
+    async def _async_update_data(self):
+        scenes: dict[str, HomePilotScene] = self._manager.scenes
+        try:
+            payload = await super()._async_update_data()
+        except Exception:
+            for scene in scenes.values():
+                scene.available = False
+            self._fingerprint = None
+            raise
+
+        fingerprint = payload_fingerprint(payload)
+        # After a failed poll the scenes must be parsed again to become available
+        if fingerprint == self._fingerprint and self.last_update_success:
+            self._unchanged = True
+            self.telemetry.parse_skips[self.name] += 1
+            if self.update_interval is not None:
+                self._async_set_interval(
+                    min(
+                        self.update_interval.total_seconds() * BACKOFF_FACTOR,
+                        self._base_update_interval * SCENE_MAX_BACKOFF_FACTOR,
+                    )
+                )
+            return self.data
+
+        # Same as HomePilotManager.async_update_scenes
+        self._fingerprint = fingerprint
+        scenes_dict = {scene["id"]: scene for scene in payload}
+        for sid, scene in scenes.items():
+            if sid in scenes_dict:
+                await scene.async_update_scene(scenes_dict[sid])
+                scene.available = True
+            else:
+                scene.available = False
+        self._async_set_interval(self._base_update_interval)
+        return scenes
+
+    @callback
+    def async_set_updated_data(self, data) -> None:
+        # The next poll is parsed, whatever the bridge returns
+        self._fingerprint = None
+        self._unchanged = False
+        super().async_set_updated_data(data)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the listeners, unless the scene list was unchanged."""
+        unchanged, self._unchanged = self._unchanged, False
+        if unchanged:
+            _LOGGER.debug("%s - Scene list unchanged", self.name)
+            return
+        super().async_update_listeners()
+
+    @callback
+    def _async_set_interval(self, seconds: float | None) -> None:
+        update_interval = timedelta(seconds=seconds) if seconds is not None else None
+        if update_interval != self.update_interval:
+            _LOGGER.debug("%s - Polling interval set to %s", self.name, update_interval)
+            self.update_interval = update_interval
+
+    @callback
+    def async_set_base_interval(self, update_interval: float | None) -> None:
+        """Change the configured interval, None disables cyclic scene polling."""
+        self._base_update_interval = update_interval
+        self._async_set_interval(update_interval)
+
+
+class WallControllerChannelPoller:
+    """Poll the push button channels of a single wall controller.
+
+    Only the channel state of the controller is fetched, and only the listeners
+    of this controller are notified when a channel changed. The poller runs
+    while at least one listener is registered, and skips its ticks while the
+    circuit breaker of the bridge is open.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, device: HomePilotWallController, breaker: BridgeCircuitBreaker
+    ) -> None:
+        self.hass = hass
+        self.device = device
+        self.breaker = breaker
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._polling = False
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for channel updates, returns a function removing the listener."""
+        self._listeners.append(update_callback)
+        if self._unsub_timer is None:
+            self._unsub_timer = async_track_time_interval(
+                self.hass, self._async_poll, CHANNEL_POLL_INTERVAL
+            )
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+            if not self._listeners and self._unsub_timer is not None:
+                self._unsub_timer()
+                self._unsub_timer = None
+
+        return remove_listener
+
+    def _channel_values(self) -> tuple:
+        return tuple(
+            getattr(self.device, f"channel_{channel}", False)
+            for channel in self.device.channels
+        )
+
+    async def _async_poll(self, _now) -> None:
+        # Skip this tick if the previous request is still pending
+        if self._polling or self.breaker.is_open:
+            return
+        self._polling = True
+        try:
+            previous = self._channel_values()
+            with self.breaker.guard():
+                async with asyncio.timeout(DEVICE_UPDATE_TIMEOUT):
+                    await self.device.update_channels()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Error polling channels of wall controller %s: %s", self.device.did, err)
+            return
+        finally:
+            self._polling = False
+        if self._channel_values() != previous:
+            for update_callback in list(self._listeners):
+                update_callback()
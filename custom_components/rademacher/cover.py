@@ -1,10 +1,10 @@
 """Platform for Rademacher Bridge."""
+import asyncio
+from collections.abc import Awaitable, Callable
 import logging
 from typing import Any
 
 from homepilot.cover import CoverType, HomePilotCover
-from homepilot.device import HomePilotDevice
-from homepilot.manager import HomePilotManager
 
 from homeassistant.components.cover import (
     ATTR_POSITION,
@@ -13,31 +13,36 @@ from homeassistant.components.cover import (
     CoverEntity,
     CoverEntityFeature,
 )
-from homeassistant.const import CONF_EXCLUDE
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN
+from .descriptions import HomePilotEntityDescription, async_setup_device_entities
 from .entity import HomePilotEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+# Motion tracking after a command: delay before the first poll, number of
+# identical polls after which the cover is considered settled, number of polls
+# without any movement after which the cover is considered not to move at all,
+# and maximum tracking duration (seconds)
+MOTION_START_DELAY = 2.0
+MOTION_SETTLED_POLLS = 3
+MOTION_START_POLLS = MOTION_SETTLED_POLLS * 2
+MOTION_TIMEOUT = 120
+
+
+ENTITY_DESCRIPTIONS = (
+    HomePilotEntityDescription(
+        capability="cover",
+        name="Cover",
+        create_fn=lambda coordinator, device: HomePilotCoverEntity(coordinator, device),
+    ),
+)
+
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Setup of entities for cover platform."""
-    entry = hass.data[DOMAIN][config_entry.entry_id]
-    manager: HomePilotManager = entry[0]
-    coordinator: DataUpdateCoordinator = entry[1]
-    exclude_devices: list[str] = entry[3][CONF_EXCLUDE]
-    new_entities = []
-    for did in manager.devices:
-        if did not in exclude_devices:
-            device: HomePilotDevice = manager.devices[did]
-            if isinstance(device, HomePilotCover):
-                _LOGGER.info("Found Cover for Device ID: %s", device.did)
-                new_entities.append(HomePilotCoverEntity(coordinator, device))
-    # If we have any new devices, add them
-    if new_entities:
-        async_add_entities(new_entities)
+    async_setup_device_entities(hass, config_entry, async_add_entities, ENTITY_DESCRIPTIONS)
 
 
 class HomePilotCoverEntity(HomePilotEntity, CoverEntity):
@@ -68,6 +73,13 @@ class HomePilotCoverEntity(HomePilotEntity, CoverEntity):
             )
         if cover.can_set_tilt_position:
             self._supported_features |= CoverEntityFeature.SET_TILT_POSITION
+        self._motion_task: asyncio.Task | None = None
+        self._target_position: int | None = None
+        self._target_tilt_position: int | None = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._async_cancel_motion_tracking()
+        await super().async_will_remove_from_hass()
 
     @property
     def supported_features(self):
@@ -75,55 +87,178 @@ class HomePilotCoverEntity(HomePilotEntity, CoverEntity):
 
     @property
     def current_cover_position(self):
-        device: HomePilotCover = self.coordinator.data[self.did]
+        device: HomePilotCover = self.device
         if device.cover_position is None:
             return None
         return device.cover_position
 
     @property
     def current_cover_tilt_position(self):
-        device: HomePilotCover = self.coordinator.data[self.did]
+        device: HomePilotCover = self.device
         if device.cover_tilt_position is None:
             return None
         return device.cover_tilt_position
 
     @property
     def is_closing(self):
-        device: HomePilotCover = self.coordinator.data[self.did]
-        return device.is_closing
+        device: HomePilotCover = self.device
+        if device.is_closing:
+            return True
+        return self._is_moving_towards_target(lambda current, target: current > target)
 
     @property
     def is_opening(self):
-        device: HomePilotCover = self.coordinator.data[self.did]
-        return device.is_opening
+        device: HomePilotCover = self.device
+        if device.is_opening:
+            return True
+        return self._is_moving_towards_target(lambda current, target: current < target)
+
+    def _is_moving_towards_target(self, direction: Callable[[int, int], bool]) -> bool:
+        """Whether motion tracking is running towards a target in the given direction."""
+        if self._motion_task is None or self._target_position is None:
+            return False
+        device: HomePilotCover = self.device
+        if device.cover_position is None:
+            return False
+        return direction(device.cover_position, self._target_position)
+
+    def _target_reached(self, device: HomePilotCover) -> bool:
+        if self._target_position is not None and device.cover_position != self._target_position:
+            return False
+        if (
+            self._target_tilt_position is not None
+            and device.has_tilt
+            and device.cover_tilt_position != self._target_tilt_position
+        ):
+            return False
+        return self._target_position is not None or self._target_tilt_position is not None
+
+    async def _async_execute_and_track(
+        self,
+        command_fn: Callable[[HomePilotCover], Awaitable[None]],
+        target_position: int | None = None,
+        target_tilt_position: int | None = None,
+        kind: str = "position",
+    ) -> None:
+        """Send a command and follow the cover motion until it settles.
+
+        Position and tilt commands are queued as separate kinds, a newer command
+        of the same kind supersedes one not yet sent (and its tracking).
+        """
+        if not await self.async_send_command(command_fn, kind):
+            return
+        self._async_start_motion_tracking(target_position, target_tilt_position)
+
+    async def async_move(
+        self, position: int | None = None, tilt_position: int | None = None
+    ) -> asyncio.Task[bool] | None:
+        """Send the position and tilt commands, and follow the cover motion.
+
+        Returns the motion tracking task, which results in whether the targets
+        were reached, or None if a command timed out or was superseded.
+        """
+        if position is not None and not await self.async_send_command(
+            lambda d: d.async_set_cover_position(position), "position"
+        ):
+            return None
+        if tilt_position is not None and not await self.async_send_command(
+            lambda d: d.async_set_cover_tilt_position(tilt_position), "tilt"
+        ):
+            return None
+        return self._async_start_motion_tracking(position, tilt_position)
+
+    @callback
+    def _async_start_motion_tracking(
+        self, target_position: int | None, target_tilt_position: int | None
+    ) -> asyncio.Task[bool]:
+        self._async_cancel_motion_tracking()
+        self._target_position = target_position
+        self._target_tilt_position = target_tilt_position
+        self._motion_task = self.hass.async_create_background_task(
+            self._async_track_motion(), name=f"rademacher cover motion {self.did}"
+        )
+        return self._motion_task
+
+    @callback
+    def _async_cancel_motion_tracking(self) -> None:
+        if self._motion_task is not None:
+            self._motion_task.cancel()
+            self._motion_task = None
+
+    async def _async_track_motion(self) -> bool:
+        """Follow the cover while it is moving or converging on its target.
+
+        Returns whether the target was reached once the cover settled, False
+        if the cover did not start moving within MOTION_START_POLLS polls.
+        """
+        device: HomePilotCover = self.device
+
+        def get_state() -> tuple:
+            return (device.cover_position, device.cover_tilt_position if device.has_tilt else None)
+
+        start_state = last_state = get_state()
+        # A stop command has no target, the cover settles wherever it halts
+        moved = self._target_position is None and self._target_tilt_position is None
+        settled_polls = 0
+        idle_polls = 0
+
+        def check_settled() -> bool:
+            nonlocal last_state, moved, settled_polls, idle_polls
+            if self._target_reached(device) and not (device.is_opening or device.is_closing):
+                return True
+            current_state = get_state()
+            # Until the motor started, an unchanged position does not mean settled
+            moved = moved or device.is_opening or device.is_closing or current_state != start_state
+            if not moved:
+                # Blocked, or the radio command got lost
+                idle_polls += 1
+                return idle_polls >= MOTION_START_POLLS
+            settled_polls = settled_polls + 1 if current_state == last_state else 0
+            last_state = current_state
+            return settled_polls >= MOTION_SETTLED_POLLS
+
+        try:
+            if not await self.coordinator.async_reconcile(
+                self.did, check_settled, MOTION_START_DELAY, MOTION_TIMEOUT
+            ):
+                _LOGGER.warning("Cover %s(%s) still moving after %s seconds", self.name, self.did, MOTION_TIMEOUT)
+            elif not moved and not self._target_reached(device):
+                _LOGGER.warning("Cover %s(%s) did not start moving", self.name, self.did)
+            return self._target_reached(device)
+        finally:
+            if self._motion_task is asyncio.current_task():
+                self._motion_task = None
+                self._target_position = None
+                self._target_tilt_position = None
+                self.async_write_ha_state()
 
     @property
     def is_closed(self):
-        device: HomePilotCover = self.coordinator.data[self.did]
+        device: HomePilotCover = self.device
         return device.is_closed
 
     async def async_open_cover(self, **kwargs: Any) -> None:
-        await self.async_execute_and_poll(lambda d: d.async_open_cover(), lambda: True, pre_poll_delay=2.0)
+        await self._async_execute_and_track(lambda d: d.async_open_cover(), target_position=100)
 
     async def async_close_cover(self, **kwargs: Any) -> None:
-        await self.async_execute_and_poll(lambda d: d.async_close_cover(), lambda: True, pre_poll_delay=2.0)
+        await self._async_execute_and_track(lambda d: d.async_close_cover(), target_position=0)
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
         pos = kwargs[ATTR_POSITION]
-        await self.async_execute_and_poll(lambda d: d.async_set_cover_position(pos), lambda: True, pre_poll_delay=2.0)
+        await self._async_execute_and_track(lambda d: d.async_set_cover_position(pos), target_position=pos)
 
     async def async_stop_cover(self, **kwargs: Any) -> None:
-        await self.async_execute_and_poll(lambda d: d.async_stop_cover(), lambda: True, pre_poll_delay=2.0)
+        await self._async_execute_and_track(lambda d: d.async_stop_cover())
 
     async def async_open_cover_tilt(self, **kwargs: Any) -> None:
-        await self.async_execute_and_poll(lambda d: d.async_open_cover_tilt(), lambda: True, pre_poll_delay=2.0)
+        await self._async_execute_and_track(lambda d: d.async_open_cover_tilt(), target_tilt_position=100, kind="tilt")
 
     async def async_close_cover_tilt(self, **kwargs: Any) -> None:
-        await self.async_execute_and_poll(lambda d: d.async_close_cover_tilt(), lambda: True, pre_poll_delay=2.0)
+        await self._async_execute_and_track(lambda d: d.async_close_cover_tilt(), target_tilt_position=0, kind="tilt")
 
     async def async_set_cover_tilt_position(self, **kwargs: Any) -> None:
         pos = kwargs[ATTR_TILT_POSITION]
-        await self.async_execute_and_poll(lambda d: d.async_set_cover_tilt_position(pos), lambda: True, pre_poll_delay=2.0)
+        await self._async_execute_and_track(lambda d: d.async_set_cover_tilt_position(pos), target_tilt_position=pos, kind="tilt")
 
     async def async_stop_cover_tilt(self, **kwargs: Any) -> None:
-        await self.async_execute_and_poll(lambda d: d.async_stop_cover_tilt(), lambda: True, pre_poll_delay=2.0)
+        await self._async_execute_and_track(lambda d: d.async_stop_cover_tilt(), kind="tilt")
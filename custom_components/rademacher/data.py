@@ -0,0 +1,36 @@
+"""Runtime data of a loaded Rademacher Bridge config entry."""
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homepilot.manager import HomePilotManager
+
+from homeassistant.config_entries import ConfigEntry
+
+from .coordinator import (
+    BridgeCircuitBreaker,
+    HomePilotDataUpdateCoordinator,
+    HomePilotSceneCoordinator,
+)
+from .telemetry import HomePilotTelemetry
+
+if TYPE_CHECKING:
+    # descriptions reads the runtime data of the entries
+    from .descriptions import DeviceCapabilityIndex
+
+
+@dataclass
+class HomePilotRuntimeData:
+    """Manager, coordinators and shared state of a loaded entry, as its runtime_data."""
+
+    manager: HomePilotManager
+    # Polling tier -> coordinator polling the devices of that tier
+    coordinators: dict[str, HomePilotDataUpdateCoordinator]
+    scene_coordinator: HomePilotSceneCoordinator
+    device_index: "DeviceCapabilityIndex"
+    # Entry options, completed with the defaults of older config versions
+    options: dict[str, Any]
+    telemetry: HomePilotTelemetry
+    breaker: BridgeCircuitBreaker
+
+
+HomePilotConfigEntry = ConfigEntry[HomePilotRuntimeData]
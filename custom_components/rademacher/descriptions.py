@@ -0,0 +1,189 @@
+"""Capability index of the devices and the entity descriptions built on it."""
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+from homepilot.actuator import HomePilotActuator
+from homepilot.cover import HomePilotCover
+from homepilot.device import HomePilotAutoConfigDevice, HomePilotDevice
+from homepilot.hub import HomePilotHub
+from homepilot.light import HomePilotLight
+from homepilot.sensor import HomePilotSensor
+from homepilot.switch import HomePilotSwitch
+from homepilot.thermostat import HomePilotThermostat
+from homepilot.wallcontroller import HomePilotWallController
+
+from homeassistant.const import CONF_EXCLUDE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import SIGNAL_ADD_DEVICES
+from .coordinator import HomePilotDataUpdateCoordinator, get_device_tier
+from .data import HomePilotConfigEntry, HomePilotRuntimeData
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# Capabilities of the devices: the name, the device type offering it and the
+# check whether a device of that type supports it. Checked once per device.
+CAPABILITIES: tuple[tuple[str, type | tuple[type, ...], Callable[[Any], bool]], ...] = (
+    ("hub", HomePilotHub, lambda device: True),
+    ("switch", HomePilotSwitch, lambda device: True),
+    ("actuator", HomePilotActuator, lambda device: True),
+    ("light", HomePilotLight, lambda device: True),
+    ("thermostat", HomePilotThermostat, lambda device: True),
+    ("ping_cmd", HomePilotDevice, lambda device: device.has_ping_cmd),
+    # Covers
+    ("cover", HomePilotCover, lambda device: True),
+    ("tilt", HomePilotCover, lambda device: device.has_tilt),
+    ("ventilation_position_config", HomePilotCover, lambda device: device.has_ventilation_position_config),
+    ("blocking_detection", HomePilotCover, lambda device: device.has_blocking_detection),
+    ("obstacle_detection", HomePilotCover, lambda device: device.has_obstacle_detection),
+    # Sensors
+    ("temperature", HomePilotSensor, lambda device: device.has_temperature),
+    ("target_temperature", HomePilotSensor, lambda device: device.has_target_temperature),
+    ("wind_speed", HomePilotSensor, lambda device: device.has_wind_speed),
+    ("brightness", HomePilotSensor, lambda device: device.has_brightness),
+    ("sun_height", HomePilotSensor, lambda device: device.has_sun_height),
+    ("sun_direction", HomePilotSensor, lambda device: device.has_sun_direction),
+    ("contact_state", HomePilotSensor, lambda device: device.has_contact_state),
+    ("rain_detection", HomePilotSensor, lambda device: device.has_rain_detection),
+    ("sun_detection", HomePilotSensor, lambda device: device.has_sun_detection),
+    ("wind_detection", HomePilotSensor, lambda device: device.has_wind_detection),
+    ("motion_detection", HomePilotSensor, lambda device: device.has_motion_detection),
+    ("smoke_detection", HomePilotSensor, lambda device: device.has_smoke_detection),
+    ("battery_level", (HomePilotSensor, HomePilotThermostat), lambda device: device.has_battery_level),
+    # Thermostats
+    ("temperature_thresh_cfg_1", HomePilotThermostat, lambda device: device.has_temperature_thresh_cfg[0]),
+    ("temperature_thresh_cfg_2", HomePilotThermostat, lambda device: device.has_temperature_thresh_cfg[1]),
+    ("temperature_thresh_cfg_3", HomePilotThermostat, lambda device: device.has_temperature_thresh_cfg[2]),
+    ("temperature_thresh_cfg_4", HomePilotThermostat, lambda device: device.has_temperature_thresh_cfg[3]),
+    (
+        "open_window_detect",
+        HomePilotThermostat,
+        lambda device: device.has_ext_open_window_detect or device.has_int_open_window_detect,
+    ),
+    # Wall controllers
+    ("channels", HomePilotWallController, lambda device: device.channels is not None),
+    ("battery_low", HomePilotWallController, lambda device: device.has_battery_low),
+    # Auto config devices (covers, switches/actuators and thermostats)
+    (
+        "auto_mode",
+        HomePilotAutoConfigDevice,
+        lambda device: device.has_auto_mode and not isinstance(device, HomePilotThermostat),
+    ),
+    ("time_auto_mode", HomePilotAutoConfigDevice, lambda device: device.has_time_auto_mode),
+    ("contact_auto_mode", HomePilotAutoConfigDevice, lambda device: device.has_contact_auto_mode),
+    ("wind_auto_mode", HomePilotAutoConfigDevice, lambda device: device.has_wind_auto_mode),
+    ("dusk_auto_mode", HomePilotAutoConfigDevice, lambda device: device.has_dusk_auto_mode),
+    ("dawn_auto_mode", HomePilotAutoConfigDevice, lambda device: device.has_dawn_auto_mode),
+    ("rain_auto_mode", HomePilotAutoConfigDevice, lambda device: device.has_rain_auto_mode),
+    ("sun_auto_mode", HomePilotAutoConfigDevice, lambda device: device.has_sun_auto_mode),
+    ("rain_prog_active", HomePilotAutoConfigDevice, lambda device: device.has_rain_prog_active),
+    ("wind_prog_active", HomePilotAutoConfigDevice, lambda device: device.has_wind_prog_active),
+    ("sun_prog_active", HomePilotAutoConfigDevice, lambda device: device.has_sun_prog_active),
+    ("contact_open_cmd", HomePilotAutoConfigDevice, lambda device: device.has_contact_open_cmd),
+    ("contact_close_cmd", HomePilotAutoConfigDevice, lambda device: device.has_contact_close_cmd),
+    ("sun_start_cmd", HomePilotAutoConfigDevice, lambda device: device.has_sun_start_cmd),
+    ("sun_stop_cmd", HomePilotAutoConfigDevice, lambda device: device.has_sun_stop_cmd),
+    ("wind_start_cmd", HomePilotAutoConfigDevice, lambda device: device.has_wind_start_cmd),
+    ("wind_stop_cmd", HomePilotAutoConfigDevice, lambda device: device.has_wind_stop_cmd),
+    ("rain_start_cmd", HomePilotAutoConfigDevice, lambda device: device.has_rain_start_cmd),
+    ("rain_stop_cmd", HomePilotAutoConfigDevice, lambda device: device.has_rain_stop_cmd),
+    ("goto_dawn_pos_cmd", HomePilotAutoConfigDevice, lambda device: device.has_goto_dawn_pos_cmd),
+    ("goto_dusk_pos_cmd", HomePilotAutoConfigDevice, lambda device: device.has_goto_dusk_pos_cmd),
+)
+
+
+def get_device_capabilities(device: HomePilotDevice) -> frozenset[str]:
+    """Return the names of the capabilities supported by a device."""
+    return frozenset(
+        name
+        for name, device_type, supported in CAPABILITIES
+        if isinstance(device, device_type) and supported(device)
+    )
+
+
+class DeviceCapabilityIndex:
+    """Device ids of an entry indexed by the capabilities of the devices."""
+
+    def __init__(self, devices: Mapping[str, HomePilotDevice]) -> None:
+        self._capabilities: dict[str, frozenset[str]] = {}
+        self._dids: defaultdict[str, dict[str, None]] = defaultdict(dict)
+        self.add_devices(devices)
+
+    def add_devices(self, devices: Mapping[str, HomePilotDevice]) -> None:
+        for did, device in devices.items():
+            self._capabilities[did] = get_device_capabilities(device)
+            for capability in self._capabilities[did]:
+                self._dids[capability][did] = None
+
+    def remove_devices(self, dids: Iterable[str]) -> None:
+        for did in dids:
+            for capability in self._capabilities.pop(did, ()):
+                del self._dids[capability][did]
+
+    def get_dids(self, capability: str) -> list[str]:
+        """Return the ids of the devices supporting a capability."""
+        return list(self._dids.get(capability, ()))
+
+
+@dataclass(frozen=True, kw_only=True)
+class HomePilotEntityDescription:
+    """Describes the entity created for every device supporting a capability.
+
+    create_fn builds the entity, or a list of entities, from the coordinator and
+    the device. options_fn, when set, decides from the entry options whether
+    the entity is created for a device.
+    """
+
+    capability: str
+    name: str
+    create_fn: Callable[[HomePilotDataUpdateCoordinator, Any], Entity | list[Entity]]
+    options_fn: Callable[[Any, Mapping[str, Any]], bool] | None = None
+
+
+@callback
+def async_setup_device_entities(
+    hass: HomeAssistant,
+    config_entry: HomePilotConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    descriptions: Iterable[HomePilotEntityDescription],
+) -> None:
+    """Add the described entities of the devices, and of the ones added later."""
+    runtime_data: HomePilotRuntimeData = config_entry.runtime_data
+    manager = runtime_data.manager
+    coordinators = runtime_data.coordinators
+    device_index = runtime_data.device_index
+
+    @callback
+    def async_add_devices(dids: Iterable[str] | None = None) -> None:
+        """Add the entities of the given devices, or all, skipping excluded ones."""
+        options: Mapping[str, Any] = runtime_data.options
+        exclude_devices = set(options[CONF_EXCLUDE])
+        wanted = None if dids is None else set(dids)
+        new_entities: list[Entity] = []
+        for description in descriptions:
+            for did in device_index.get_dids(description.capability):
+                if did in exclude_devices or (wanted is not None and did not in wanted):
+                    continue
+                device: HomePilotDevice = manager.devices[did]
+                if description.options_fn is not None and not description.options_fn(device, options):
+                    continue
+                _LOGGER.info("Found %s for Device ID: %s", description.name, did)
+                entities = description.create_fn(coordinators[get_device_tier(device)], device)
+                new_entities.extend(entities if isinstance(entities, list) else [entities])
+        # If we have any new devices, add them
+        if new_entities:
+            async_add_entities(new_entities)
+
+    async_add_devices()
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_ADD_DEVICES.format(config_entry.entry_id), async_add_devices
+        )
+    )
@@ -0,0 +1,88 @@
+"""Diagnostics support for Rademacher Bridge."""
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import (
+    CONF_DEVICES,
+    CONF_EXCLUDE,
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_SENSOR_TYPE,
+)
+from homeassistant.core import HomeAssistant
+
+from .coordinator import get_device_tier
+from .data import HomePilotConfigEntry
+from .descriptions import get_device_capabilities
+
+# The title and unique id hold the MAC address of the bridge
+TO_REDACT = {CONF_HOST, CONF_PASSWORD, "title", "unique_id"}
+
+# Options holding device ids, reported as their number of devices
+DEVICE_ID_OPTIONS = (CONF_DEVICES, CONF_EXCLUDE, CONF_SENSOR_TYPE)
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: HomePilotConfigEntry
+) -> dict[str, Any]:
+    """Return the telemetry and the anonymized device catalog of a config entry."""
+    runtime_data = entry.runtime_data
+    manager = runtime_data.manager
+    scene_coordinator = runtime_data.scene_coordinator
+    excluded = set(runtime_data.options[CONF_EXCLUDE])
+
+    intervals: dict[str, Any] = {
+        coordinator.name: {
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "min_update_interval": coordinator.min_update_interval,
+            "max_update_interval": coordinator.max_update_interval,
+            "cycle_duration": coordinator.cycle_duration,
+            "skipped_cycles": coordinator.telemetry.skipped_cycles[coordinator.name],
+            "parse_skips": coordinator.telemetry.parse_skips[coordinator.name],
+            "last_update_success": coordinator.last_update_success,
+            "devices": len(coordinator.data or {}),
+        }
+        for coordinator in runtime_data.coordinators.values()
+    }
+    intervals[scene_coordinator.name] = {
+        "update_interval": (
+            scene_coordinator.update_interval.total_seconds()
+            if scene_coordinator.update_interval is not None
+            else None
+        ),
+        "base_update_interval": scene_coordinator.base_update_interval,
+        "last_update_success": scene_coordinator.last_update_success,
+    }
+
+    # Device ids, names and serial numbers are replaced by a running number
+    devices = [
+        {
+            "device": f"device_{index}",
+            "type": type(device).__name__,
+            "model": device.model,
+            "fw_version": device.fw_version,
+            "tier": get_device_tier(device),
+            "available": device.available,
+            "excluded": did in excluded,
+            "capabilities": sorted(get_device_capabilities(device)),
+        }
+        for index, (did, device) in enumerate(manager.devices.items(), start=1)
+    ]
+
+    entry_dict = async_redact_data(entry.as_dict(), TO_REDACT)
+    entry_dict["options"] = {
+        key: len(value) if key in DEVICE_ID_OPTIONS else value
+        for key, value in entry_dict["options"].items()
+    }
+
+    return {
+        "entry": entry_dict,
+        "intervals": intervals,
+        "telemetry": runtime_data.telemetry.as_dict(),
+        "breaker": runtime_data.breaker.as_dict(),
+        "devices": devices,
+        "scenes": {
+            "total": len(manager.scenes),
+            "enabled": sum(1 for scene in manager.scenes.values() if scene.is_enabled),
+        },
+    }
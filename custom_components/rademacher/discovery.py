@@ -0,0 +1,326 @@
+"""Discovery cache and catalog reconciliation for Rademacher Bridge."""
+from collections import defaultdict
+from collections.abc import Iterable
+import copy
+from datetime import timedelta
+import hashlib
+import json
+import logging
+from typing import Any
+
+from homepilot.api import HomePilotApi
+from homepilot.device import HomePilotDevice
+from homepilot.manager import HomePilotManager
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SIGNAL_ADD_DEVICES, SIGNAL_ADD_SCENES
+from .coordinator import get_device_tier
+from .data import HomePilotConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Interval of the background discovery picking up new and removed devices
+REDISCOVERY_INTERVAL = timedelta(hours=1)
+
+# API calls made while discovering devices and scenes, whose responses are
+# kept in the discovery cache
+DISCOVERY_CALLS = (
+    "get_devices",
+    "get_device",
+    "async_get_interfaces",
+    "async_get_fw_version",
+    "async_get_nodename",
+    "async_get_scenes",
+)
+
+
+class DiscoveryCacheMiss(Exception):
+    """Raised when a discovery call has no cached response."""
+
+
+class DiscoveryCacheApi:
+    """Proxy of HomePilotApi recording or replaying the discovery responses.
+
+    All other attributes are delegated to the wrapped api, so the proxy can stay
+    attached to the devices built through it. Once discovery is done, call
+    stop_discovery to pass every call through to the bridge.
+    """
+
+    def __init__(self, api: HomePilotApi, responses: dict[str, Any] | None = None) -> None:
+        self._api = api
+        self._replay = responses is not None
+        self._discovering = True
+        self.responses: dict[str, Any] = dict(responses or {})
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._api, name)
+        if name not in DISCOVERY_CALLS or not self._discovering:
+            return attr
+
+        async def discovery_call(*args):
+            key = "/".join([name, *map(str, args)])
+            if self._replay:
+                if key not in self.responses:
+                    raise DiscoveryCacheMiss(key)
+                return copy.deepcopy(self.responses[key])
+            result = await attr(*args)
+            self.responses[key] = copy.deepcopy(result)
+            return result
+
+        return discovery_call
+
+    def stop_discovery(self) -> None:
+        self._discovering = False
+
+
+def get_discovery_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.discovery")
+
+
+def get_catalog_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.catalog")
+
+
+def catalog_hash(dids: Iterable[str], excluded: Iterable[str]) -> str:
+    """Return a hash of the device ids and excludes, stable across restarts."""
+    return hashlib.sha256(json.dumps([sorted(dids), sorted(excluded)]).encode()).hexdigest()
+
+
+def get_registry_did(device_entry: dr.DeviceEntry) -> str | None:
+    """Return the device id of a registered device, None for the bridge itself."""
+    device_did = None
+    for domain, identifier in device_entry.identifiers:
+        if domain == DOMAIN:
+            if identifier.endswith("_bridge"):
+                # Keep the hub/bridge device
+                return None
+            device_did = identifier.rsplit("_", 1)[-1]
+    return device_did
+
+
+def device_fingerprint(device: HomePilotDevice) -> int:
+    """Return a fingerprint of the type and capabilities of a device, ignoring its state and name."""
+    return hash(
+        (
+            type(device).__name__,
+            device.uid,
+            device.model,
+            tuple(
+                sorted(
+                    key
+                    for key, value in vars(device).items()
+                    if key.startswith("_has_") and value
+                )
+            ),
+            tuple(getattr(device, "channels", None) or ()),
+        )
+    )
+
+
+@callback
+def async_rename_devices(hass: HomeAssistant, entry: ConfigEntry, names: dict[str, str]) -> None:
+    """Update the registry names of the devices which were renamed on the bridge."""
+    device_registry = dr.async_get(hass)
+    hub_mac = entry.unique_id or "unknown"
+    for did, name in names.items():
+        for identifier in (f"{hub_mac}_{did}", did):
+            device_entry = device_registry.async_get_device({(DOMAIN, identifier)})
+            if device_entry is not None and device_entry.name != name:
+                _LOGGER.info("Renaming device %s to %s", did, name)
+                device_registry.async_update_device(device_entry.id, name=name)
+
+
+@callback
+def async_remove_devices(hass: HomeAssistant, entry: ConfigEntry, dids: Iterable[str]) -> None:
+    """Remove devices, with all their entities, from the device registry."""
+    device_registry = dr.async_get(hass)
+    hub_mac = entry.unique_id or "unknown"
+    for did in dids:
+        for identifier in (f"{hub_mac}_{did}", did):
+            device_entry = device_registry.async_get_device({(DOMAIN, identifier)})
+            if device_entry is not None:
+                _LOGGER.info("Deleting device %s", did)
+                device_registry.async_remove_device(device_entry.id)
+
+
+async def async_cleanup_registry(
+    hass: HomeAssistant, entry: ConfigEntry, dids: Iterable[str], excluded: Iterable[str]
+) -> None:
+    """Remove the excluded devices and the ones no longer present in the API.
+
+    Skipped when neither the devices nor the excludes changed since the last
+    cleanup, as the registry then holds nothing to remove.
+    """
+    dids, excluded = set(dids), set(excluded)
+    store = get_catalog_store(hass, entry)
+    current_hash = catalog_hash(dids, excluded)
+    stored = await store.async_load()
+    if stored and stored.get("hash") == current_hash:
+        _LOGGER.debug("%s - Devices and excludes unchanged, skipping registry cleanup", entry.title)
+        return
+
+    device_registry = dr.async_get(hass)
+    registered: defaultdict[str, list[dr.DeviceEntry]] = defaultdict(list)
+    for device_entry in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+        if (device_did := get_registry_did(device_entry)) is not None:
+            registered[device_did].append(device_entry)
+    _LOGGER.debug("Devices in API: %s", dids)
+
+    for device_did in registered.keys() & excluded:
+        for device_entry in registered[device_did]:
+            _LOGGER.info("Deleting device %s", device_did)
+            device_registry.async_remove_device(device_entry.id)
+    for device_did in registered.keys() - dids - excluded:
+        for device_entry in registered[device_did]:
+            _LOGGER.info("Removing stale device %s (ID: %s) from device registry as it is no longer present in the API", device_entry.name, device_did)
+            device_registry.async_remove_device(device_entry.id)
+    await store.async_save({"hash": current_hash})
+
+
+@callback
+def async_remove_scenes(hass: HomeAssistant, entry: ConfigEntry, sids: Iterable[str]) -> None:
+    """Remove the scene and scene switch entities of the given scenes."""
+    entity_registry = er.async_get(hass)
+    hub_mac = entry.unique_id or "unknown"
+    for sid in sids:
+        for platform, unique_id in (
+            ("scene", f"{hub_mac}_scene_{sid}"),
+            ("switch", f"{hub_mac}_{sid}_scene_enabled"),
+        ):
+            if entity_id := entity_registry.async_get_entity_id(platform, DOMAIN, unique_id):
+                _LOGGER.info("Deleting scene entity %s", entity_id)
+                entity_registry.async_remove(entity_id)
+
+
+async def async_discover(
+    api: HomePilotApi, include_non_manual_executable: bool
+) -> tuple[HomePilotManager, dict[str, Any]]:
+    """Run a full discovery against the bridge, returns the manager and responses."""
+    discovery_api = DiscoveryCacheApi(api)
+    manager = await HomePilotManager.async_build_manager(
+        discovery_api, include_non_manual_executable=include_non_manual_executable
+    )
+    discovery_api.stop_discovery()
+    return manager, discovery_api.responses
+
+
+async def async_load_cached_manager(
+    hass: HomeAssistant, entry: ConfigEntry, api: HomePilotApi, include_non_manual_executable: bool
+) -> HomePilotManager | None:
+    """Build the manager from the discovery cache, None if there is no usable cache."""
+    cached = await get_discovery_store(hass, entry).async_load()
+    if not cached or cached.get("include_non_manual_executable") != include_non_manual_executable:
+        return None
+    discovery_api = DiscoveryCacheApi(api, cached["responses"])
+    try:
+        manager = await HomePilotManager.async_build_manager(
+            discovery_api, include_non_manual_executable=include_non_manual_executable
+        )
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.info("%s - Discovery cache not usable (%s), running full discovery", entry.title, err)
+        return None
+    discovery_api.stop_discovery()
+    return manager
+
+
+async def async_save_discovery(
+    hass: HomeAssistant, entry: ConfigEntry, responses: dict[str, Any], include_non_manual_executable: bool
+) -> None:
+    await get_discovery_store(hass, entry).async_save(
+        {
+            "include_non_manual_executable": include_non_manual_executable,
+            "responses": responses,
+        }
+    )
+
+
+async def async_refresh_discovery(hass: HomeAssistant, entry: HomePilotConfigEntry) -> None:
+    """Run a discovery against the bridge and apply the catalog changes to the running entry."""
+    manager = entry.runtime_data.manager
+    include_non_manual = manager.include_non_manual_executable
+    try:
+        discovered, responses = await async_discover(manager.api, include_non_manual)
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.warning("%s - Background discovery failed, keeping current catalog: %s", entry.title, err)
+        return
+    await async_save_discovery(hass, entry, responses, include_non_manual)
+    if entry.state is ConfigEntryState.LOADED:
+        await async_reconcile_catalog(hass, entry, discovered)
+
+
+async def async_reconcile_catalog(
+    hass: HomeAssistant, entry: HomePilotConfigEntry, discovered: HomePilotManager
+) -> None:
+    """Add and remove the devices and scenes which changed on the bridge.
+
+    Entities of new devices and scenes are added through the platforms, the ones
+    of vanished devices and scenes are removed from the registries. Renamed
+    devices are renamed in the device registry, a name given by the user takes
+    precedence there. A device whose type or capabilities changed needs a
+    reload of the entry.
+    """
+    runtime_data = entry.runtime_data
+    manager = runtime_data.manager
+    scene_coordinator = runtime_data.scene_coordinator
+    coordinators = runtime_data.coordinators
+    device_index = runtime_data.device_index
+
+    added = [did for did in discovered.devices if did not in manager.devices]
+    removed = [did for did in manager.devices if did not in discovered.devices]
+    if any(
+        device_fingerprint(device) != device_fingerprint(manager.devices[did])
+        for did, device in discovered.devices.items()
+        if did in manager.devices
+    ):
+        _LOGGER.info("%s - Device capabilities changed, reloading", entry.title)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+
+    async_rename_devices(
+        hass,
+        entry,
+        {did: device.name for did, device in discovered.devices.items() if did in manager.devices},
+    )
+    if removed:
+        _LOGGER.info("%s - Devices %s no longer present in the API", entry.title, removed)
+        async_remove_devices(hass, entry, removed)
+        for did in removed:
+            manager.devices[did].available = False
+        for coordinator in coordinators.values():
+            coordinator.async_remove_devices(removed)
+        device_index.remove_devices(removed)
+        manager.devices = {did: device for did, device in manager.devices.items() if did not in removed}
+    if added:
+        _LOGGER.info("%s - Found new devices %s", entry.title, added)
+        new_devices = {did: discovered.devices[did] for did in added}
+        manager.devices = {**manager.devices, **new_devices}
+        device_index.add_devices(new_devices)
+        tier_devices: dict[str, dict[str, HomePilotDevice]] = defaultdict(dict)
+        for did, device in new_devices.items():
+            tier_devices[get_device_tier(device)][did] = device
+        # New entities need a state to start with
+        for tier, devices in tier_devices.items():
+            coordinators[tier].async_add_devices(devices)
+            await coordinators[tier].async_refresh()
+        async_dispatcher_send(hass, SIGNAL_ADD_DEVICES.format(entry.entry_id), added)
+
+    added_scenes = [sid for sid in discovered.scenes if sid not in manager.scenes]
+    removed_scenes = [sid for sid in manager.scenes if sid not in discovered.scenes]
+    if removed_scenes:
+        _LOGGER.info("%s - Scenes %s no longer present in the API", entry.title, removed_scenes)
+        async_remove_scenes(hass, entry, removed_scenes)
+        manager.scenes = {sid: scene for sid, scene in manager.scenes.items() if sid not in removed_scenes}
+    if added_scenes:
+        _LOGGER.info("%s - Found new scenes %s", entry.title, added_scenes)
+        new_scenes = {sid: discovered.scenes[sid] for sid in added_scenes}
+        manager.scenes = {**manager.scenes, **new_scenes}
+        # Removed scenes are kept in the data until their entities are gone
+        scene_coordinator.async_set_updated_data({**scene_coordinator.data, **new_scenes})
+        async_dispatcher_send(hass, SIGNAL_ADD_SCENES.format(entry.entry_id), added_scenes)
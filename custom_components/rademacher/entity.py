@@ -1,10 +1,11 @@
-import asyncio
 import logging
-from collections.abc import Awaitable, Callable, Mapping
+import time
+from collections.abc import Awaitable, Callable, Hashable, Mapping, Sequence
 from typing import Any
 
 from homepilot.device import HomePilotDevice
 
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
@@ -24,7 +25,7 @@ class HomePilotEntity(CoordinatorEntity):
         icon=None,
         entity_registry_enabled_default=True,
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device.did)
         self._unique_id = unique_id
         self._name = name
         self._device_name = device.name
@@ -34,11 +35,18 @@ class HomePilotEntity(CoordinatorEntity):
         self._did = device.did
         self._model = device.model
         self._entity_registry_enabled_default = entity_registry_enabled_default
+        # Resolved again on each coordinator update, read by the state properties
+        self._device = device
+        self._device_info = self._build_device_info(device)
 
     @property
     def did(self):
         return self._did
 
+    @property
+    def device(self) -> HomePilotDevice:
+        return self._device
+
     @property
     def unique_id(self):
         return self._unique_id
@@ -65,19 +73,16 @@ class HomePilotEntity(CoordinatorEntity):
 
     @property
     def sw_version(self):
-        return self.coordinator.data[self.did].fw_version
+        return self.device.fw_version
 
     @property
     def icon(self):
         return self._icon
 
-    @property
-    def device_info(self):
-        """Information about this entity/device."""
+    def _build_device_info(self, device: HomePilotDevice):
         # Use config entry unique_id (MAC address) + device_id for unique identifier
         hub_mac = self.coordinator.config_entry.unique_id or "unknown"
         device_identifier = f"{hub_mac}_{self.did}"
-        device: HomePilotDevice = self.coordinator.data[self.did]
 
         # Build device info
         device_info = {
@@ -98,40 +103,75 @@ class HomePilotEntity(CoordinatorEntity):
 
         return device_info
 
+    @property
+    def device_info(self):
+        """Information about this entity/device."""
+        device_info = self._device_info
+        if device_info["sw_version"] != self.device.fw_version:
+            device_info = self._device_info = {**device_info, "sw_version": self.device.fw_version}
+        return device_info
+
     @property
     def available(self):
-        device: HomePilotDevice = self.coordinator.data[self.did]
-        return device.available
+        return self.device.available
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any]:
-        device: HomePilotDevice = self.coordinator.data[self.did]
-        return getattr(device, "extra_attributes")
+        return getattr(self.device, "extra_attributes")
 
     @property
     def entity_registry_enabled_default(self):
         return self._entity_registry_enabled_default
 
-    async def async_execute_and_poll(self, command_fn: Callable[[HomePilotDevice], Awaitable[None]], check_fn: Callable[[], bool], pre_poll_delay: float = 0) -> None:
-        device = self.coordinator.data[self.did]
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._device = self.coordinator.data.get(self.did, self._device)
+        super()._handle_coordinator_update()
+
+    async def async_send_command(
+        self,
+        command_fn: Callable[[HomePilotDevice], Awaitable[None]],
+        kind: Hashable | None = None,
+    ) -> bool:
+        """Send a command to the device.
+
+        Returns False if it timed out or was superseded by a newer command of
+        the same kind for this device.
+        """
+        device = self.device
         try:
-            async with asyncio.timeout(5):
-                await command_fn(device)
+            with self.coordinator.telemetry.measure("command"):
+                if not await self.coordinator.async_queue_command(
+                    self.did, lambda: command_fn(device), kind
+                ):
+                    return False
         except TimeoutError:
             _LOGGER.warning("Timeout sending command to device %s(%s)", self.name, device.did)
+            return False
+        self.coordinator.async_tighten_interval()
+        return True
+
+    async def async_execute_and_poll(
+        self,
+        command_fn: Callable[[HomePilotDevice], Awaitable[None]],
+        check_fn: Callable[[], bool],
+        pre_poll_delay: float = 0,
+        kind: Hashable | None = None,
+    ) -> None:
+        await self.async_execute_all_and_poll([(kind, command_fn)], check_fn, pre_poll_delay)
+
+    async def async_execute_all_and_poll(
+        self,
+        commands: Sequence[tuple[Hashable | None, Callable[[HomePilotDevice], Awaitable[None]]]],
+        check_fn: Callable[[], bool],
+        pre_poll_delay: float = 0,
+    ) -> None:
+        """Send commands of different kinds in order, then wait until check_fn passes together."""
+        start = time.monotonic()
+        for kind, command_fn in commands:
+            if not await self.async_send_command(command_fn, kind):
+                return
+        if not await self.coordinator.async_reconcile(self.did, check_fn, pre_poll_delay):
+            _LOGGER.warning("Device %s(%s) not yet updated.", self.name, self.did)
             return
-        if pre_poll_delay > 0:
-            await asyncio.sleep(pre_poll_delay)
-        try:
-            async with asyncio.timeout(10):
-                for _ in range(12):
-                    state = await device.api.async_get_device_state(device.did)
-                    await device.update_state(state, device.api)
-                    if check_fn():
-                        break
-                    await asyncio.sleep(0.75)
-            if not check_fn():
-                _LOGGER.warning("Device %s(%s) not yet updated.", self.name, device.did)
-            self.coordinator.async_set_updated_data(self.coordinator.data)
-        except TimeoutError:
-            _LOGGER.warning("Timeout refreshing state for device %s(%s)", self.name, device.did)
+        self.coordinator.telemetry.add_latency("command_confirmed", time.monotonic() - start)
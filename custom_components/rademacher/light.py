@@ -3,9 +3,7 @@ import logging
 from typing import Any
 
 from homepilot.actuator import HomePilotActuator
-from homepilot.device import HomePilotDevice
 from homepilot.light import HomePilotLight
-from homepilot.manager import HomePilotManager
 
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
@@ -14,34 +12,31 @@ from homeassistant.components.light import (
     ColorMode,
     LightEntity,
 )
-from homeassistant.const import CONF_EXCLUDE
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN
+from .descriptions import HomePilotEntityDescription, async_setup_device_entities
 from .entity import HomePilotEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
+ENTITY_DESCRIPTIONS = (
+    HomePilotEntityDescription(
+        capability="actuator",
+        name="Actuator/Light",
+        create_fn=lambda coordinator, device: HomePilotActuatorLightEntity(coordinator, device),
+    ),
+    HomePilotEntityDescription(
+        capability="light",
+        name="Light",
+        create_fn=lambda coordinator, device: HomePilotLightEntity(coordinator, device),
+    ),
+)
+
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Setup of entities for light platform."""
-    entry = hass.data[DOMAIN][config_entry.entry_id]
-    manager: HomePilotManager = entry[0]
-    coordinator: DataUpdateCoordinator = entry[1]
-    exclude_devices: list[str] = entry[3][CONF_EXCLUDE]
-    new_entities = []
-    for did in manager.devices:
-        if did not in exclude_devices:
-            device: HomePilotDevice = manager.devices[did]
-            if isinstance(device, HomePilotActuator):
-                _LOGGER.info("Found Actuator/Light for Device ID: %s", device.did)
-                new_entities.append(HomePilotActuatorLightEntity(coordinator, device))
-            if isinstance(device, HomePilotLight):
-                _LOGGER.info("Found Light for Device ID: %s", device.did)
-                new_entities.append(HomePilotLightEntity(coordinator, device))
-    # If we have any new devices, add them
-    if new_entities:
-        async_add_entities(new_entities)
+    async_setup_device_entities(hass, config_entry, async_add_entities, ENTITY_DESCRIPTIONS)
 
 
 class HomePilotActuatorLightEntity(HomePilotEntity, LightEntity):
@@ -61,20 +56,20 @@ class HomePilotActuatorLightEntity(HomePilotEntity, LightEntity):
 
     @property
     def brightness(self):
-        device: HomePilotActuator = self.coordinator.data[self.did]
+        device: HomePilotActuator = self.device
         return round(device.brightness*255/100)
 
     @property
     def is_on(self):
-        device: HomePilotActuator = self.coordinator.data[self.did]
+        device: HomePilotActuator = self.device
         return device.is_on
 
     async def async_turn_on(self, **kwargs: Any) -> None:
-        async def _cmd(d):
-            if ATTR_BRIGHTNESS in kwargs:
-                await d.async_set_brightness(round(kwargs[ATTR_BRIGHTNESS] * 100 / 255))
-            else:
-                await d.async_turn_on()
+        if ATTR_BRIGHTNESS in kwargs:
+            brightness = round(kwargs[ATTR_BRIGHTNESS] * 100 / 255)
+            command = ("brightness", lambda d: d.async_set_brightness(brightness))
+        else:
+            command = ("power", lambda d: d.async_turn_on())
 
         def _check():
             if not self.is_on:
@@ -85,10 +80,10 @@ class HomePilotActuatorLightEntity(HomePilotEntity, LightEntity):
                     return False
             return True
 
-        await self.async_execute_and_poll(_cmd, _check, 1.0)
+        await self.async_execute_all_and_poll([command], _check, 1.0)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
-        await self.async_execute_and_poll(lambda d: d.async_turn_off(), lambda: not self.is_on, 1.0)
+        await self.async_execute_and_poll(lambda d: d.async_turn_off(), lambda: not self.is_on, 1.0, kind="power")
 
 
 class HomePilotLightEntity(HomePilotEntity, LightEntity):
@@ -113,7 +108,7 @@ class HomePilotLightEntity(HomePilotEntity, LightEntity):
 
     @property
     def color_mode(self):
-        device: HomePilotLight = self.coordinator.data[self.did]
+        device: HomePilotLight = self.device
         if device.has_color_mode:
             return ColorMode.COLOR_TEMP if device.color_mode_value == "ct" else ColorMode.RGB
         else:
@@ -124,35 +119,43 @@ class HomePilotLightEntity(HomePilotEntity, LightEntity):
 
     @property
     def brightness(self):
-        device: HomePilotLight = self.coordinator.data[self.did]
+        device: HomePilotLight = self.device
         return round(device.brightness*255/100)
 
     @property
     def color_temp_kelvin(self):
-        device: HomePilotLight = self.coordinator.data[self.did]
+        device: HomePilotLight = self.device
         # Convert mireds to Kelvin for HA 2026.3 compatibility
         return round(1000000 / device.color_temp_value) if device.has_color_temp else None
 
     @property
     def rgb_color(self):
-        device: HomePilotLight = self.coordinator.data[self.did]
+        device: HomePilotLight = self.device
         return (device.r_value, device.g_value, device.b_value)
 
     @property
     def is_on(self):
-        device: HomePilotActuator = self.coordinator.data[self.did]
+        device: HomePilotActuator = self.device
         return device.is_on
 
     async def async_turn_on(self, **kwargs: Any) -> None:
-        async def _cmd(d):
+        async def _turn_on(d):
             if not d.is_on:
                 await d.async_turn_on()
-            if ATTR_BRIGHTNESS in kwargs:
-                await d.async_set_brightness(round(kwargs[ATTR_BRIGHTNESS] * 100 / 255))
-            if ATTR_RGB_COLOR in kwargs:
-                await d.async_set_rgb(*kwargs[ATTR_RGB_COLOR])
-            if ATTR_COLOR_TEMP_KELVIN in kwargs:
-                await d.async_set_color_temp(round(1000000 / kwargs[ATTR_COLOR_TEMP_KELVIN]))
+
+        # Separate kinds, so that e.g. a brightness change does not supersede
+        # a color change still waiting to be sent. A pending turn off is
+        # superseded by the turn on.
+        commands = [("power", _turn_on)]
+        if ATTR_BRIGHTNESS in kwargs:
+            brightness = round(kwargs[ATTR_BRIGHTNESS] * 100 / 255)
+            commands.append(("brightness", lambda d: d.async_set_brightness(brightness)))
+        if ATTR_RGB_COLOR in kwargs:
+            rgb_color = kwargs[ATTR_RGB_COLOR]
+            commands.append(("color", lambda d: d.async_set_rgb(*rgb_color)))
+        if ATTR_COLOR_TEMP_KELVIN in kwargs:
+            color_temp = round(1000000 / kwargs[ATTR_COLOR_TEMP_KELVIN])
+            commands.append(("color", lambda d: d.async_set_color_temp(color_temp)))
 
         def _check():
             if not self.is_on:
@@ -169,8 +172,8 @@ class HomePilotLightEntity(HomePilotEntity, LightEntity):
                     return False
             return True
 
-        await self.async_execute_and_poll(_cmd, _check, 1.0)
+        await self.async_execute_all_and_poll(commands, _check, 1.0)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
-        await self.async_execute_and_poll(lambda d: d.async_turn_off(), lambda: not self.is_on, 1.0)
+        await self.async_execute_and_poll(lambda d: d.async_turn_off(), lambda: not self.is_on, 1.0, kind="power")
 
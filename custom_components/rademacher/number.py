@@ -3,52 +3,41 @@ import logging
 
 from homepilot.cover import HomePilotCover
 from homepilot.device import HomePilotDevice
-from homepilot.manager import HomePilotManager
 from homepilot.thermostat import HomePilotThermostat
 
 from homeassistant.components.number import NumberDeviceClass, NumberEntity, NumberMode
-from homeassistant.const import CONF_EXCLUDE, PERCENTAGE, UnitOfTemperature
+from homeassistant.const import PERCENTAGE, UnitOfTemperature
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN
+from .descriptions import HomePilotEntityDescription, async_setup_device_entities
 from .entity import HomePilotEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
+ENTITY_DESCRIPTIONS = (
+    HomePilotEntityDescription(
+        capability="ventilation_position_config",
+        name="Ventilation Position Config",
+        create_fn=lambda coordinator, device: HomePilotVentilationPositionEntity(coordinator, device),
+    ),
+    *(
+        HomePilotEntityDescription(
+            capability=f"temperature_thresh_cfg_{thresh}",
+            name=f"Temperature Threshold Config {thresh}",
+            create_fn=lambda coordinator, device, thresh=thresh: HomePilotTemperatureThresholdEntity(
+                coordinator, device, thresh
+            ),
+        )
+        for thresh in range(1, 5)
+    ),
+)
+
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Setup of entities for switch platform."""
-    entry = hass.data[DOMAIN][config_entry.entry_id]
-    manager: HomePilotManager = entry[0]
-    coordinator: DataUpdateCoordinator = entry[1]
-    exclude_devices: list[str] = entry[3][CONF_EXCLUDE]
-    new_entities = []
-    for did in manager.devices:
-        if did not in exclude_devices:
-            device: HomePilotDevice = manager.devices[did]
-            if isinstance(device, HomePilotCover):
-                cover: HomePilotCover = device
-                if cover.has_ventilation_position_config:
-                    _LOGGER.info("Found Ventilation Position Config for Device ID: %s", device.did)
-                    new_entities.append(HomePilotVentilationPositionEntity(coordinator, device))
-            if isinstance(device, HomePilotThermostat):
-                thermostat: HomePilotThermostat = device
-                if thermostat.has_temperature_thresh_cfg[0]:
-                    _LOGGER.info("Found Temperature Threshold Config 1 for Device ID: %s", device.did)
-                    new_entities.append(HomePilotTemperatureThresholdEntity(coordinator, device, 1))
-                if thermostat.has_temperature_thresh_cfg[1]:
-                    _LOGGER.info("Found Temperature Threshold Config 2 for Device ID: %s", device.did)
-                    new_entities.append(HomePilotTemperatureThresholdEntity(coordinator, device, 2))
-                if thermostat.has_temperature_thresh_cfg[2]:
-                    _LOGGER.info("Found Temperature Threshold Config 3 for Device ID: %s", device.did)
-                    new_entities.append(HomePilotTemperatureThresholdEntity(coordinator, device, 3))
-                if thermostat.has_temperature_thresh_cfg[3]:
-                    _LOGGER.info("Found Temperature Threshold Config 4 for Device ID: %s", device.did)
-                    new_entities.append(HomePilotTemperatureThresholdEntity(coordinator, device, 4))
-    # If we have any new devices, add them
-    if new_entities:
-        async_add_entities(new_entities)
+    async_setup_device_entities(hass, config_entry, async_add_entities, ENTITY_DESCRIPTIONS)
 
 
 class HomePilotVentilationPositionEntity(HomePilotEntity, NumberEntity):
@@ -73,18 +62,19 @@ class HomePilotVentilationPositionEntity(HomePilotEntity, NumberEntity):
 
     @property
     def available(self):
-        device: HomePilotCover = self.coordinator.data[self.did]
+        device: HomePilotCover = self.device
         return super().available and device.ventilation_position_mode
 
     @property
     def native_value(self):
-        device: HomePilotCover = self.coordinator.data[self.did]
+        device: HomePilotCover = self.device
         return device.ventilation_position
 
     async def async_set_native_value(self, value):
         await self.async_execute_and_poll(
             lambda d: d.async_set_ventilation_position(value),
             lambda: self.native_value == value,
+            kind="ventilation_position",
         )
 
 class HomePilotTemperatureThresholdEntity(HomePilotEntity, NumberEntity):
@@ -111,7 +101,7 @@ class HomePilotTemperatureThresholdEntity(HomePilotEntity, NumberEntity):
 
     @property
     def native_value(self):
-        device: HomePilotThermostat = self.coordinator.data[self.did]
+        device: HomePilotThermostat = self.device
         return device.temperature_thresh_cfg_value[self._thresh_number-1]
 
     async def async_set_native_value(self, value):
@@ -119,4 +109,5 @@ class HomePilotTemperatureThresholdEntity(HomePilotEntity, NumberEntity):
         await self.async_execute_and_poll(
             lambda d: d.async_set_temperature_thresh_cfg(thresh, value),
             lambda: self.native_value == value,
+            kind=f"temperature_thresh_{thresh}",
         )
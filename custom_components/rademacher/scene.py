@@ -1,5 +1,6 @@
 """Platform for Rademacher Bridge."""
 import asyncio
+from collections.abc import Iterable
 import logging
 from typing import Any
 
@@ -7,35 +8,46 @@ from homepilot.manager import HomePilotManager
 from homepilot.scenes import HomePilotScene
 
 from homeassistant.components.scene import Scene
-from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_ADD_SCENES
+from .coordinator import HomePilotSceneCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Setup of entities for scene platform."""
-    entry = hass.data[DOMAIN][config_entry.entry_id]
-    manager: HomePilotManager = entry[0]
-    scene_coordinator: DataUpdateCoordinator = entry[4]  # Scene coordinator is at index 4
-
-    new_entities = []
-    for sid in manager.scenes:
-        scene: HomePilotScene = manager.scenes[sid]
-        _LOGGER.info("Found Scene for ID: %s", sid)
-        new_entities.append(HomePilotSceneEntity(scene_coordinator, scene))
-    # If we have any new devices, add them
-    if new_entities:
-        async_add_entities(new_entities)
-
+    manager: HomePilotManager = config_entry.runtime_data.manager
+    scene_coordinator: HomePilotSceneCoordinator = config_entry.runtime_data.scene_coordinator
+
+    @callback
+    def async_add_scenes(sids: Iterable[str]) -> None:
+        """Add the entities of the given scenes."""
+        new_entities = []
+        for sid in sids:
+            scene: HomePilotScene = manager.scenes[sid]
+            _LOGGER.info("Found Scene for ID: %s", sid)
+            new_entities.append(HomePilotSceneEntity(scene_coordinator, scene))
+        # If we have any new devices, add them
+        if new_entities:
+            async_add_entities(new_entities)
+
+    async_add_scenes(manager.scenes)
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_ADD_SCENES.format(config_entry.entry_id), async_add_scenes
+        )
+    )
 
 
 class HomePilotSceneEntity(CoordinatorEntity, Scene):
     """This class represents a Rademacher HomePilot Scene."""
 
     def __init__(
-        self, coordinator: DataUpdateCoordinator, scene: HomePilotScene
+        self, coordinator: HomePilotSceneCoordinator, scene: HomePilotScene
     ) -> None:
         # Initialize both parent classes
         CoordinatorEntity.__init__(self, coordinator)
@@ -113,7 +125,8 @@ class HomePilotSceneEntity(CoordinatorEntity, Scene):
             _LOGGER.warning("Scene %s (%s) is not manually executable", scene.name, self._sid)
             return
 
-        await scene.async_execute_scene()
+        with self.coordinator.breaker.guard():
+            await scene.async_execute_scene()
         # Request coordinator refresh after scene execution (like other entities)
         async with asyncio.timeout(5):
             await self.coordinator.async_request_refresh()
\ No newline at end of file
@@ -1,14 +1,13 @@
 """Platform for Rademacher Bridge."""
+from collections.abc import Callable
 from enum import Enum
 import logging
+from typing import Any
 
 from .const import CONF_CREATE_INVERTED_COVER_POSITION
 
-from homepilot.cover import HomePilotCover
 from homepilot.device import HomePilotDevice
-from homepilot.manager import HomePilotManager
-from homepilot.sensor import ContactState, HomePilotSensor
-from homepilot.thermostat import HomePilotThermostat
+from homepilot.sensor import ContactState
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -16,199 +15,228 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.const import (
-    CONF_EXCLUDE,
     CONF_SENSOR_TYPE,
     DEGREE,
     LIGHT_LUX,
     PERCENTAGE,
     UnitOfSpeed,
     UnitOfTemperature,
+    UnitOfTime,
 )
 from homeassistant.helpers.entity import EntityCategory
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN
+from .descriptions import HomePilotEntityDescription, async_setup_device_entities
 from .entity import HomePilotEntity
+from .telemetry import HomePilotTelemetry
 
 _LOGGER = logging.getLogger(__name__)
 
 
+ENTITY_DESCRIPTIONS = (
+    HomePilotEntityDescription(
+        capability="temperature",
+        name="Temperature Sensor",
+        create_fn=lambda coordinator, device: HomePilotSensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="temp",
+            name_suffix="Temperature",
+            value_attr="temperature_value",
+            device_class=SensorDeviceClass.TEMPERATURE.value,
+            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="target_temperature",
+        name="Target Temperature Sensor",
+        create_fn=lambda coordinator, device: HomePilotSensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="target_temp",
+            name_suffix="Target Temperature",
+            value_attr="target_temperature_value",
+            device_class=SensorDeviceClass.TEMPERATURE.value,
+            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="wind_speed",
+        name="Wind Speed Sensor",
+        create_fn=lambda coordinator, device: HomePilotSensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="wind_speed",
+            name_suffix="Wind Speed",
+            value_attr="wind_speed_value",
+            native_unit_of_measurement=UnitOfSpeed.METERS_PER_SECOND,
+            icon="mdi:weather-windy",
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="brightness",
+        name="Brightness Sensor",
+        create_fn=lambda coordinator, device: HomePilotSensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="brightness",
+            name_suffix="Brightness",
+            value_attr="brightness_value",
+            device_class=SensorDeviceClass.ILLUMINANCE.value,
+            native_unit_of_measurement=LIGHT_LUX,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="sun_height",
+        name="Sun Height Sensor",
+        create_fn=lambda coordinator, device: HomePilotSensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="sun_height",
+            name_suffix="Sun Height",
+            value_attr="sun_height_value",
+            native_unit_of_measurement=DEGREE,
+            icon="mdi:weather-sunset-up",
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="sun_direction",
+        name="Sun Direction Sensor",
+        create_fn=lambda coordinator, device: HomePilotSensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="sun_direction",
+            name_suffix="Sun Direction",
+            value_attr="sun_direction_value",
+            native_unit_of_measurement=DEGREE,
+            icon="mdi:sun-compass",
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="contact_state",
+        name="Contact Sensor",
+        # Ternary contact sensors, the others are binary sensors
+        options_fn=lambda device, options: device.did in options[CONF_SENSOR_TYPE],
+        create_fn=lambda coordinator, device: HomePilotSensorEntity(
+            coordinator=coordinator,
+            device=device,
+            device_class=SensorDeviceClass.ENUM.value,
+            id_suffix="contact_state",
+            name_suffix="Contact State",
+            value_attr="contact_state_value",
+            state_class=None,
+            icon_template=lambda val: "mdi:square-outline"
+            if val == ContactState.OPEN
+            else (
+                "mdi:network-strength-outline"
+                if val == ContactState.TILTED
+                else "mdi:square"
+            ),
+            options=["Open", "Tilted", "Closed"]
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="battery_level",
+        name="Battery Level Sensor",
+        create_fn=lambda coordinator, device: HomePilotSensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="battery_level",
+            name_suffix="Battery Level",
+            value_attr="battery_level_value",
+            device_class=SensorDeviceClass.BATTERY,
+            native_unit_of_measurement=PERCENTAGE,
+            entity_category=EntityCategory.DIAGNOSTIC,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="cover",
+        name="Inverted Cover Position Sensor",
+        options_fn=lambda device, options: options[CONF_CREATE_INVERTED_COVER_POSITION],
+        create_fn=lambda coordinator, device: HomePilotSensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="inverted_cover_position",
+            name_suffix="Inverted Cover Position",
+            value_attr="cover_position",
+            inverted=True,
+            device_class=None,
+            native_unit_of_measurement=PERCENTAGE,
+            entity_category=EntityCategory.DIAGNOSTIC,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="tilt",
+        name="Inverted Cover Tilt Position Sensor",
+        options_fn=lambda device, options: options[CONF_CREATE_INVERTED_COVER_POSITION],
+        create_fn=lambda coordinator, device: HomePilotSensorEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="inverted_cover_tilt_position",
+            name_suffix="Inverted Cover Tilt Position",
+            value_attr="cover_tilt_position",
+            inverted=True,
+            device_class=None,
+            native_unit_of_measurement=PERCENTAGE,
+            entity_category=EntityCategory.DIAGNOSTIC,
+        ),
+    ),
+    HomePilotEntityDescription(
+        capability="hub",
+        name="Bridge Health Sensors",
+        create_fn=lambda coordinator, device: [
+            HomePilotBridgeHealthSensorEntity(
+                coordinator=coordinator,
+                device=device,
+                id_suffix="last_poll_duration",
+                name_suffix="Last Poll Duration",
+                value_fn=lambda telemetry: telemetry.last_poll_duration,
+                device_class=SensorDeviceClass.DURATION,
+                native_unit_of_measurement=UnitOfTime.SECONDS,
+                icon="mdi:timer-outline",
+            ),
+            HomePilotBridgeHealthSensorEntity(
+                coordinator=coordinator,
+                device=device,
+                id_suffix="poll_success_rate",
+                name_suffix="Poll Success Rate",
+                value_fn=lambda telemetry: telemetry.poll_success_rate,
+                native_unit_of_measurement=PERCENTAGE,
+                icon="mdi:check-network-outline",
+            ),
+            HomePilotBridgeHealthSensorEntity(
+                coordinator=coordinator,
+                device=device,
+                id_suffix="requests_per_minute",
+                name_suffix="Requests per Minute",
+                value_fn=lambda telemetry: telemetry.requests_per_minute,
+                native_unit_of_measurement="requests/min",
+                icon="mdi:swap-horizontal",
+            ),
+            HomePilotBridgeHealthSensorEntity(
+                coordinator=coordinator,
+                device=device,
+                id_suffix="timed_out_devices",
+                name_suffix="Devices Timed Out",
+                value_fn=lambda telemetry: telemetry.timed_out_devices,
+                icon="mdi:timer-alert-outline",
+            ),
+            HomePilotBridgeHealthSensorEntity(
+                coordinator=coordinator,
+                device=device,
+                id_suffix="skipped_polls",
+                name_suffix="Skipped Polls",
+                value_fn=lambda telemetry: sum(telemetry.skipped_cycles.values()),
+                icon="mdi:debug-step-over",
+                state_class=SensorStateClass.TOTAL_INCREASING,
+            ),
+        ],
+    ),
+)
+
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Setup of entities for sensor platform."""
-    entry = hass.data[DOMAIN][config_entry.entry_id]
-    manager: HomePilotManager = entry[0]
-    coordinator: DataUpdateCoordinator = entry[1]
-    exclude_devices: list[str] = entry[3][CONF_EXCLUDE]
-    ternary_contact_sensors: list[str] = entry[3][CONF_SENSOR_TYPE]
-    create_inverted_cover_position: bool = entry[3][CONF_CREATE_INVERTED_COVER_POSITION]
-    new_entities = []
-    for did in manager.devices:
-        if did not in exclude_devices:
-            device: HomePilotDevice = manager.devices[did]
-            if isinstance(device, HomePilotSensor):
-                if device.has_temperature:
-                    _LOGGER.info(
-                        "Found Temperature Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotSensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="temp",
-                            name_suffix="Temperature",
-                            value_attr="temperature_value",
-                            device_class=SensorDeviceClass.TEMPERATURE.value,
-                            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-                        )
-                    )
-                if device.has_target_temperature:
-                    _LOGGER.info(
-                        "Found Target Temperature Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotSensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="target_temp",
-                            name_suffix="Target Temperature",
-                            value_attr="target_temperature_value",
-                            device_class=SensorDeviceClass.TEMPERATURE.value,
-                            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-                        )
-                    )
-                if device.has_wind_speed:
-                    _LOGGER.info(
-                        "Found Wind Speed Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotSensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="wind_speed",
-                            name_suffix="Wind Speed",
-                            value_attr="wind_speed_value",
-                            native_unit_of_measurement=UnitOfSpeed.METERS_PER_SECOND,
-                            icon="mdi:weather-windy",
-                        )
-                    )
-                if device.has_brightness:
-                    _LOGGER.info(
-                        "Found Brightness Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotSensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="brightness",
-                            name_suffix="Brightness",
-                            value_attr="brightness_value",
-                            device_class=SensorDeviceClass.ILLUMINANCE.value,
-                            native_unit_of_measurement=LIGHT_LUX,
-                        )
-                    )
-                if device.has_sun_height:
-                    _LOGGER.info(
-                        "Found Sun Height Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotSensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="sun_height",
-                            name_suffix="Sun Height",
-                            value_attr="sun_height_value",
-                            native_unit_of_measurement=DEGREE,
-                            icon="mdi:weather-sunset-up",
-                        )
-                    )
-                if device.has_sun_direction:
-                    _LOGGER.info(
-                        "Found Sun Direction Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotSensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="sun_direction",
-                            name_suffix="Sun Direction",
-                            value_attr="sun_direction_value",
-                            native_unit_of_measurement=DEGREE,
-                            icon="mdi:sun-compass",
-                        )
-                    )
-                if device.has_contact_state and device.did in ternary_contact_sensors:
-                    _LOGGER.info("Found Contact Sensor for Device ID: %s", device.did)
-                    new_entities.append(
-                        HomePilotSensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            device_class=SensorDeviceClass.ENUM.value,
-                            id_suffix="contact_state",
-                            name_suffix="Contact State",
-                            value_attr="contact_state_value",
-                            state_class=None,
-                            icon_template=lambda val: "mdi:square-outline"
-                            if val == ContactState.OPEN
-                            else (
-                                "mdi:network-strength-outline"
-                                if val == ContactState.TILTED
-                                else "mdi:square"
-                            ),
-                            options=["Open", "Tilted", "Closed"]
-                        )
-                    )
-            if isinstance(device, (HomePilotSensor, HomePilotThermostat)):
-                if device.has_battery_level:
-                    _LOGGER.info(
-                        "Found Battery Level Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotSensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="battery_level",
-                            name_suffix="Battery Level",
-                            value_attr="battery_level_value",
-                            device_class=SensorDeviceClass.BATTERY,
-                            native_unit_of_measurement=PERCENTAGE,
-                            entity_category=EntityCategory.DIAGNOSTIC,
-                        )
-                    )
-            if isinstance(device, HomePilotCover):
-                if create_inverted_cover_position:
-                    _LOGGER.info(
-                        "Found Inverted Cover Position Sensor for Device ID: %s", device.did
-                    )
-                    new_entities.append(
-                        HomePilotSensorEntity(
-                            coordinator=coordinator,
-                            device=device,
-                            id_suffix="inverted_cover_position",
-                            name_suffix="Inverted Cover Position",
-                            value_attr="cover_position",
-                            inverted=True,
-                            device_class=None,
-                            native_unit_of_measurement=PERCENTAGE,
-                            entity_category=EntityCategory.DIAGNOSTIC,
-                        )
-                    )
-                    if device.has_tilt:
-                        new_entities.append(
-                            HomePilotSensorEntity(
-                                coordinator=coordinator,
-                                device=device,
-                                id_suffix="inverted_cover_tilt_position",
-                                name_suffix="Inverted Cover Tilt Position",
-                                value_attr="cover_tilt_position",
-                                inverted=True,
-                                device_class=None,
-                                native_unit_of_measurement=PERCENTAGE,
-                                entity_category=EntityCategory.DIAGNOSTIC,
-                            )
-                        )
-    # If we have any new devices, add them
-    if new_entities:
-        async_add_entities(new_entities)
+    async_setup_device_entities(hass, config_entry, async_add_entities, ENTITY_DESCRIPTIONS)
 
 
 class HomePilotSensorEntity(HomePilotEntity, SensorEntity):
@@ -255,7 +283,7 @@ class HomePilotSensorEntity(HomePilotEntity, SensorEntity):
 
     @property
     def native_value(self):
-        value = getattr(self.coordinator.data[self.did], self.value_attr)
+        value = getattr(self.device, self.value_attr)
         value = value.name.capitalize() if isinstance(value, Enum) else value
         if self._inverted and isinstance(value, (int,float)):
             return 100 - value
@@ -265,6 +293,56 @@ class HomePilotSensorEntity(HomePilotEntity, SensorEntity):
     def icon(self):
         if self._icon_template is not None:
             return self._icon_template(
-                getattr(self.coordinator.data[self.did], self.value_attr)
+                getattr(self.device, self.value_attr)
             )
         return super().icon
+
+
+class HomePilotBridgeHealthSensorEntity(HomePilotSensorEntity):
+    """Diagnostic sensor of the bridge reporting the polling telemetry.
+
+    Disabled by default. Updated after every device poll of any tier, and kept
+    available while the bridge is unreachable so degradation can be graphed.
+    """
+
+    def __init__(
+        self,
+        coordinator,
+        device: HomePilotDevice,
+        id_suffix,
+        name_suffix,
+        value_fn: Callable[[HomePilotTelemetry], Any],
+        device_class=None,
+        native_unit_of_measurement=None,
+        icon=None,
+        state_class=SensorStateClass.MEASUREMENT,
+    ) -> None:
+        super().__init__(
+            coordinator,
+            device,
+            id_suffix=id_suffix,
+            name_suffix=name_suffix,
+            value_attr=None,
+            device_class=device_class,
+            native_unit_of_measurement=native_unit_of_measurement,
+            icon=icon,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            state_class=state_class,
+        )
+        self._value_fn = value_fn
+        self._entity_registry_enabled_default = False
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.telemetry.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def available(self):
+        return True
+
+    @property
+    def native_value(self):
+        value = self._value_fn(self.coordinator.telemetry)
+        return round(value, 2) if isinstance(value, float) else value
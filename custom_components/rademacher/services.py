@@ -0,0 +1,230 @@
+"""Services of the Rademacher Bridge integration."""
+import asyncio
+import cProfile
+import logging
+import time
+
+import voluptuous as vol
+
+from homeassistant.components.cover import ATTR_POSITION, ATTR_TILT_POSITION
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import Platform
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+from homeassistant.util import dt as dt_util
+
+from .const import ATTR_CONFIG_ENTRY_ID, DOMAIN
+from .cover import HomePilotCoverEntity
+from .data import HomePilotConfigEntry
+from .telemetry import HomePilotTelemetry
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE = "profile"
+SERVICE_SET_COVER_POSITIONS = "set_cover_positions"
+
+ATTR_CYCLES = "cycles"
+ATTR_COMMANDS = "commands"
+ATTR_TIMEOUT = "timeout"
+ATTR_COVERS = "covers"
+ATTR_CONCURRENCY = "concurrency"
+ATTR_PACING = "pacing"
+
+# Interval at which a running profile checks the polls and commands seen
+PROFILE_CHECK_INTERVAL = 1
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CYCLES, default=5): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+        vol.Optional(ATTR_COMMANDS, default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+        vol.Optional(ATTR_TIMEOUT, default=600): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+    }
+)
+
+_POSITION = vol.All(vol.Coerce(int), vol.Range(min=0, max=100))
+
+SET_COVER_POSITIONS_SCHEMA = vol.Schema(
+    {
+        # The target covers, moved to position and/or tilt_position
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(ATTR_POSITION): _POSITION,
+        vol.Optional(ATTR_TILT_POSITION): _POSITION,
+        # Either a position, or a position and/or tilt position per cover
+        vol.Optional(ATTR_COVERS): {
+            cv.entity_id: vol.Any(
+                _POSITION,
+                vol.All(
+                    {
+                        vol.Optional(ATTR_POSITION): _POSITION,
+                        vol.Optional(ATTR_TILT_POSITION): _POSITION,
+                    },
+                    cv.has_at_least_one_key(ATTR_POSITION, ATTR_TILT_POSITION),
+                ),
+            )
+        },
+        vol.Optional(ATTR_CONCURRENCY, default=4): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+        vol.Optional(ATTR_PACING, default=0.25): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+    }
+)
+
+
+def _get_telemetry(hass: HomeAssistant, entry_id: str) -> HomePilotTelemetry:
+    entry: HomePilotConfigEntry | None = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN or entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(f"Config entry {entry_id} of {DOMAIN} is not loaded")
+    return entry.runtime_data.telemetry
+
+
+async def async_profile(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Profile the event loop until the entry ran the given polls and commands.
+
+    The profile covers everything running in the event loop meanwhile, as in
+    the profiler integration, and is written as pstats file into the config
+    directory, e.g. for snakeviz or flameprof.
+    """
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    telemetry = _get_telemetry(hass, entry_id)
+    polls = telemetry.polls + call.data[ATTR_CYCLES]
+    commands = telemetry.count("command") + call.data[ATTR_COMMANDS]
+    path = hass.config.path(f"{DOMAIN}_profile_{dt_util.utcnow().strftime('%Y%m%d_%H%M%S')}.prof")
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as err:
+        # Another profile, or the profiler integration, is running
+        raise HomeAssistantError(f"Cannot start profiling: {err}") from err
+    _LOGGER.info("Profiling %s until %s polls and %s commands are done", entry_id, call.data[ATTR_CYCLES], call.data[ATTR_COMMANDS])
+    start = time.monotonic()
+    try:
+        async with asyncio.timeout(call.data[ATTR_TIMEOUT]):
+            while telemetry.polls < polls or telemetry.count("command") < commands:
+                await asyncio.sleep(PROFILE_CHECK_INTERVAL)
+        completed = True
+    except TimeoutError:
+        completed = False
+    finally:
+        profiler.disable()
+    duration = time.monotonic() - start
+
+    await hass.async_add_executor_job(profiler.dump_stats, path)
+    _LOGGER.info("Profile of %s written to %s after %.1f seconds", entry_id, path, duration)
+    return {"path": path, "duration": duration, "completed": completed}
+
+
+def _get_cover_targets(
+    hass: HomeAssistant, call: ServiceCall
+) -> dict[HomePilotCoverEntity, tuple[int | None, int | None]]:
+    """Return the position and tilt position to move each cover of the call to."""
+    covers = {
+        entity_id: entity
+        for platform in async_get_platforms(hass, DOMAIN)
+        if platform.domain == Platform.COVER
+        for entity_id, entity in platform.entities.items()
+    }
+    targets: dict[str, tuple[int | None, int | None]] = {}
+    selected = async_extract_referenced_entity_ids(hass, call)
+    # Areas, floors, labels and devices can hold other covers, which are left out
+    target_ids = selected.referenced | (selected.indirectly_referenced & set(covers))
+    if target_ids:
+        position = call.data.get(ATTR_POSITION)
+        tilt_position = call.data.get(ATTR_TILT_POSITION)
+        if position is None and tilt_position is None:
+            raise ServiceValidationError(f"The target covers need a {ATTR_POSITION} or {ATTR_TILT_POSITION}")
+        targets.update((entity_id, (position, tilt_position)) for entity_id in target_ids)
+    for entity_id, target in call.data.get(ATTR_COVERS, {}).items():
+        if isinstance(target, int):
+            targets[entity_id] = (target, None)
+        else:
+            targets[entity_id] = (target.get(ATTR_POSITION), target.get(ATTR_TILT_POSITION))
+    if not targets:
+        raise ServiceValidationError(f"No {DOMAIN} cover targeted or given in {ATTR_COVERS}")
+    if unknown := sorted(set(targets) - set(covers)):
+        raise ServiceValidationError(f"Not a {DOMAIN} cover: {', '.join(unknown)}")
+    for entity_id, (position, tilt_position) in targets.items():
+        device = covers[entity_id].device
+        if position is not None and not device.can_set_position:
+            raise ServiceValidationError(f"{entity_id} cannot be set to a position")
+        if tilt_position is not None and not device.can_set_tilt_position:
+            raise ServiceValidationError(f"{entity_id} cannot be set to a tilt position")
+    return {covers[entity_id]: target for entity_id, target in targets.items()}
+
+
+async def async_set_cover_positions(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Move many covers with a bounded number of commands in flight.
+
+    At most concurrency commands are sent at a time, and consecutive commands
+    start at least pacing seconds apart, so that the bridge is not flooded as
+    with one action per cover. The motion of all covers is then verified by
+    the shared reconciliation of their coordinator.
+    """
+    targets = _get_cover_targets(hass, call)
+    semaphore = asyncio.Semaphore(call.data[ATTR_CONCURRENCY])
+    pacing = call.data[ATTR_PACING]
+    next_start = hass.loop.time()
+
+    async def async_move(cover: HomePilotCoverEntity, position: int | None, tilt_position: int | None) -> asyncio.Task[bool] | None:
+        nonlocal next_start
+        async with semaphore:
+            start = max(hass.loop.time(), next_start)
+            next_start = start + pacing
+            await asyncio.sleep(start - hass.loop.time())
+            try:
+                return await cover.async_move(position, tilt_position)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.warning("Error moving cover %s: %s", cover.entity_id, err)
+                return None
+
+    _LOGGER.info("Moving %s covers, %s at a time", len(targets), call.data[ATTR_CONCURRENCY])
+    motions = await asyncio.gather(*(async_move(cover, *target) for cover, target in targets.items()))
+    tracked = [motion for motion in motions if motion is not None]
+    if tracked:
+        await asyncio.wait(tracked)
+
+    confirmed, unconfirmed = [], []
+    for cover, motion in zip(targets, motions):
+        # Tracking is cancelled when a newer command reached the cover meanwhile
+        if motion is not None and not motion.cancelled() and motion.exception() is None and motion.result():
+            confirmed.append(cover.entity_id)
+        else:
+            unconfirmed.append(cover.entity_id)
+    if unconfirmed:
+        _LOGGER.warning("Covers %s did not reach their target", unconfirmed)
+    return {"confirmed": confirmed, "unconfirmed": unconfirmed}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_handle_profile(call: ServiceCall) -> ServiceResponse:
+        return await async_profile(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_handle_set_cover_positions(call: ServiceCall) -> ServiceResponse:
+        return await async_set_cover_positions(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_COVER_POSITIONS,
+        async_handle_set_cover_positions,
+        schema=SET_COVER_POSITIONS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
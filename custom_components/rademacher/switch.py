@@ -1,81 +1,120 @@
 """Platform for Rademacher Bridge."""
 import asyncio
+from collections.abc import Iterable
 import logging
 
 from homepilot.cover import HomePilotCover
-from homepilot.thermostat import HomePilotThermostat
 from homepilot.device import HomePilotDevice, HomePilotAutoConfigDevice
 from homepilot.hub import HomePilotHub
 from homepilot.manager import HomePilotManager
-from homepilot.switch import HomePilotSwitch
 from homepilot.scenes import HomePilotScene
 from homeassistant.components.switch import SwitchDeviceClass, SwitchEntity
-from homeassistant.const import CONF_EXCLUDE
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, CoordinatorEntity
 
-from .const import CONF_CREATE_SCENE_ACTIVATION_ENTITIES, DOMAIN
+from .const import (
+    CONF_CREATE_SCENE_ACTIVATION_ENTITIES,
+    DOMAIN,
+    SIGNAL_ADD_SCENES,
+)
+from .coordinator import HomePilotSceneCoordinator
+from .descriptions import HomePilotEntityDescription, async_setup_device_entities
 from .entity import HomePilotEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
+ENTITY_DESCRIPTIONS = (
+    HomePilotEntityDescription(
+        capability="hub",
+        name="Led Switch",
+        create_fn=lambda coordinator, device: HomePilotLedSwitchEntity(coordinator, device),
+    ),
+    HomePilotEntityDescription(
+        capability="hub",
+        name="Auto Update Switch",
+        create_fn=lambda coordinator, device: HomePilotAutoUpdaeSwitchEntity(coordinator, device),
+    ),
+    HomePilotEntityDescription(
+        capability="switch",
+        name="Switch",
+        create_fn=lambda coordinator, device: HomePilotSwitchEntity(coordinator, device),
+    ),
+    HomePilotEntityDescription(
+        capability="ventilation_position_config",
+        name="Ventilation Position Config Switch",
+        create_fn=lambda coordinator, device: HomePilotVentilationSwitchEntity(coordinator, device),
+    ),
+    HomePilotEntityDescription(
+        capability="auto_mode",
+        name="Auto Mode Config Switch",
+        create_fn=lambda coordinator, device: HomePilotAutoModeEntity(coordinator, device),
+    ),
+    HomePilotEntityDescription(
+        capability="time_auto_mode",
+        name="Time Auto Mode Config Switch",
+        create_fn=lambda coordinator, device: HomePilotTimeAutoModeEntity(coordinator, device),
+    ),
+    HomePilotEntityDescription(
+        capability="contact_auto_mode",
+        name="Contact Auto Mode Config Switch",
+        create_fn=lambda coordinator, device: HomePilotContactAutoModeEntity(coordinator, device),
+    ),
+    HomePilotEntityDescription(
+        capability="wind_auto_mode",
+        name="Wind Auto Mode Config Switch",
+        create_fn=lambda coordinator, device: HomePilotWindAutoModeEntity(coordinator, device),
+    ),
+    HomePilotEntityDescription(
+        capability="dusk_auto_mode",
+        name="Dusk Auto Mode Config Switch",
+        create_fn=lambda coordinator, device: HomePilotDuskAutoModeEntity(coordinator, device),
+    ),
+    HomePilotEntityDescription(
+        capability="dawn_auto_mode",
+        name="Dawn Auto Mode Config Switch",
+        create_fn=lambda coordinator, device: HomePilotDawnAutoModeEntity(coordinator, device),
+    ),
+    HomePilotEntityDescription(
+        capability="rain_auto_mode",
+        name="Rain Auto Mode Config Switch",
+        create_fn=lambda coordinator, device: HomePilotRainAutoModeEntity(coordinator, device),
+    ),
+    HomePilotEntityDescription(
+        capability="sun_auto_mode",
+        name="Sun Auto Mode Config Switch",
+        create_fn=lambda coordinator, device: HomePilotSunAutoModeEntity(coordinator, device),
+    ),
+)
+
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Setup of entities for switch platform."""
-    entry = hass.data[DOMAIN][config_entry.entry_id]
-    manager: HomePilotManager = entry[0]
-    coordinator: DataUpdateCoordinator = entry[1]
-    exclude_devices: list[str] = entry[3][CONF_EXCLUDE]
-    new_entities = []
-    for did in manager.devices:
-        if did not in exclude_devices:
-            device: HomePilotDevice = manager.devices[did]
-            if isinstance(device, HomePilotHub):
-                _LOGGER.info("Found Led Switch for Device ID: %s", device.did)
-                new_entities.append(HomePilotLedSwitchEntity(coordinator, device))
-                new_entities.append(HomePilotAutoUpdaeSwitchEntity(coordinator, device))
-            if isinstance(device, HomePilotSwitch):
-                _LOGGER.info("Found Switch for Device ID: %s", device.did)
-                new_entities.append(HomePilotSwitchEntity(coordinator, device))
-            if isinstance(device, HomePilotCover):
-                cover: HomePilotCover = device
-                if cover.has_ventilation_position_config:
-                    _LOGGER.info("Found Ventilation Position Config Switch for Device ID: %s", device.did)
-                    new_entities.append(HomePilotVentilationSwitchEntity(coordinator, device))
-            if isinstance(device, HomePilotAutoConfigDevice):
-                auto_device: HomePilotAutoConfigDevice = device
-                if auto_device.has_auto_mode and not isinstance(auto_device, HomePilotThermostat):
-                    _LOGGER.info("Found Auto Mode Config Switch for Device ID: %s", device.did)
-                    new_entities.append(HomePilotAutoModeEntity(coordinator, device))
-                if auto_device.has_time_auto_mode:
-                    _LOGGER.info("Found Time Auto Mode Config Switch for Device ID: %s", device.did)
-                    new_entities.append(HomePilotTimeAutoModeEntity(coordinator, device))
-                if auto_device.has_contact_auto_mode:
-                    _LOGGER.info("Found Contact Auto Mode Config Switch for Device ID: %s", device.did)
-                    new_entities.append(HomePilotContactAutoModeEntity(coordinator, device))
-                if auto_device.has_wind_auto_mode:
-                    _LOGGER.info("Found Wind Auto Mode Config Switch for Device ID: %s", device.did)
-                    new_entities.append(HomePilotWindAutoModeEntity(coordinator, device))
-                if auto_device.has_dusk_auto_mode:
-                    _LOGGER.info("Found Dusk Auto Mode Config Switch for Device ID: %s", device.did)
-                    new_entities.append(HomePilotDuskAutoModeEntity(coordinator, device))
-                if auto_device.has_dawn_auto_mode:
-                    _LOGGER.info("Found Dawn Auto Mode Config Switch for Device ID: %s", device.did)
-                    new_entities.append(HomePilotDawnAutoModeEntity(coordinator, device))
-                if auto_device.has_rain_auto_mode:
-                    _LOGGER.info("Found Rain Auto Mode Config Switch for Device ID: %s", device.did)
-                    new_entities.append(HomePilotRainAutoModeEntity(coordinator, device))
-                if auto_device.has_sun_auto_mode:
-                    _LOGGER.info("Found Sun Auto Mode Config Switch for Device ID: %s", device.did)
-                    new_entities.append(HomePilotSunAutoModeEntity(coordinator, device))
-    create_scene_activation_entities = entry[3].get(CONF_CREATE_SCENE_ACTIVATION_ENTITIES, False)
+    async_setup_device_entities(hass, config_entry, async_add_entities, ENTITY_DESCRIPTIONS)
+
+    manager: HomePilotManager = config_entry.runtime_data.manager
+    scene_coordinator = config_entry.runtime_data.scene_coordinator
+    create_scene_activation_entities = config_entry.runtime_data.options.get(CONF_CREATE_SCENE_ACTIVATION_ENTITIES, False)
     if create_scene_activation_entities:
-        for sid in manager.scenes:
-            scene: HomePilotScene = manager.scenes[sid]
-            _LOGGER.info("Found Scene Switch for Scene ID: %s", sid)
-            new_entities.append(HomePilotRademacherSceneEnabledEntity(entry[4], scene))
-    if new_entities:
-        async_add_entities(new_entities)
+        @callback
+        def async_add_scenes(sids: Iterable[str]) -> None:
+            """Add the scene switches of the given scenes."""
+            new_entities = []
+            for sid in sids:
+                scene: HomePilotScene = manager.scenes[sid]
+                _LOGGER.info("Found Scene Switch for Scene ID: %s", sid)
+                new_entities.append(HomePilotRademacherSceneEnabledEntity(scene_coordinator, scene))
+            if new_entities:
+                async_add_entities(new_entities)
+
+        async_add_scenes(manager.scenes)
+        config_entry.async_on_unload(
+            async_dispatcher_connect(
+                hass, SIGNAL_ADD_SCENES.format(config_entry.entry_id), async_add_scenes
+            )
+        )
 
 
 class HomePilotSwitchEntity(HomePilotEntity, SwitchEntity):
@@ -94,7 +133,7 @@ class HomePilotSwitchEntity(HomePilotEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        return self.coordinator.data[self.did].is_on
+        return self.device.is_on
 
     async def async_turn_on(self, **kwargs):
         await self.async_execute_and_poll(lambda d: d.async_turn_on(), lambda: self.is_on)
@@ -127,7 +166,7 @@ class HomePilotLedSwitchEntity(HomePilotEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        device: HomePilotHub = self.coordinator.data[self.did]
+        device: HomePilotHub = self.device
         return device.led_status
 
     async def async_turn_on(self, **kwargs):
@@ -160,7 +199,7 @@ class HomePilotAutoUpdaeSwitchEntity(HomePilotEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        device: HomePilotHub = self.coordinator.data[self.did]
+        device: HomePilotHub = self.device
         return device.auto_update
 
     async def async_turn_on(self, **kwargs):
@@ -193,7 +232,7 @@ class HomePilotVentilationSwitchEntity(HomePilotEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        device: HomePilotCover = self.coordinator.data[self.did]
+        device: HomePilotCover = self.device
         return device.ventilation_position_mode
 
     async def async_turn_on(self, **kwargs):
@@ -226,7 +265,7 @@ class HomePilotAutoModeEntity(HomePilotEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        device: HomePilotAutoConfigDevice = self.coordinator.data[self.did]
+        device: HomePilotAutoConfigDevice = self.device
         return device.auto_mode_value
 
     async def async_turn_on(self, **kwargs):
@@ -260,7 +299,7 @@ class HomePilotTimeAutoModeEntity(HomePilotEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        device: HomePilotAutoConfigDevice = self.coordinator.data[self.did]
+        device: HomePilotAutoConfigDevice = self.device
         return device.time_auto_mode_value
 
     async def async_turn_on(self, **kwargs):
@@ -294,7 +333,7 @@ class HomePilotContactAutoModeEntity(HomePilotEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        device: HomePilotAutoConfigDevice = self.coordinator.data[self.did]
+        device: HomePilotAutoConfigDevice = self.device
         return device.contact_auto_mode_value
 
     async def async_turn_on(self, **kwargs):
@@ -328,7 +367,7 @@ class HomePilotWindAutoModeEntity(HomePilotEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        device: HomePilotAutoConfigDevice = self.coordinator.data[self.did]
+        device: HomePilotAutoConfigDevice = self.device
         return device.wind_auto_mode_value
 
     async def async_turn_on(self, **kwargs):
@@ -362,7 +401,7 @@ class HomePilotDawnAutoModeEntity(HomePilotEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        device: HomePilotAutoConfigDevice = self.coordinator.data[self.did]
+        device: HomePilotAutoConfigDevice = self.device
         return device.dawn_auto_mode_value
 
     async def async_turn_on(self, **kwargs):
@@ -396,7 +435,7 @@ class HomePilotDuskAutoModeEntity(HomePilotEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        device: HomePilotAutoConfigDevice = self.coordinator.data[self.did]
+        device: HomePilotAutoConfigDevice = self.device
         return device.dusk_auto_mode_value
 
     async def async_turn_on(self, **kwargs):
@@ -430,7 +469,7 @@ class HomePilotRainAutoModeEntity(HomePilotEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        device: HomePilotAutoConfigDevice = self.coordinator.data[self.did]
+        device: HomePilotAutoConfigDevice = self.device
         return device.rain_auto_mode_value
 
     async def async_turn_on(self, **kwargs):
@@ -464,7 +503,7 @@ class HomePilotSunAutoModeEntity(HomePilotEntity, SwitchEntity):
 
     @property
     def is_on(self):
-        device: HomePilotAutoConfigDevice = self.coordinator.data[self.did]
+        device: HomePilotAutoConfigDevice = self.device
         return device.sun_auto_mode_value
 
     async def async_turn_on(self, **kwargs):
@@ -485,7 +524,7 @@ class HomePilotRademacherSceneEnabledEntity(CoordinatorEntity, SwitchEntity):
     _sid: str
 
     def __init__(
-        self, coordinator: DataUpdateCoordinator, scene: HomePilotScene, entity_registry_enabled_default=False
+        self, coordinator: HomePilotSceneCoordinator, scene: HomePilotScene, entity_registry_enabled_default=False
     ) -> None:
         super().__init__(coordinator)
         self._sid = scene.sid
@@ -544,14 +583,16 @@ class HomePilotRademacherSceneEnabledEntity(CoordinatorEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs):
         """Turn the entity on."""
         scene: HomePilotScene = self.coordinator.data[self.sid]
-        await scene.async_activate_scene()
+        with self.coordinator.breaker.guard():
+            await scene.async_activate_scene()
         async with asyncio.timeout(5):
             await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs):
         """Turn the entity off."""
         scene: HomePilotScene = self.coordinator.data[self.sid]
-        await scene.async_deactivate_scene()
+        with self.coordinator.breaker.guard():
+            await scene.async_deactivate_scene()
         async with asyncio.timeout(5):
             await self.coordinator.async_request_refresh()
 
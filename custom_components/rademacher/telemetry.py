@@ -0,0 +1,231 @@
+"""Poll, command and request telemetry of a Rademacher Bridge entry."""
+from collections import Counter, defaultdict, deque
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+import logging
+import re
+import time
+from typing import Any
+
+import aiohttp
+from homepilot.api import HomePilotApi
+from homepilot.device import HomePilotDevice
+from yarl import URL
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets (seconds)
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Number of most recent samples kept per latency histogram, and of polls
+# kept for the poll success rate
+LATENCY_WINDOW = 100
+
+# Time window of the request rate (seconds)
+REQUEST_RATE_WINDOW = 60
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def get_endpoint(method: str, url: URL) -> str:
+    """Return the endpoint of a request, with device ids replaced by a placeholder."""
+    endpoint = f"{method} {_ID_SEGMENT.sub('/{id}', url.path)}"
+    if url.query_string:
+        endpoint = f"{endpoint}?{url.query_string}"
+    return endpoint
+
+
+class LatencyHistogram:
+    """Latencies of the most recent samples of an operation."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self.total = 0
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.total += 1
+
+    @property
+    def last(self) -> float | None:
+        return self._samples[-1] if self._samples else None
+
+    def as_dict(self) -> dict[str, Any]:
+        samples = sorted(self._samples)
+        buckets = {f"<={bound}": 0 for bound in LATENCY_BUCKETS}
+        buckets[f">{LATENCY_BUCKETS[-1]}"] = 0
+        for sample in samples:
+            bucket = next((f"<={bound}" for bound in LATENCY_BUCKETS if sample <= bound), f">{LATENCY_BUCKETS[-1]}")
+            buckets[bucket] += 1
+        return {
+            "total": self.total,
+            "window": len(samples),
+            "last": self.last,
+            "p50": samples[len(samples) // 2] if samples else None,
+            "p95": samples[int(len(samples) * 0.95)] if samples else None,
+            "max": samples[-1] if samples else None,
+            "buckets": buckets,
+        }
+
+
+class HomePilotTelemetry:
+    """Latencies, timeouts and errors of the operations of an entry, and its bridge requests.
+
+    Operations are timed with measure, device polls with measure_poll which
+    also notifies the listeners. Requests are counted per endpoint through the
+    trace config of the session created by create_session. HomePilotApi
+    silently falls back to a plain session once that one is closed, whose
+    requests are not counted: async_ensure_session hands it a counting
+    session again, and sessions_replaced tells how often that happened.
+    """
+
+    def __init__(self) -> None:
+        self.latencies: defaultdict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.timeouts: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self.requests: Counter[str] = Counter()
+        self.request_errors: Counter[str] = Counter()
+        # Refreshes which shared the result of the cycle in flight, per coordinator
+        self.skipped_cycles: Counter[str] = Counter()
+        # Scene polls, and device states of device polls, whose unchanged
+        # response was not parsed, per coordinator
+        self.parse_skips: Counter[str] = Counter()
+        self.started = time.monotonic()
+        self.polls = 0
+        self.last_poll_duration: float | None = None
+        self._poll_results: deque[bool] = deque(maxlen=LATENCY_WINDOW)
+        self._timed_out_devices: dict[str, int] = {}
+        self._request_times: deque[float] = deque()
+        self.session: aiohttp.ClientSession | None = None
+        self.sessions_replaced = 0
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @contextmanager
+    def measure(self, operation: str) -> Iterator[None]:
+        """Record the latency of an operation, or its timeout or error."""
+        start = time.monotonic()
+        try:
+            yield
+        except TimeoutError:
+            self.timeouts[operation] += 1
+            raise
+        except Exception:
+            self.errors[operation] += 1
+            raise
+        self.latencies[operation].add(time.monotonic() - start)
+
+    @contextmanager
+    def measure_poll(self, operation: str, devices: Mapping[str, HomePilotDevice]) -> Iterator[set[str]]:
+        """Measure a poll of the given devices and notify the listeners once done.
+
+        Yields the set to add the ids of the devices which timed out to. All
+        devices are counted as timed out when the poll failed.
+        """
+        start = time.monotonic()
+        success = False
+        timed_out: set[str] = set()
+        try:
+            with self.measure(operation):
+                yield timed_out
+            success = True
+        finally:
+            self.polls += 1
+            self.last_poll_duration = time.monotonic() - start
+            self._poll_results.append(success)
+            self._timed_out_devices[operation] = len(timed_out) if success else len(devices)
+            for update_callback in list(self._listeners):
+                update_callback()
+
+    def add_latency(self, operation: str, seconds: float) -> None:
+        self.latencies[operation].add(seconds)
+
+    def count(self, operation: str) -> int:
+        """Number of measurements of an operation, including timeouts and errors."""
+        histogram = self.latencies.get(operation)
+        return (histogram.total if histogram else 0) + self.timeouts[operation] + self.errors[operation]
+
+    @property
+    def poll_success_rate(self) -> float | None:
+        """Percentage of the recent polls which succeeded."""
+        if not self._poll_results:
+            return None
+        return 100 * sum(self._poll_results) / len(self._poll_results)
+
+    @property
+    def timed_out_devices(self) -> int:
+        """Number of devices which timed out in the last poll of each operation."""
+        return sum(self._timed_out_devices.values())
+
+    @property
+    def requests_per_minute(self) -> float:
+        self._prune_request_times(time.monotonic())
+        return len(self._request_times) * 60 / REQUEST_RATE_WINDOW
+
+    def _prune_request_times(self, now: float) -> None:
+        while self._request_times and self._request_times[0] < now - REQUEST_RATE_WINDOW:
+            self._request_times.popleft()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for finished polls, returns a function removing the listener."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    async def _on_request_start(self, session, context, params: aiohttp.TraceRequestStartParams) -> None:
+        self.requests[get_endpoint(params.method, params.url)] += 1
+        now = time.monotonic()
+        self._request_times.append(now)
+        self._prune_request_times(now)
+
+    async def _on_request_exception(self, session, context, params: aiohttp.TraceRequestExceptionParams) -> None:
+        self.request_errors[get_endpoint(params.method, params.url)] += 1
+
+    def create_session(self, cookie_jar: aiohttp.abc.AbstractCookieJar | None = None) -> aiohttp.ClientSession:
+        """Create a session for HomePilotApi counting the requests to the bridge."""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_request_exception.append(self._on_request_exception)
+        if cookie_jar is None:
+            # Same cookie jar as HomePilotApi, the bridge is addressed by its IP
+            cookie_jar = aiohttp.CookieJar(unsafe=True)
+        self.session = aiohttp.ClientSession(cookie_jar=cookie_jar, trace_configs=[trace_config])
+        return self.session
+
+    async def async_ensure_session(self, api: HomePilotApi) -> None:
+        """Hand the api a counting session again if its session was closed or replaced."""
+        session = api._session  # pylint: disable=protected-access
+        if session is self.session and not session.closed:
+            return
+        self.sessions_replaced += 1
+        _LOGGER.debug("Session of the bridge API was closed or replaced, counting requests again")
+        # Keeps the login cookie of the session in use
+        cookie_jar = None
+        if session is not None:
+            cookie_jar = session.cookie_jar
+            if not session.closed:
+                await session.close()
+        api._session = self.create_session(cookie_jar)  # pylint: disable=protected-access
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "uptime": time.monotonic() - self.started,
+            "latencies": {operation: histogram.as_dict() for operation, histogram in self.latencies.items()},
+            "timeouts": dict(self.timeouts),
+            "errors": dict(self.errors),
+            "requests": dict(self.requests),
+            "request_errors": dict(self.request_errors),
+            "skipped_cycles": dict(self.skipped_cycles),
+            "parse_skips": dict(self.parse_skips),
+            "requests_per_minute": self.requests_per_minute,
+            "sessions_replaced": self.sessions_replaced,
+            "poll_success_rate": self.poll_success_rate,
+            "last_poll_duration": self.last_poll_duration,
+            "timed_out_devices": dict(self._timed_out_devices),
+        }
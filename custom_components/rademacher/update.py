@@ -4,47 +4,47 @@ from typing import Any
 
 from homepilot.device import HomePilotDevice
 from homepilot.hub import HomePilotHub
-from homepilot.manager import HomePilotManager
 
 from homeassistant.components.update import (
     UpdateDeviceClass,
     UpdateEntity,
     UpdateEntityFeature,
 )
-from homeassistant.const import CONF_EXCLUDE
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
 
-from .const import DOMAIN
+from .coordinator import HomePilotDataUpdateCoordinator
+
+from .descriptions import HomePilotEntityDescription, async_setup_device_entities
 from .entity import HomePilotEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+# Polling interval of the hub while a firmware download or install runs, and
+# the longest time the hub is polled that fast (seconds)
+INSTALL_POLL_INTERVAL = 5
+INSTALL_POLL_TIMEOUT = 1800
+
+
+ENTITY_DESCRIPTIONS = (
+    HomePilotEntityDescription(
+        capability="hub",
+        name="FW Update Sensor",
+        create_fn=lambda coordinator, device: HomePilotUpdateEntity(
+            coordinator=coordinator,
+            device=device,
+            id_suffix="fw_update",
+            name_suffix="Firmware Update",
+            device_class=UpdateDeviceClass.FIRMWARE,
+            supported_features=(UpdateEntityFeature.INSTALL | UpdateEntityFeature.PROGRESS)
+        ),
+    ),
+)
+
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Setup of entities for switch platform."""
-    entry = hass.data[DOMAIN][config_entry.entry_id]
-    manager: HomePilotManager = entry[0]
-    coordinator: DataUpdateCoordinator = entry[1]
-    exclude_devices: list[str] = entry[3][CONF_EXCLUDE]
-    new_entities = []
-    for did in manager.devices:
-        if did not in exclude_devices:
-            device: HomePilotDevice = manager.devices[did]
-            if isinstance(device, HomePilotHub):
-                _LOGGER.info("Found FW Update Sensor for Device ID: %s", device.did)
-                new_entities.append(
-                    HomePilotUpdateEntity(
-                        coordinator=coordinator,
-                        device=device,
-                        id_suffix="fw_update",
-                        name_suffix="Firmware Update",
-                        device_class=UpdateDeviceClass.FIRMWARE,
-                        supported_features=(UpdateEntityFeature.INSTALL | UpdateEntityFeature.PROGRESS)
-                    )
-                )
-    # If we have any new devices, add them
-    if new_entities:
-        async_add_entities(new_entities)
+    async_setup_device_entities(hass, config_entry, async_add_entities, ENTITY_DESCRIPTIONS)
 
 
 class HomePilotUpdateEntity(HomePilotEntity, UpdateEntity):
@@ -52,7 +52,7 @@ class HomePilotUpdateEntity(HomePilotEntity, UpdateEntity):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: HomePilotDataUpdateCoordinator,
         device: HomePilotDevice,
         id_suffix,
         name_suffix,
@@ -67,33 +67,61 @@ class HomePilotUpdateEntity(HomePilotEntity, UpdateEntity):
             device_class=device_class,
         )
         self._attr_supported_features = supported_features
+        self._cancel_install_tracking: CALLBACK_TYPE | None = None
 
     @property
     def in_progress(self):
-        return self.coordinator.data[self.did].download_progress
+        return self.device.download_progress
 
     @property
     def auto_update(self):
-        return self.coordinator.data[self.did].auto_update
+        return self.device.auto_update
 
     @property
     def installed_version(self):
-        return self.coordinator.data[self.did].fw_version
+        return self.device.fw_version
 
     @property
     def latest_version(self):
-        return self.coordinator.data[self.did].fw_update_version
+        return self.device.fw_update_version
 
     @property
     def release_url(self):
-        return self.coordinator.data[self.did].release_notes
+        return self.device.release_notes
 
     @property
     def title(self):
-        return self.coordinator.data[self.did].sw_platform
+        return self.device.sw_platform
 
     async def async_install(self, version: str | None, backup: bool, **kwargs: Any):
         """Install update."""
-        device: HomePilotHub = self.coordinator.data[self.did]
+        device: HomePilotHub = self.device
         _LOGGER.info("Install update v:%s b:%s", version, backup)
         await device.async_update_firmware()
+        # The hub is polled on a very slow tier, follow the progress closely meanwhile
+        self._async_stop_install_tracking()
+        self._cancel_install_tracking = async_call_later(
+            self.hass, INSTALL_POLL_TIMEOUT, self._async_stop_install_tracking
+        )
+        self.coordinator.async_set_fast_polling(INSTALL_POLL_INTERVAL)
+        await self.coordinator.async_request_refresh()
+
+    @callback
+    def _async_stop_install_tracking(self, _now=None) -> None:
+        if self._cancel_install_tracking is None:
+            return
+        self._cancel_install_tracking()
+        self._cancel_install_tracking = None
+        self.coordinator.async_set_fast_polling(None)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        super()._handle_coordinator_update()
+        device: HomePilotHub = self.device
+        # Done once the download finished and no update is left to install
+        if device.download_progress is False and not device.fw_update_available:
+            self._async_stop_install_tracking()
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._async_stop_install_tracking()
+        await super().async_will_remove_from_hass()
@@ -0,0 +1,81 @@
+"""Bridge and devices standing in for pyrademacher, and a coordinator polling them."""
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.rademacher.coordinator import (
+    BridgeCircuitBreaker,
+    HomePilotDataUpdateCoordinator,
+    async_update_device_states,
+)
+
+
+class FakeApi:
+    """Answers the bulk state fetch with the raw states it holds, after delay seconds."""
+
+    def __init__(self, states: dict[str, dict[str, Any]], delay: float = 0) -> None:
+        self.states = states
+        self.delay = delay
+        self.fetches = 0
+
+    async def async_get_devices_state(self) -> dict[str, dict[str, Any]]:
+        self.fetches += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return {did: dict(state) for did, state in self.states.items()}
+
+
+class FakeDevice:
+    """Device whose parsing counts its calls and can take its time.
+
+    remote_setting stands for a value the parsing fetches with a request of
+    its own, outside the bulk state.
+    """
+
+    def __init__(self, api: FakeApi, delay: float = 0) -> None:
+        self.api = api
+        self.delay = delay
+        self.available = True
+        self.parses = 0
+        self.state: dict[str, Any] | None = None
+        self.remote_setting: Any = None
+        self.setting: Any = None
+
+    async def update_state(self, state: dict[str, Any], api: FakeApi) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.parses += 1
+        self.state = state
+        self.setting = self.remote_setting
+        self.available = True
+
+
+def make_coordinator(
+    hass: HomeAssistant,
+    api: FakeApi,
+    devices: dict[str, FakeDevice],
+    min_update_interval: float = 5,
+    max_update_interval: float = 30,
+) -> HomePilotDataUpdateCoordinator:
+    """Return a coordinator polling the devices through its raw state cache."""
+
+    async def probe() -> None:
+        pass
+
+    async def async_update_data() -> dict[str, FakeDevice]:
+        await async_update_device_states(api, devices, state_cache=device_coordinator.state_cache)
+        return dict(devices)
+
+    device_coordinator = HomePilotDataUpdateCoordinator(
+        hass,
+        logging.getLogger(__name__),
+        name="test",
+        update_method=async_update_data,
+        devices=devices,
+        min_update_interval=min_update_interval,
+        max_update_interval=max_update_interval,
+        breaker=BridgeCircuitBreaker(hass, "bridge", probe),
+    )
+    return device_coordinator
@@ -0,0 +1,8 @@
+"""Fixtures for Rademacher Bridge tests."""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable the custom integrations of this repository in all tests."""
+    yield
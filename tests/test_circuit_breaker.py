@@ -0,0 +1,83 @@
+"""Tests for the circuit breaker of the bridge."""
+import asyncio
+
+import aiohttp
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.rademacher import coordinator
+from custom_components.rademacher.coordinator import (
+    BREAKER_FAILURE_THRESHOLD,
+    BridgeCircuitBreaker,
+    BridgeUnavailableError,
+)
+
+
+@pytest.fixture(autouse=True)
+def short_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(coordinator, "BREAKER_MIN_BACKOFF", 0.01)
+
+
+def fail(breaker: BridgeCircuitBreaker) -> None:
+    with pytest.raises(TimeoutError), breaker.guard():
+        raise TimeoutError
+
+
+async def test_breaker_opens_probes_and_closes(hass: HomeAssistant) -> None:
+    """Failed calls open the breaker, which closes on the first successful probe."""
+    probes = 0
+
+    async def probe() -> None:
+        nonlocal probes
+        probes += 1
+        if probes == 1:
+            raise aiohttp.ClientError
+
+    breaker = BridgeCircuitBreaker(hass, "bridge", probe)
+    closed = asyncio.Event()
+    changes: list[bool] = []
+
+    def breaker_changed() -> None:
+        changes.append(breaker.is_open)
+        if not breaker.is_open:
+            closed.set()
+
+    breaker.async_add_listener(breaker_changed)
+
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        fail(breaker)
+    assert not breaker.is_open
+    fail(breaker)
+    assert breaker.is_open
+    assert changes == [True]
+
+    # Calls fail fast while open
+    with pytest.raises(BridgeUnavailableError), breaker.guard():
+        pytest.fail("Guarded call ran while the breaker was open")
+
+    async with asyncio.timeout(1):
+        await closed.wait()
+    assert probes == 2
+    assert changes == [True, False]
+    assert breaker.as_dict() == {"open": False, "failures": 0, "backoff": 0.02, "opened": 1}
+
+    with breaker.guard():
+        pass
+
+
+async def test_breaker_success_resets_failures(hass: HomeAssistant) -> None:
+    """Only consecutive failures open the breaker."""
+
+    async def probe() -> None:
+        pass
+
+    breaker = BridgeCircuitBreaker(hass, "bridge", probe)
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        fail(breaker)
+    with breaker.guard():
+        pass
+    fail(breaker)
+
+    assert breaker.failures == 1
+    assert not breaker.is_open
@@ -0,0 +1,149 @@
+"""Tests for the device coordinator."""
+import asyncio
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.rademacher.coordinator import (
+    BACKOFF_FACTOR,
+    CYCLE_DURATION_FACTOR,
+    CYCLE_DURATION_SMOOTHING,
+)
+
+from .common import FakeApi, FakeDevice, make_coordinator
+
+
+async def test_refresh_joins_cycle_in_flight(hass: HomeAssistant) -> None:
+    """A refresh requested while a cycle runs shares its result instead of polling again."""
+    api = FakeApi({"1": {"position": 0}}, delay=0.05)
+    devices = {"1": FakeDevice(api)}
+    device_coordinator = make_coordinator(hass, api, devices)
+
+    await asyncio.gather(device_coordinator.async_refresh(), device_coordinator.async_refresh())
+
+    assert api.fetches == 1
+    assert device_coordinator.telemetry.skipped_cycles["test"] == 1
+    assert device_coordinator.last_update_success
+    assert device_coordinator.data == devices
+
+
+async def test_slow_cycles_stretch_interval(hass: HomeAssistant) -> None:
+    """The interval is kept at CYCLE_DURATION_FACTOR times the smoothed cycle duration."""
+    api = FakeApi({"1": {"position": 0}}, delay=0.2)
+    devices = {"1": FakeDevice(api)}
+    device_coordinator = make_coordinator(hass, api, devices, min_update_interval=0.1, max_update_interval=0.2)
+
+    await device_coordinator.async_refresh()
+    duration = device_coordinator.cycle_duration
+    assert duration >= 0.2
+    assert device_coordinator.update_interval.total_seconds() == round(duration * CYCLE_DURATION_FACTOR, 1)
+
+    api.delay = 0
+    await device_coordinator.async_refresh()
+    assert device_coordinator.cycle_duration == pytest.approx(duration * (1 - CYCLE_DURATION_SMOOTHING), abs=0.02)
+    assert device_coordinator.update_interval.total_seconds() == round(
+        device_coordinator.cycle_duration * CYCLE_DURATION_FACTOR, 1
+    )
+
+
+async def test_unchanged_polls_back_off(hass: HomeAssistant) -> None:
+    """Unchanged polls stretch the interval up to the ceiling, a change resets it."""
+    api = FakeApi({"1": {"position": 0}})
+    devices = {"1": FakeDevice(api)}
+    device_coordinator = make_coordinator(hass, api, devices, min_update_interval=10, max_update_interval=30)
+
+    await device_coordinator.async_refresh()
+    assert device_coordinator.update_interval.total_seconds() == 10
+    await device_coordinator.async_refresh()
+    assert device_coordinator.update_interval.total_seconds() == 10 * BACKOFF_FACTOR
+    await device_coordinator.async_refresh()
+    await device_coordinator.async_refresh()
+    assert device_coordinator.update_interval.total_seconds() == 30
+
+    api.states["1"] = {"position": 50}
+    await device_coordinator.async_refresh()
+    assert device_coordinator.update_interval.total_seconds() == 10
+
+
+async def test_interval_tightened_and_bounded(hass: HomeAssistant) -> None:
+    """Commands bring the interval back to the floor, new bounds apply right away."""
+    api = FakeApi({"1": {"position": 0}})
+    devices = {"1": FakeDevice(api)}
+    device_coordinator = make_coordinator(hass, api, devices, min_update_interval=10, max_update_interval=30)
+    await device_coordinator.async_refresh()
+    await device_coordinator.async_refresh()
+    assert device_coordinator.update_interval.total_seconds() > 10
+
+    device_coordinator.async_tighten_interval()
+    assert device_coordinator.update_interval.total_seconds() == 10
+
+    # The ceiling is never below the floor
+    device_coordinator.async_set_interval_bounds(20, 15)
+    assert device_coordinator.min_update_interval == device_coordinator.max_update_interval == 20
+    assert device_coordinator.update_interval.total_seconds() == 20
+    await device_coordinator.async_refresh()
+    assert device_coordinator.update_interval.total_seconds() == 20
+
+
+async def test_only_listeners_of_changed_devices_notified(hass: HomeAssistant) -> None:
+    """Listeners with a device context are only called when that device changed."""
+    api = FakeApi({"1": {"position": 0}, "2": {"position": 0}})
+    devices = {"1": FakeDevice(api), "2": FakeDevice(api)}
+    device_coordinator = make_coordinator(hass, api, devices)
+    calls: list[str | None] = []
+    remove_listeners = [
+        device_coordinator.async_add_listener(lambda: calls.append("1"), "1"),
+        device_coordinator.async_add_listener(lambda: calls.append("2"), "2"),
+        device_coordinator.async_add_listener(lambda: calls.append(None)),
+    ]
+
+    await device_coordinator.async_refresh()
+    assert calls == ["1", "2", None]
+
+    calls.clear()
+    api.states["2"] = {"position": 50}
+    await device_coordinator.async_refresh()
+    assert calls == ["2", None]
+
+    # Devices updated outside of the refresh cycle, e.g. by a reconciliation
+    calls.clear()
+    devices["1"].available = False
+    device_coordinator.async_set_updated_devices(["1", "2"])
+    assert calls == ["1"]
+
+    for remove_listener in remove_listeners:
+        remove_listener()
+
+
+async def test_latest_command_of_a_kind_wins(hass: HomeAssistant) -> None:
+    """Queued commands are superseded by newer ones of the same kind only."""
+    api = FakeApi({"1": {"position": 0}})
+    device_coordinator = make_coordinator(hass, api, {"1": FakeDevice(api)})
+    sent: list[str] = []
+    release = asyncio.Event()
+
+    def queue_command(name: str, kind: str | None) -> asyncio.Task[bool]:
+        async def command() -> None:
+            sent.append(name)
+            if name == "first":
+                await release.wait()
+
+        return asyncio.create_task(device_coordinator.async_queue_command("1", command, kind))
+
+    first = queue_command("first", "position")
+    while not sent:
+        await asyncio.sleep(0)
+    # Queued while the first command is being sent
+    queued = [
+        queue_command("second", "position"),
+        queue_command("tilt", "tilt"),
+        queue_command("third", "position"),
+        queue_command("plain", None),
+        queue_command("other plain", None),
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(first, *queued) == [True, False, True, True, True, True]
+    assert sent == ["first", "tilt", "third", "plain", "other plain"]
@@ -0,0 +1,69 @@
+"""Tests for the partial polls of the device coordinators."""
+from collections import Counter
+
+import pytest
+
+from custom_components.rademacher import coordinator
+from custom_components.rademacher.coordinator import (
+    STALE_POLLS_UNAVAILABLE,
+    async_update_device_states,
+)
+
+from .common import FakeApi, FakeDevice
+
+
+@pytest.fixture(autouse=True)
+def short_device_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(coordinator, "DEVICE_UPDATE_TIMEOUT", 0.05)
+
+
+async def test_laggard_marked_unavailable_after_missed_polls() -> None:
+    """A device missing polls in a row turns unavailable, answering resets the count."""
+    api = FakeApi({"1": {}, "2": {}})
+    devices = {"1": FakeDevice(api), "2": FakeDevice(api, delay=1)}
+    missed_polls: Counter[str] = Counter()
+
+    for poll in range(1, STALE_POLLS_UNAVAILABLE):
+        assert await async_update_device_states(api, devices, 1, missed_polls) == {"2"}
+        assert missed_polls == {"2": poll}
+        assert devices["2"].available
+
+    assert await async_update_device_states(api, devices, 1, missed_polls) == {"2"}
+    assert not devices["2"].available
+    assert devices["1"].available
+
+    devices["2"].delay = 0
+    assert await async_update_device_states(api, devices, 1, missed_polls) == set()
+    assert not missed_polls
+    assert devices["2"].available
+
+
+async def test_devices_past_the_deadline_are_not_missed(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Devices whose turn came after the deadline lag, but are not counted as missed."""
+    monkeypatch.setattr(coordinator, "DEVICE_UPDATE_CONCURRENCY", 1)
+    api = FakeApi({"1": {}, "2": {}})
+    devices = {"1": FakeDevice(api, delay=1), "2": FakeDevice(api, delay=1)}
+    missed_polls: Counter[str] = Counter()
+
+    assert await async_update_device_states(api, devices, 0.05, missed_polls) == {"1", "2"}
+    assert missed_polls == {"1": 1}
+
+    for _ in range(STALE_POLLS_UNAVAILABLE):
+        await async_update_device_states(api, devices, 0.05, missed_polls)
+    assert missed_polls["2"] == 0
+    assert devices["2"].available
+
+
+async def test_laggards_updated_first_by_the_next_poll(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The deadline does not leave out the same devices poll after poll."""
+    monkeypatch.setattr(coordinator, "DEVICE_UPDATE_CONCURRENCY", 1)
+    api = FakeApi({did: {} for did in "123"})
+    devices = {did: FakeDevice(api, delay=0.04) for did in "123"}
+    missed_polls: Counter[str] = Counter()
+    laggard_order: list[str] = []
+
+    for _ in range(3):
+        await async_update_device_states(api, devices, 0.06, missed_polls, laggard_order=laggard_order)
+
+    assert all(device.parses > 0 for device in devices.values())
+    assert all(device.available for device in devices.values())
@@ -0,0 +1,95 @@
+"""Tests for skipping the parsing of unchanged raw device states."""
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.rademacher import coordinator
+from custom_components.rademacher.coordinator import (
+    PARSE_SKIP_LIMIT,
+    RawStateCache,
+    async_update_device_states,
+)
+
+from .common import FakeApi, FakeDevice, make_coordinator
+
+
+async def test_unchanged_state_skips_parsing() -> None:
+    """Unchanged raw states are parsed again once changed or after PARSE_SKIP_LIMIT skips."""
+    api = FakeApi({"1": {"position": 0}, "2": {"position": 0}})
+    devices = {"1": FakeDevice(api), "2": FakeDevice(api)}
+    state_cache = RawStateCache()
+
+    await async_update_device_states(api, devices, state_cache=state_cache)
+    assert state_cache.skipped == 0
+
+    api.states["2"] = {"position": 50}
+    await async_update_device_states(api, devices, state_cache=state_cache)
+    assert state_cache.skipped == 1
+    assert devices["1"].parses == 1
+    assert devices["2"].parses == 2
+    assert devices["2"].state == {"position": 50}
+
+    for _ in range(PARSE_SKIP_LIMIT - 1):
+        await async_update_device_states(api, devices, state_cache=state_cache)
+    assert devices["1"].parses == 1
+    await async_update_device_states(api, devices, state_cache=state_cache)
+    assert devices["1"].parses == 2
+
+
+async def test_unavailable_and_discarded_devices_are_parsed() -> None:
+    """Neither an unavailable nor a discarded device skips parsing."""
+    api = FakeApi({"1": {"position": 0}, "2": {"position": 0}})
+    devices = {"1": FakeDevice(api), "2": FakeDevice(api)}
+    state_cache = RawStateCache()
+    await async_update_device_states(api, devices, state_cache=state_cache)
+
+    devices["1"].available = False
+    state_cache.discard(["2"])
+    await async_update_device_states(api, devices, state_cache=state_cache)
+
+    assert state_cache.skipped == 0
+    assert devices["1"].parses == devices["2"].parses == 2
+    assert devices["1"].available
+
+
+async def test_reconcile_refreshes_fingerprint(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A state parsed by a reconciliation is not mistaken for the one of the poll before."""
+    monkeypatch.setattr(coordinator, "RECONCILE_WINDOW", 0)
+    monkeypatch.setattr(coordinator, "RECONCILE_INTERVAL", 0.01)
+    api = FakeApi({"1": {"position": 0}})
+    device = FakeDevice(api)
+    devices = {"1": device}
+    device_coordinator = make_coordinator(hass, api, devices)
+    await device_coordinator.async_refresh()
+
+    api.states["1"] = {"position": 100}
+    assert await device_coordinator.async_reconcile("1", lambda: device.state == {"position": 100})
+    assert device.parses == 2
+
+    # Back to the state of the last regular poll, which must not be skipped
+    api.states["1"] = {"position": 0}
+    await device_coordinator.async_refresh()
+    assert device.parses == 3
+    assert device.state == {"position": 0}
+
+
+async def test_reconcile_parses_unchanged_state(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A command changing only values outside the bulk state is verified right away."""
+    monkeypatch.setattr(coordinator, "RECONCILE_WINDOW", 0)
+    monkeypatch.setattr(coordinator, "RECONCILE_INTERVAL", 0.01)
+    api = FakeApi({"1": {"position": 0}})
+    device = FakeDevice(api)
+    devices = {"1": device}
+    device_coordinator = make_coordinator(hass, api, devices)
+    await device_coordinator.async_refresh()
+
+    device.remote_setting = "auto"
+    assert await device_coordinator.async_reconcile("1", lambda: device.setting == "auto")
+    # Verified by the first reconciliation poll
+    assert api.fetches == 2
+    assert device.parses == 2
+
+    # The fingerprint was stored, the next poll skips the unchanged state
+    await device_coordinator.async_refresh()
+    assert device.parses == 2
+    assert device_coordinator.state_cache.skipped == 1
@@ -0,0 +1,258 @@
+"""Benchmark of the setup and polling cost of the integration.
+
+Sets up the integration in a test Home Assistant instance against the bridge
+emulator (tools/homepilot_emulator.py, run in its own process so that its work
+is not counted) for each fleet size, and measures:
+
+- the wall time of async_setup_entry, including async_forward_entry_setups,
+  without and with the discovery cache
+- the CPU time of each polling cycle of the coordinators
+- the number of async_write_ha_state calls of each polling cycle
+- the memory allocated per entity during setup
+
+Needs pytest-homeassistant-custom-component for the test instance:
+
+    python tools/benchmark.py --sizes 10 100 500 --output benchmark.json
+    python tools/benchmark.py --baseline benchmark.json
+
+Results are stored as JSON, and compared against a previous result file when
+given as baseline.
+"""
+import argparse
+import asyncio
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+from homeassistant import loader
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from custom_components.rademacher.const import (  # noqa: E402
+    CONF_HUB_UPDATE_INTERVAL,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_SENSOR_UPDATE_INTERVAL,
+    CONF_UPDATE_INTERVAL,
+    DOMAIN,
+)
+
+# Share of each device type in a fleet
+FLEET_MIX = {
+    "covers": 0.5,
+    "switches": 0.1,
+    "thermostats": 0.1,
+    "sensors": 0.2,
+    "wall_controllers": 0.1,
+}
+
+# Polling is only driven by the benchmark, never by the coordinator timers
+BENCHMARK_INTERVAL = 86400
+
+# Metrics compared against the baseline, lower is better
+COMPARED_METRICS = (
+    "setup_time",
+    "cached_setup_time",
+    "cycle_cpu_time",
+    "cycle_state_writes",
+    "memory_per_entity",
+)
+
+
+def fleet(size: int) -> dict[str, int]:
+    """Return the device counts of a fleet of the given size, one scene per ten devices."""
+    counts = {name: int(size * share) for name, share in FLEET_MIX.items()}
+    counts["covers"] += size - sum(counts.values())
+    counts["scenes"] = max(size // 10, 1)
+    return counts
+
+
+@contextmanager
+def emulator(counts: dict[str, int], latency: float, seed: int):
+    """Run the bridge emulator in a separate process, yields its host:port."""
+    args = [sys.executable, "-u", str(REPO / "tools" / "homepilot_emulator.py"), "--port", "0", "--seed", str(seed), "--latency", str(latency)]
+    for name, count in counts.items():
+        args += [f"--{name.replace('_', '-')}", str(count)]
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        line = process.stdout.readline()
+        if not (match := re.search(r" on (\S+)$", line.strip())):
+            raise RuntimeError(f"Emulator did not start: {line!r}")
+        yield match.group(1)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+class StateWriteCounter:
+    """Counts the calls of Entity.async_write_ha_state."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._original = Entity.async_write_ha_state
+
+    def __enter__(self) -> "StateWriteCounter":
+        original = self._original
+
+        def async_write_ha_state(entity: Entity) -> None:
+            self.count += 1
+            original(entity)
+
+        Entity.async_write_ha_state = async_write_ha_state
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        Entity.async_write_ha_state = self._original
+
+
+async def async_unload(hass, entry: MockConfigEntry) -> None:
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def async_run_size(host: str, cycles: int) -> dict[str, Any]:
+    """Benchmark one fleet against the emulator at host."""
+    result: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.symlink(REPO / "custom_components", Path(config_dir) / "custom_components")
+        async with async_test_home_assistant(config_dir=config_dir) as hass:
+            # Same as the enable_custom_integrations fixture
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                title="Benchmark",
+                unique_id="benchmark",
+                version=3,
+                data={"host": host, "password": "", "api_version": 1},
+                options={
+                    CONF_UPDATE_INTERVAL: BENCHMARK_INTERVAL,
+                    CONF_MAX_UPDATE_INTERVAL: BENCHMARK_INTERVAL,
+                    CONF_SENSOR_UPDATE_INTERVAL: BENCHMARK_INTERVAL,
+                    CONF_HUB_UPDATE_INTERVAL: BENCHMARK_INTERVAL,
+                },
+            )
+            entry.add_to_hass(hass)
+
+            # Cold setup: full discovery, entities and device registry entries created
+            start = time.perf_counter()
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+            result["setup_time"] = time.perf_counter() - start
+            result["entities"] = len(er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id))
+
+            # Polling cycles of all coordinators
+            coordinators = entry.runtime_data.coordinators
+            cpu_times, wall_times, writes = [], [], []
+            for _ in range(cycles):
+                with StateWriteCounter() as counter:
+                    cpu_start, wall_start = time.process_time(), time.perf_counter()
+                    for coordinator in coordinators.values():
+                        await coordinator.async_refresh()
+                    await hass.async_block_till_done()
+                    cpu_times.append(time.process_time() - cpu_start)
+                    wall_times.append(time.perf_counter() - wall_start)
+                writes.append(counter.count)
+            result["cycle_cpu_time"] = statistics.median(cpu_times)
+            result["cycle_wall_time"] = statistics.median(wall_times)
+            result["cycle_state_writes"] = statistics.median(writes)
+            await async_unload(hass, entry)
+
+            # Warm setup: catalog from the discovery cache, registries populated
+            start = time.perf_counter()
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+            result["cached_setup_time"] = time.perf_counter() - start
+            await async_unload(hass, entry)
+
+            # Memory, traced on a setup of its own as tracing slows down the setup
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+            result["memory_per_entity"] = allocated / result["entities"] if result["entities"] else 0
+            await async_unload(hass, entry)
+    return result
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any]) -> None:
+    """Print the change of each metric against the baseline."""
+    print(f"Compared to {baseline.get('revision')} ({baseline.get('version')}):")
+    for size, metrics in results["sizes"].items():
+        if (previous := baseline["sizes"].get(size)) is None:
+            continue
+        for metric in COMPARED_METRICS:
+            if previous.get(metric):
+                change = (metrics[metric] - previous[metric]) / previous[metric] * 100
+                print(f"  {size:>5} devices  {metric:<20} {previous[metric]:>12.4f} -> {metrics[metric]:>12.4f} ({change:+.1f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=Path("benchmark.json"))
+    parser.add_argument("--baseline", type=Path, default=None)
+    args = parser.parse_args()
+    # Read first, the baseline can be the output file of the previous run
+    baseline = json.loads(args.baseline.read_text()) if args.baseline is not None else None
+
+    manifest = json.loads((REPO / "custom_components" / DOMAIN / "manifest.json").read_text())
+    results: dict[str, Any] = {
+        "version": manifest["version"],
+        "revision": git_revision(),
+        "home_assistant": HA_VERSION,
+        "python": platform.python_version(),
+        "cycles": args.cycles,
+        "latency": args.latency,
+        "sizes": {},
+    }
+    for size in args.sizes:
+        with emulator(fleet(size), args.latency, args.seed) as host:
+            metrics = asyncio.run(async_run_size(host, args.cycles))
+        results["sizes"][str(size)] = metrics
+        print(
+            f"{size:>5} devices  {metrics['entities']:>5} entities  "
+            f"setup {metrics['setup_time']:.3f}s (cached {metrics['cached_setup_time']:.3f}s)  "
+            f"cycle cpu {metrics['cycle_cpu_time'] * 1000:.1f}ms  "
+            f"{metrics['cycle_state_writes']:.0f} state writes/cycle  "
+            f"{metrics['memory_per_entity'] / 1024:.1f} KiB/entity"
+        )
+
+    args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if baseline is not None:
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
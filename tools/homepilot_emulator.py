@@ -0,0 +1,587 @@
+"""Local emulator of the HomePilot / Start2Smart bridge REST API.
+
+Serves the endpoints used by pyrademacher's HomePilotApi and HomePilotManager
+for a generated fleet of devices and scenes, so that the setup and polling of
+the integration can be profiled at fleet sizes not available on real hardware.
+
+    python tools/homepilot_emulator.py --covers 200 --sensors 50 --latency 0.05
+
+Then add the integration against the printed host, or point HomePilotApi at
+it. Latency, jitter and failures are injected on every request.
+"""
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+import hashlib
+import logging
+import random
+import secrets
+import time
+from typing import Any
+
+from aiohttp import web
+
+SESSION_COOKIE = "HPSESSION"
+
+
+@dataclass
+class EmulatorConfig:
+    """Fleet and behaviour of the emulated bridge."""
+
+    covers: int = 10
+    switches: int = 2
+    thermostats: int = 4
+    sensors: int = 6
+    wall_controllers: int = 2
+    scenes: int = 5
+    # 1 for HomePilot, 2 for the HomePilot Gateway Premium (/hp base path)
+    api_version: int = 1
+    # Empty for a bridge without login
+    password: str = ""
+    # Response delay of every request, uniformly spread by the jitter (seconds)
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Probability of a request failing, with an HTTP 500 or by hanging
+    failure_rate: float = 0.0
+    failure_mode: str = "error"
+    hang_time: float = 30.0
+    # Probability of a sensor or thermostat reading changing between polls
+    change_rate: float = 0.2
+    # Time a cover takes to travel from fully open to fully closed (seconds)
+    travel_time: float = 0.0
+    seed: int | None = None
+
+
+def _capability(name: str, value: Any = None, **extra: Any) -> dict[str, Any]:
+    capability = {"name": name, "read_only": False, "timestamp": int(time.time() * 1000)}
+    if value is not None:
+        capability["value"] = value
+    capability.update(extra)
+    return capability
+
+
+class EmulatedDevice:
+    """A device with its capabilities and its v4 state."""
+
+    # DEVICE_TYPE_LOC, group of the v4 device lists and product code
+    device_type = "0"
+    devtype = "Actuator"
+    product_code = "00000000"
+
+    def __init__(self, did: int, name: str, rng: random.Random) -> None:
+        self.did = did
+        self.rng = rng
+        self.capabilities: dict[str, dict[str, Any]] = {}
+        for capability in (
+            _capability("ID_DEVICE_LOC", str(did)),
+            _capability("DEVICE_TYPE_LOC", self.device_type),
+            _capability("PROT_ID_DEVICE_LOC", f"{did:06x}_1"),
+            _capability("NAME_DEVICE_LOC", name),
+            _capability("PROD_CODE_DEVICE_LOC", self.product_code),
+            _capability("VERSION_CFG", "1.2-1"),
+            _capability("PING_CMD"),
+        ):
+            self.capabilities[capability["name"]] = capability
+        self.statuses: dict[str, Any] = {}
+
+    def add_capabilities(self, *capabilities: dict[str, Any]) -> None:
+        for capability in capabilities:
+            self.capabilities[capability["name"]] = capability
+
+    def set_capability(self, name: str, value: Any) -> None:
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        self.capabilities[name]["value"] = str(value)
+        self.capabilities[name]["timestamp"] = int(time.time() * 1000)
+
+    def to_device(self) -> dict[str, Any]:
+        return {"did": self.did, "capabilities": list(self.capabilities.values())}
+
+    def to_state(self) -> dict[str, Any]:
+        return {"did": self.did, "statusValid": True, "statusesMap": dict(self.statuses)}
+
+    def drift(self) -> None:
+        """Change the readings of the device, as between two polls."""
+
+    def command(self, name: str, value: Any) -> None:
+        if name in self.capabilities and value is not None:
+            self.set_capability(name, value)
+
+
+class EmulatedAutoConfigDevice(EmulatedDevice):
+    def __init__(self, did: int, name: str, rng: random.Random) -> None:
+        super().__init__(did, name, rng)
+        self.add_capabilities(
+            _capability("AUTO_MODE_CFG", "true"),
+            _capability("TIME_AUTO_CFG", "true"),
+            _capability("SUN_AUTO_CFG", "false"),
+            _capability("DAWN_AUTO_CFG", "false"),
+            _capability("DUSK_AUTO_CFG", "false"),
+        )
+        self.statuses["Manuellbetrieb"] = 0
+
+    def command(self, name: str, value: Any) -> None:
+        super().command(name, value)
+        if name == "AUTO_MODE_CFG":
+            self.statuses["Manuellbetrieb"] = 0 if value else 1
+
+
+class EmulatedCover(EmulatedAutoConfigDevice):
+    device_type = "2"
+    product_code = "14234511"
+
+    def __init__(self, did: int, name: str, rng: random.Random, travel_time: float, tilt: bool) -> None:
+        super().__init__(did, name, rng)
+        self.add_capabilities(
+            _capability("GOTO_POS_CMD"),
+            _capability("POS_UP_CMD"),
+            _capability("POS_DOWN_CMD"),
+            _capability("STOP_CMD"),
+            _capability("VENTIL_POS_MODE_CFG", "false"),
+            _capability("VENTIL_POS_CFG", "80"),
+            _capability("GOTO_VENTIL_POS_CMD"),
+            _capability("BLOCK_DET_EVT", "false"),
+            _capability("OBSTACLE_DET_EVT", "false"),
+        )
+        self.travel_time = travel_time
+        self.tilt = tilt
+        if tilt:
+            self.add_capabilities(_capability("SET_SLAT_POS_CMD"), _capability("STOP_SLAT_CMD"))
+            self.statuses["slatposition"] = 0
+        # Position is the closed percentage, moving from start to target
+        self._start = self._target = rng.choice((0, 100))
+        self._started_at = 0.0
+
+    @property
+    def position(self) -> int:
+        if self.travel_time <= 0 or self._start == self._target:
+            return self._target
+        progress = (time.monotonic() - self._started_at) / (
+            self.travel_time * abs(self._target - self._start) / 100
+        )
+        if progress >= 1:
+            self._start = self._target
+            return self._target
+        return round(self._start + (self._target - self._start) * progress)
+
+    def move(self, target: int) -> None:
+        self._start = self.position
+        self._target = max(0, min(100, int(target)))
+        self._started_at = time.monotonic()
+
+    def to_state(self) -> dict[str, Any]:
+        state = super().to_state()
+        state["statusesMap"]["Position"] = self.position
+        return state
+
+    def command(self, name: str, value: Any) -> None:
+        super().command(name, value)
+        if name == "POS_UP_CMD":
+            self.move(0)
+        elif name == "POS_DOWN_CMD":
+            self.move(100)
+        elif name == "GOTO_POS_CMD":
+            self.move(value)
+        elif name == "STOP_CMD":
+            self.move(self.position)
+        elif name == "GOTO_VENTIL_POS_CMD":
+            self.move(int(self.capabilities["VENTIL_POS_CFG"]["value"]))
+        elif name == "SET_SLAT_POS_CMD" and self.tilt:
+            self.statuses["slatposition"] = int(value)
+
+
+class EmulatedSwitch(EmulatedAutoConfigDevice):
+    device_type = "1"
+    product_code = "35000662"
+
+    def __init__(self, did: int, name: str, rng: random.Random) -> None:
+        super().__init__(did, name, rng)
+        self.add_capabilities(_capability("TURN_ON_CMD"), _capability("TURN_OFF_CMD"))
+        self.statuses["Position"] = 0
+
+    def command(self, name: str, value: Any) -> None:
+        super().command(name, value)
+        if name == "TURN_ON_CMD":
+            self.statuses["Position"] = 100
+        elif name == "TURN_OFF_CMD":
+            self.statuses["Position"] = 0
+
+
+class EmulatedThermostat(EmulatedAutoConfigDevice):
+    device_type = "5"
+    product_code = "35003064"
+
+    def __init__(self, did: int, name: str, rng: random.Random) -> None:
+        super().__init__(did, name, rng)
+        self.add_capabilities(
+            _capability("TEMPERATURE_INT_CFG", min_value=4.0, max_value=40.0),
+            _capability("TARGET_TEMPERATURE_CFG", "20.0", min_value=4.0, max_value=28.0, step_size=0.5),
+            _capability("BATT_VALUE_EVT", "80"),
+            _capability("RELAIS_STATE_CFG", "0"),
+            _capability("EXT_OPEN_WINDOW_DETECT_EVT", "false"),
+            _capability("INT_OPEN_WINDOW_DETECT_EVT", "false"),
+            _capability("BOOST_TIME_CFG", "10"),
+            _capability("BOOST_ACTIVE_CFG", "false"),
+            *(
+                _capability(f"TEMPERATURE_THRESH_{i}_CFG", "18.0", min_value=4.0, max_value=28.0, step_size=0.5)
+                for i in range(1, 5)
+            ),
+        )
+        self.statuses.update({"acttemperatur": 205, "Position": 200, "relaisstatus": 0})
+        self.battery = 80
+
+    def to_state(self) -> dict[str, Any]:
+        return {**super().to_state(), "batteryStatus": self.battery}
+
+    def drift(self) -> None:
+        self.statuses["acttemperatur"] += self.rng.choice((-1, 1))
+
+    def command(self, name: str, value: Any) -> None:
+        super().command(name, value)
+        if name == "TARGET_TEMPERATURE_CFG":
+            self.statuses["Position"] = round(float(value) * 10)
+
+
+class EmulatedSensor(EmulatedDevice):
+    device_type = "3"
+    devtype = "Sensor"
+
+    def __init__(self, did: int, name: str, rng: random.Random, weather: bool) -> None:
+        super().__init__(did, name, rng)
+        if weather:
+            self.product_code = "32000064"
+            self.add_capabilities(
+                *(
+                    _capability(name)
+                    for name in (
+                        "TEMP_CURR_DEG_MEA",
+                        "WIND_SPEED_MS_MEA",
+                        "WIND_DETECTION_MEA",
+                        "LIGHT_VAL_LUX_MEA",
+                        "SUN_HEIGHT_DEG_MEA",
+                        "SUN_DIRECTION_MEA",
+                        "RAIN_DETECTION_MEA",
+                        "SUN_DETECTION_MEA",
+                    )
+                )
+            )
+            self.readings: dict[str, Any] = {
+                "temperature_primary": 15.0,
+                "wind_speed": 2.0,
+                "wind_detected": False,
+                "sun_brightness": 20000,
+                "sun_elevation": 30,
+                "sun_direction": 180,
+                "rain_detected": False,
+                "sun_detected": True,
+            }
+        else:
+            self.product_code = "32003164"
+            self.add_capabilities(_capability("CLOSE_CONTACT_MEA"), _capability("BATTERY_LVL_PCT_MEA"))
+            self.readings = {"contact_state": "closed"}
+        self.battery = 90
+
+    def to_state(self) -> dict[str, Any]:
+        return {**super().to_state(), "readings": dict(self.readings), "batteryStatus": self.battery}
+
+    def drift(self) -> None:
+        if "temperature_primary" in self.readings:
+            self.readings["temperature_primary"] = round(
+                self.readings["temperature_primary"] + self.rng.choice((-0.1, 0.1)), 1
+            )
+            self.readings["sun_brightness"] = max(0, self.readings["sun_brightness"] + self.rng.randint(-500, 500))
+        else:
+            self.readings["contact_state"] = self.rng.choice(("open", "tilted", "closed"))
+
+
+class EmulatedWallController(EmulatedDevice):
+    device_type = "10"
+    devtype = "Transmitter"
+    product_code = "32501772"
+
+    def __init__(self, did: int, name: str, rng: random.Random, channels: int = 4) -> None:
+        super().__init__(did, name, rng)
+        self.add_capabilities(
+            _capability("BATT_LOW_EVT", "false"),
+            *(_capability(f"KEY_PUSH_CH{i}_EVT") for i in range(1, channels + 1)),
+        )
+
+    def to_state(self) -> dict[str, Any]:
+        return {"did": self.did, "statusValid": True, "batteryLow": False}
+
+    def drift(self) -> None:
+        channel = f"KEY_PUSH_CH{self.rng.randint(1, 4)}_EVT"
+        if channel in self.capabilities:
+            self.capabilities[channel]["timestamp"] = int(time.time() * 1000)
+
+
+# Name of the device list of each v4 devtype query, and of the response
+V4_DEVICE_LISTS = {
+    "Actuator": ("get_visible_devices", "devices"),
+    "Sensor": ("get_meters", "meters"),
+    "Transmitter": ("get_transmitters", "transmitters"),
+}
+
+
+class HomePilotEmulator:
+    """aiohttp application emulating a bridge with the configured fleet."""
+
+    def __init__(self, config: EmulatorConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.devices: dict[str, EmulatedDevice] = {}
+        self.scenes: dict[int, dict[str, Any]] = {}
+        self.request_counts: Counter[str] = Counter()
+        self.failure_counts: Counter[str] = Counter()
+        self.led_enabled = True
+        self.auto_update = False
+        self._salt = secrets.token_hex(16)
+        self._sessions: set[str] = set()
+        self._runner: web.AppRunner | None = None
+        self._build_fleet()
+        self.app = self._build_app()
+
+    def _build_fleet(self) -> None:
+        config = self.config
+        did = 0
+        fleet = (
+            (config.covers, "Cover", lambda did, name, i: EmulatedCover(did, name, self.rng, config.travel_time, tilt=i % 4 == 3)),
+            (config.switches, "Switch", lambda did, name, i: EmulatedSwitch(did, name, self.rng)),
+            (config.thermostats, "Thermostat", lambda did, name, i: EmulatedThermostat(did, name, self.rng)),
+            (config.sensors, "Sensor", lambda did, name, i: EmulatedSensor(did, name, self.rng, weather=i % 2 == 0)),
+            (config.wall_controllers, "Wall Controller", lambda did, name, i: EmulatedWallController(did, name, self.rng)),
+        )
+        for count, label, factory in fleet:
+            for i in range(count):
+                did += 1
+                self.devices[str(did)] = factory(did, f"{label} {i + 1}", i)
+        for sid in range(1, self.config.scenes + 1):
+            self.scenes[sid] = {
+                "id": sid,
+                "name": f"Scene {sid}",
+                "description": "",
+                "is_enabled": 1,
+                "is_manual_executable": 1,
+            }
+
+    def _build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        base = "/hp" if self.config.api_version == 2 else ""
+        app.router.add_get("/", self._handle_root)
+        app.router.add_get("/_emulator/stats", self._handle_stats)
+        app.router.add_post(f"{base}/authentication/password_salt", self._handle_password_salt)
+        if base:
+            # Tells the HomePilot Gateway Premium apart during the connection test
+            app.router.add_post("/authentication/password_salt", self._handle_unauthorized)
+        app.router.add_post(f"{base}/authentication/login", self._handle_login)
+        app.router.add_get(f"{base}/devices", self._handle_devices)
+        app.router.add_get(f"{base}/devices/{{did}}", self._handle_device)
+        app.router.add_put(f"{base}/devices/{{did}}", self._handle_device_command)
+        app.router.add_get(f"{base}/v4/devices", self._handle_devices_state)
+        app.router.add_get(f"{base}/v4/devices/{{did}}", self._handle_device_state)
+        app.router.add_get(f"{base}/scenes", self._handle_scenes)
+        app.router.add_get(f"{base}/v4/scenes", self._handle_scenes)
+        app.router.add_post(f"{base}/scenes/{{sid}}/actions", self._handle_scene_action)
+        service = f"{base}/service"
+        app.router.add_get(f"{service}/system-update-image/version", self._handle_fw_version)
+        app.router.add_get(f"{service}/system-update-image/status", self._handle_fw_status)
+        app.router.add_put(f"{service}/system-update-image/auto_update", self._handle_auto_update)
+        app.router.add_post(f"{service}/system-update-image/startupdate", self._handle_ok)
+        app.router.add_get(f"{service}/system/networkmgr/v1/interfaces", self._handle_interfaces)
+        app.router.add_get(f"{service}/system/networkmgr/v1/nodename", self._handle_nodename)
+        app.router.add_get(f"{service}/system/leds/status", self._handle_led_status)
+        app.router.add_post(f"{service}/system/leds/enable", self._handle_led)
+        app.router.add_post(f"{service}/system/leds/disable", self._handle_led)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        key = f"{request.method} {route}"
+        if route.startswith("/_emulator"):
+            return await handler(request)
+        self.request_counts[key] += 1
+        config = self.config
+        delay = config.latency + self.rng.uniform(-config.jitter, config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if config.failure_rate and self.rng.random() < config.failure_rate:
+            self.failure_counts[key] += 1
+            if config.failure_mode == "timeout":
+                await asyncio.sleep(config.hang_time)
+            return web.json_response({"error_code": 1, "error_description": "Injected failure"}, status=500)
+        if (
+            config.password
+            and "authentication" not in route
+            and route != "/"
+            and request.cookies.get(SESSION_COOKIE) not in self._sessions
+        ):
+            return web.json_response({"error_code": 401}, status=401)
+        return await handler(request)
+
+    async def _handle_root(self, request: web.Request) -> web.Response:
+        # The HomePilot Gateway Premium only answers below /hp
+        if self.config.api_version == 2:
+            raise web.HTTPNotFound()
+        return web.Response(text="HomePilot emulator")
+
+    async def _handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"requests": dict(self.request_counts), "failures": dict(self.failure_counts)}
+        )
+
+    async def _handle_unauthorized(self, request: web.Request) -> web.Response:
+        return web.json_response({"error_code": 401}, status=401)
+
+    async def _handle_password_salt(self, request: web.Request) -> web.Response:
+        if not self.config.password:
+            return web.json_response({"error_code": 5007}, status=500)
+        return web.json_response({"error_code": 0, "password_salt": self._salt})
+
+    async def _handle_login(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        hashed_password = hashlib.sha256(self.config.password.encode("utf-8")).hexdigest()
+        expected = hashlib.sha256(f"{self._salt}{hashed_password}".encode("utf-8")).hexdigest()
+        if body.get("password") != expected:
+            return web.json_response({"error_code": 5002}, status=401)
+        session = secrets.token_hex(16)
+        self._sessions.add(session)
+        response = web.json_response({"error_code": 0})
+        response.set_cookie(SESSION_COOKIE, session)
+        return response
+
+    async def _handle_devices(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"error_code": 0, "payload": {"devices": [device.to_device() for device in self.devices.values()]}}
+        )
+
+    async def _handle_device(self, request: web.Request) -> web.Response:
+        device = self.devices.get(request.match_info["did"])
+        if device is None:
+            return web.json_response({"error_code": 22, "error_description": "Device not found"})
+        return web.json_response({"error_code": 0, "payload": {"device": device.to_device()}})
+
+    async def _handle_device_command(self, request: web.Request) -> web.Response:
+        device = self.devices.get(request.match_info["did"])
+        if device is None:
+            return web.json_response({"error_code": 22, "error_description": "Device not found"})
+        body = await request.json()
+        device.command(body["name"], body.get("value"))
+        return web.json_response({"error_code": 0})
+
+    def _drift(self, devices) -> None:
+        for device in devices:
+            if self.rng.random() < self.config.change_rate:
+                device.drift()
+
+    async def _handle_devices_state(self, request: web.Request) -> web.Response:
+        devtype = request.query.get("devtype", "Actuator")
+        response_name, list_name = V4_DEVICE_LISTS[devtype]
+        devices = [device for device in self.devices.values() if device.devtype == devtype]
+        self._drift(devices)
+        return web.json_response(
+            {"response": response_name, list_name: [device.to_state() for device in devices]}
+        )
+
+    async def _handle_device_state(self, request: web.Request) -> web.Response:
+        device = self.devices.get(request.match_info["did"])
+        if device is None:
+            return web.json_response({"response": "error"})
+        self._drift([device])
+        return web.json_response({"response": "get_device", "device": device.to_state()})
+
+    async def _handle_scenes(self, request: web.Request) -> web.Response:
+        return web.json_response({"scenes": list(self.scenes.values())})
+
+    async def _handle_scene_action(self, request: web.Request) -> web.Response:
+        scene = self.scenes.get(int(request.match_info["sid"]))
+        if scene is None:
+            return web.json_response({"error_code": 22}, status=404)
+        body = await request.json()
+        if body.get("request_type") == "SWITCHSCENE":
+            scene["is_enabled"] = 1 if body.get("value") else 0
+        return web.json_response({"error_code": 0})
+
+    async def _handle_fw_version(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "version": "5.4.9",
+                "df_stick_version": "2.0",
+                "hw_platform": "ampere",
+                "sw_platform": "bridge" if self.config.api_version == 1 else "homepilot",
+            }
+        )
+
+    async def _handle_fw_status(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"version": "5.4.9", "update_status": "NO_UPDATE_AVAILABLE", "auto_update": self.auto_update}
+        )
+
+    async def _handle_auto_update(self, request: web.Request) -> web.Response:
+        self.auto_update = bool((await request.json()).get("auto_update"))
+        return web.json_response({"error_code": 0})
+
+    async def _handle_interfaces(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"interfaces": {"eth0": {"enabled": True, "address": "02:00:00:00:00:01"}}}
+        )
+
+    async def _handle_nodename(self, request: web.Request) -> web.Response:
+        return web.json_response({"nodename": "emulator"})
+
+    async def _handle_led_status(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "enabled" if self.led_enabled else "disabled"})
+
+    async def _handle_led(self, request: web.Request) -> web.Response:
+        self.led_enabled = request.path.endswith("enable")
+        return web.json_response({"error_code": 0})
+
+    async def _handle_ok(self, request: web.Request) -> web.Response:
+        return web.json_response({"error_code": 0})
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving, returns the host:port to configure in HomePilotApi."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        sockname = site._server.sockets[0].getsockname()  # pylint: disable=protected-access
+        return f"{sockname[0]}:{sockname[1]}"
+
+    async def async_stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = EmulatorConfig()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    for name in ("covers", "switches", "thermostats", "sensors", "wall_controllers", "scenes", "api_version"):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=getattr(defaults, name))
+    for name in ("latency", "jitter", "failure_rate", "hang_time", "change_rate", "travel_time"):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=getattr(defaults, name))
+    parser.add_argument("--failure-mode", choices=("error", "timeout"), default=defaults.failure_mode)
+    parser.add_argument("--password", default=defaults.password)
+    parser.add_argument("--seed", type=int, default=None)
+    args = vars(parser.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+    emulator = HomePilotEmulator(EmulatorConfig(**args))
+
+    async def serve() -> None:
+        address = await emulator.async_start(host, port)
+        print(f"HomePilot emulator with {len(emulator.devices)} devices and {len(emulator.scenes)} scenes on {address}")
+        await asyncio.Event().wait()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()